@@ -8,10 +8,11 @@ Usage:
 
 from __future__ import annotations
 
-import json
 import sys
 from pathlib import Path
 
+import orjson
+
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT / "src"))
 
@@ -21,7 +22,7 @@ from app.main import app  # type: ignore
 def main() -> None:
     schema = app.openapi()
     output_path = Path(__file__).resolve().parents[1] / "docs" / "openapi-schema.json"
-    output_path.write_text(json.dumps(schema, indent=2))
+    output_path.write_bytes(orjson.dumps(schema, option=orjson.OPT_INDENT_2))
     print(f"Wrote OpenAPI schema to {output_path}")
 
 
@@ -2,22 +2,49 @@
 
 from __future__ import annotations
 
-import math
-from dataclasses import dataclass
-from typing import Iterable, List, Sequence
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - optional dependency
+    njit = None
 
 
 @dataclass
 class MetricWindow:
+    """Window of metric samples; statistics are computed once and cached.
+
+    Treat ``values`` as immutable after construction so a baseline window can be
+    reused across many candidates without repeating the reductions.
+    """
+
     values: Sequence[float]
+    _arr: np.ndarray = field(init=False, repr=False, compare=False)
+    _mean: Optional[float] = field(default=None, init=False, repr=False, compare=False)
+    _stdev: Optional[float] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._arr = np.asarray(self.values, dtype=np.float64)
+
+    def as_array(self) -> np.ndarray:
+        return self._arr
 
     def mean(self) -> float:
-        return sum(self.values) / max(len(self.values), 1)
+        if self._mean is None:
+            self._mean = float(self._arr.mean()) if self._arr.size else 0.0
+        return self._mean
 
     def stdev(self) -> float:
-        mean = self.mean()
-        variance = sum((value - mean) ** 2 for value in self.values) / max(len(self.values), 1)
-        return math.sqrt(variance)
+        if self._stdev is None:
+            if self._arr.size:
+                deviations = self._arr - self.mean()
+                self._stdev = float(np.sqrt(np.dot(deviations, deviations) / self._arr.size))
+            else:
+                self._stdev = 0.0
+        return self._stdev
 
 
 @dataclass
@@ -37,15 +64,14 @@ class DriftAnalyzer:
         mean = baseline.mean()
         stdev = baseline.stdev() or 1.0
 
-        anomalies = []
-        scores = []
-        for idx, value in enumerate(candidate.values):
-            z = abs(value - mean) / stdev
-            scores.append(z)
-            if z > self.threshold:
-                anomalies.append(idx)
+        arr = candidate.as_array()
+        if not arr.size:
+            return AnomalyResult(score=0.0, thresholds=[self.threshold], anomalies=[])
 
-        score = max(scores) if scores else 0.0
+        z = np.abs(arr - mean)
+        z /= stdev
+        anomalies = np.flatnonzero(z > self.threshold).tolist()
+        score = float(z.max())
         return AnomalyResult(score=score, thresholds=[self.threshold], anomalies=anomalies)
 
 
@@ -70,38 +96,160 @@ def detect_zscore_anomalies(
     series: Sequence[float],
     z_threshold: float = 3.0,
 ) -> AnomalyDetectionResult:
-    """Simple z-score anomaly detector."""
+    """Simple z-score anomaly detector.
 
-    if not series:
+    With numba installed the work runs in a compiled single-pass kernel.
+    Otherwise the deviation array is computed once and reused for both the
+    variance and the threshold test, which compares ``|x - mean|`` against
+    ``z_threshold * stddev`` instead of dividing every element.
+    """
+
+    arr = np.ascontiguousarray(series, dtype=np.float64)
+    if not arr.size:
         return AnomalyDetectionResult(indices=[], mean=0.0, stddev=0.0, threshold=z_threshold)
 
-    mean = sum(series) / len(series)
-    variance = sum((value - mean) ** 2 for value in series) / len(series)
-    stddev = math.sqrt(variance)
+    if _zscore_kernel_jit is not None:
+        indices, mean, stddev = _zscore_kernel_jit(arr, float(z_threshold))
+        return AnomalyDetectionResult(
+            indices=indices.tolist(), mean=float(mean), stddev=float(stddev), threshold=z_threshold
+        )
+
+    mean = float(arr.mean())
+    deviations = arr - mean
+    stddev = float(np.sqrt(np.dot(deviations, deviations) / arr.size))
 
     if stddev == 0:
         return AnomalyDetectionResult(indices=[], mean=mean, stddev=0.0, threshold=z_threshold)
 
-    anomalies = [
-        idx
-        for idx, value in enumerate(series)
-        if abs(value - mean) / stddev >= z_threshold
-    ]
+    np.abs(deviations, out=deviations)
+    anomalies = np.flatnonzero(deviations >= z_threshold * stddev).tolist()
     return AnomalyDetectionResult(indices=anomalies, mean=mean, stddev=stddev, threshold=z_threshold)
 
 
+def _zscore_kernel(arr: np.ndarray, threshold: float) -> Tuple[np.ndarray, float, float]:
+    """Welford mean/variance in one pass, then collect indices at or past the threshold."""
+
+    n = arr.shape[0]
+    mean = 0.0
+    m2 = 0.0
+    for i in range(n):
+        delta = arr[i] - mean
+        mean += delta / (i + 1)
+        m2 += delta * (arr[i] - mean)
+    stddev = np.sqrt(m2 / n)
+
+    indices = np.empty(n, dtype=np.int64)
+    count = 0
+    if stddev > 0:
+        limit = threshold * stddev
+        for i in range(n):
+            if abs(arr[i] - mean) >= limit:
+                indices[count] = i
+                count += 1
+    return indices[:count], mean, stddev
+
+
+_zscore_kernel_jit = (
+    njit(cache=True, boundscheck=False)(_zscore_kernel) if njit is not None else None
+)
+
+
+def detect_smoothed_zscore_anomalies(
+    series: Sequence[float],
+    window: int,
+    z_threshold: float = 3.0,
+    *,
+    keep_smoothed: bool = True,
+) -> Tuple[AnomalyDetectionResult, Optional[np.ndarray]]:
+    """Smooth ``series`` with a trailing ``window`` mean and run z-score detection on it.
+
+    Equivalent to :func:`smooth_series` followed by
+    :func:`detect_zscore_anomalies`. With numba installed both steps run in one
+    fused kernel, and the smoothed series is only materialised when
+    ``keep_smoothed`` is set. Returns the detection result and the smoothed
+    array, or ``None`` for the latter when it was not kept.
+    """
+
+    arr = np.ascontiguousarray(series, dtype=np.float64)
+    if window <= 0:
+        raise ValueError("window must be positive")
+    if _smoothed_zscore_jit is None or not arr.size or window > arr.shape[0]:
+        smoothed = smooth_series(arr, window)
+        result = detect_zscore_anomalies(smoothed, z_threshold=z_threshold)
+        return result, smoothed if keep_smoothed else None
+
+    indices, mean, stddev, smoothed = _smoothed_zscore_jit(arr, window, float(z_threshold), keep_smoothed)
+    result = AnomalyDetectionResult(
+        indices=indices.tolist(), mean=float(mean), stddev=float(stddev), threshold=z_threshold
+    )
+    return result, smoothed if keep_smoothed else None
+
+
+def _smoothed_zscore(
+    arr: np.ndarray, window: int, threshold: float, keep: bool
+) -> Tuple[np.ndarray, float, float, np.ndarray]:
+    """Sliding-window mean fed straight into Welford; the second pass re-derives each point."""
+
+    n = arr.shape[0]
+    out = np.empty(n if keep else 0, dtype=np.float64)
+    running = 0.0
+    mean = 0.0
+    m2 = 0.0
+    for i in range(n):
+        running += arr[i]
+        if i >= window:
+            running -= arr[i - window]
+        value = running / min(i + 1, window)
+        if keep:
+            out[i] = value
+        delta = value - mean
+        mean += delta / (i + 1)
+        m2 += delta * (value - mean)
+    stddev = np.sqrt(m2 / n)
+
+    indices = np.empty(n, dtype=np.int64)
+    count = 0
+    if stddev > 0:
+        limit = threshold * stddev
+        running = 0.0
+        for i in range(n):
+            running += arr[i]
+            if i >= window:
+                running -= arr[i - window]
+            if abs(running / min(i + 1, window) - mean) >= limit:
+                indices[count] = i
+                count += 1
+    return indices[:count], mean, stddev, out
+
+
+_smoothed_zscore_jit = (
+    njit(cache=True, boundscheck=False)(_smoothed_zscore) if njit is not None else None
+)
+
+
 def moving_average(series: Sequence[float], window: int) -> List[float]:
     """Calculate moving average for smoothing."""
 
+    return smooth_series(np.asarray(series, dtype=np.float64), window).tolist()
+
+
+def smooth_series(arr: np.ndarray, window: int) -> np.ndarray:
+    """Trailing moving average of a float64 array, returned as an array.
+
+    Callers that go on to run detection should use this rather than
+    :func:`moving_average` so the series stays an ndarray end to end.
+    """
+
     if window <= 0:
         raise ValueError("window must be positive")
-    if window > len(series):
-        return list(series)
-
-    output: List[float] = []
-    for idx in range(len(series)):
-        start = max(0, idx - window + 1)
-        window_slice = series[start : idx + 1]
-        output.append(sum(window_slice) / len(window_slice))
-    return output
+    n = arr.shape[0]
+    if window > n:
+        return arr
+
+    # Window sums from a single cumulative sum; the first ``window - 1`` points
+    # average over the samples seen so far.
+    sums = np.cumsum(arr, dtype=np.float64)
+    sums[window:] -= sums[:-window].copy()
+    sums /= np.minimum(np.arange(1, n + 1), window)
+    return sums
 
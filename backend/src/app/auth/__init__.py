@@ -8,21 +8,25 @@ Provides:
 - Session management
 """
 
-import json
 import os
 import secrets
 import hashlib
+import threading
+import time
 from datetime import UTC, datetime, timedelta
-from typing import Optional, Dict, Any, List
-from dataclasses import dataclass
+from typing import AbstractSet, FrozenSet, Iterable, Optional, Dict, Any
+from dataclasses import dataclass, replace
 from enum import Enum
 from functools import wraps
 
 from fastapi import HTTPException, Depends, Request, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, APIKeyHeader
+from sqlalchemy.orm import Session
 
+from app.database import get_db
 from app.services.secrets import get_secret
 from app.utils.request_context import get_correlation_id
+from app.utils.ttl_cache import TTLCache
 
 
 # ============================================================================
@@ -32,8 +36,26 @@ from app.utils.request_context import get_correlation_id
 JWT_SECRET = get_secret("auth/jwt_secret", os.getenv("JWT_SECRET")) or secrets.token_hex(32)
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRY_HOURS = int(os.getenv("JWT_EXPIRY_HOURS", "24"))
+REFRESH_TOKEN_TTL_SECONDS = 30 * 24 * 3600
 API_KEY_PREFIX = "mat_"  # Multi-Agent Testing
+# generate_api_key() appends token_urlsafe(32) (43 chars); anything shorter is garbage.
+_API_KEY_MIN_LEN = len(API_KEY_PREFIX) + 32
 AUDIT_RETENTION_DAYS = int(os.getenv("AUDIT_LOG_RETENTION_DAYS", "365"))
+# OWASP 2023 guidance for PBKDF2-HMAC-SHA256; tune per deployment hardware budget.
+PASSWORD_HASH_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS", "600000"))
+# PBKDF2 releases the GIL; cap parallel derivations so a login burst cannot
+# oversubscribe the CPU or fill the worker thread pool the handlers run them on.
+PASSWORD_HASH_CONCURRENCY = max(int(os.getenv("PASSWORD_HASH_CONCURRENCY", str(os.cpu_count() or 4))), 1)
+# Iteration count implied by hashes stored in the original "salt$hash" format.
+LEGACY_PASSWORD_HASH_ITERATIONS = 100000
+# Stored for accounts that can only sign in via SSO; no password ever matches it.
+UNUSABLE_PASSWORD_HASH = "!"
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "5"))
+API_KEY_CACHE_MAX_ENTRIES = int(os.getenv("API_KEY_CACHE_MAX_ENTRIES", "5000"))
+# The cache is per process: a key revoked through one worker stays usable on the
+# others for up to this long, so keep it short.
+API_KEY_CACHE_TTL_SECONDS = float(os.getenv("API_KEY_CACHE_TTL_SECONDS", "5"))
 
 
 # ============================================================================
@@ -77,10 +99,10 @@ class Permission(Enum):
 
 
 # Role-permission mapping
-ROLE_PERMISSIONS: Dict[Role, List[Permission]] = {
-    Role.ADMIN: list(Permission),  # All permissions
+ROLE_PERMISSIONS: Dict[Role, FrozenSet[Permission]] = {
+    Role.ADMIN: frozenset(Permission),  # All permissions
     
-    Role.OPERATOR: [
+    Role.OPERATOR: frozenset({
         Permission.GRAPH_CREATE,
         Permission.GRAPH_READ,
         Permission.GRAPH_UPDATE,
@@ -92,23 +114,26 @@ ROLE_PERMISSIONS: Dict[Role, List[Permission]] = {
         Permission.METRICS_EXPORT,
         Permission.USER_READ,
         Permission.WEBHOOK_MANAGE,
-    ],
+    }),
     
-    Role.VIEWER: [
+    Role.VIEWER: frozenset({
         Permission.GRAPH_READ,
         Permission.GRAPH_LIBRARY,
         Permission.RUN_READ,
         Permission.METRICS_READ,
-    ],
+    }),
     
-    Role.API: [
+    Role.API: frozenset({
         Permission.GRAPH_READ,
         Permission.RUN_CREATE,
         Permission.RUN_READ,
         Permission.METRICS_READ,
-    ],
+    }),
 }
 
+# Hot-path lookup for stored role strings (avoids Enum.__call__ per request).
+_ROLE_BY_VALUE: Dict[str, Role] = {role.value: role for role in Role}
+
 
 # ============================================================================
 # User Model
@@ -121,55 +146,83 @@ class User:
     email: str
     name: str
     role: Role
-    permissions: List[Permission]
+    permissions: AbstractSet[Permission]
     api_key: Optional[str] = None
     is_active: bool = True
     tenant_id: str = "default"
+
+    def __post_init__(self):
+        if not isinstance(self.permissions, frozenset):
+            self.permissions = frozenset(self.permissions)
     
     def has_permission(self, permission: Permission) -> bool:
         """Check if user has a specific permission."""
         return permission in self.permissions
     
-    def has_any_permission(self, permissions: List[Permission]) -> bool:
+    def has_any_permission(self, permissions: Iterable[Permission]) -> bool:
         """Check if user has any of the specified permissions."""
-        return any(p in self.permissions for p in permissions)
+        return not self.permissions.isdisjoint(permissions)
     
-    def has_all_permissions(self, permissions: List[Permission]) -> bool:
+    def has_all_permissions(self, permissions: Iterable[Permission]) -> bool:
         """Check if user has all of the specified permissions."""
-        return all(p in self.permissions for p in permissions)
+        return self.permissions.issuperset(permissions)
 
 
 # ============================================================================
 # Password Hashing
 # ============================================================================
 
+_PASSWORD_HASH_SLOTS = threading.BoundedSemaphore(PASSWORD_HASH_CONCURRENCY)
+
+
+def _pbkdf2(password: str, salt: str, iterations: int) -> bytes:
+    """PBKDF2-HMAC-SHA256; blocking, so async callers run it on a worker thread."""
+    with _PASSWORD_HASH_SLOTS:
+        return hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), iterations)
+
+
 def hash_password(password: str) -> str:
-    """Hash a password with salt."""
+    """Hash a password with salt.
+
+    The iteration count is stored alongside the salt so PASSWORD_HASH_ITERATIONS
+    can be raised without invalidating existing hashes.
+    """
     salt = secrets.token_hex(16)
-    hash_obj = hashlib.pbkdf2_hmac(
-        "sha256",
-        password.encode(),
-        salt.encode(),
-        100000
-    )
-    return f"{salt}${hash_obj.hex()}"
+    hash_obj = _pbkdf2(password, salt, PASSWORD_HASH_ITERATIONS)
+    return f"{PASSWORD_HASH_ITERATIONS}${salt}${hash_obj.hex()}"
 
 
 def verify_password(password: str, password_hash: str) -> bool:
     """Verify a password against its hash."""
+    if not password_hash or password_hash.startswith(UNUSABLE_PASSWORD_HASH):
+        return False
     try:
-        salt, stored_hash = password_hash.split("$")
-        hash_obj = hashlib.pbkdf2_hmac(
-            "sha256",
-            password.encode(),
-            salt.encode(),
-            100000
-        )
+        parts = password_hash.split("$")
+        if len(parts) == 2:
+            iterations = LEGACY_PASSWORD_HASH_ITERATIONS
+            salt, stored_hash = parts
+        else:
+            raw_iterations, salt, stored_hash = parts
+            iterations = int(raw_iterations)
+        hash_obj = _pbkdf2(password, salt, iterations)
         return secrets.compare_digest(hash_obj.hex(), stored_hash)
     except (ValueError, AttributeError):
         return False
 
 
+def password_hashing_info() -> Dict[str, Any]:
+    """Describe the password hashing backend (logged at startup)."""
+    import ssl
+
+    if "sha256" not in hashlib.algorithms_available:
+        raise RuntimeError("hashlib is missing sha256; password hashing is unavailable")
+    return {
+        "algorithm": "pbkdf2_sha256",
+        "iterations": PASSWORD_HASH_ITERATIONS,
+        "openssl": ssl.OPENSSL_VERSION,
+    }
+
+
 # ============================================================================
 # JWT Token Management
 # ============================================================================
@@ -186,20 +239,46 @@ def create_access_token(user_data: Dict[str, Any], expires_delta: Optional[timed
         data = {**user_data, "exp": (datetime.now(UTC) + timedelta(hours=JWT_EXPIRY_HOURS)).isoformat()}
         return base64.b64encode(json.dumps(data).encode()).decode()
     
-    expire = datetime.now(UTC) + (expires_delta or timedelta(hours=JWT_EXPIRY_HOURS))
+    # Integer epoch seconds: what PyJWT serializes anyway, without datetime allocations.
+    now = int(time.time())
+    lifetime = expires_delta or timedelta(hours=JWT_EXPIRY_HOURS)
     
     payload = {
         **user_data,
-        "exp": expire,
-        "iat": datetime.now(UTC),
+        "exp": now + int(lifetime.total_seconds()),
+        "iat": now,
         "type": "access"
     }
     
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
+# Verified claims keyed by sha256(token). Only successfully verified tokens are
+# stored, and entries never outlive the token's exp.
+_TOKEN_CACHE: TTLCache[Dict[str, Any]] = TTLCache(TOKEN_CACHE_MAX_ENTRIES)
+
+
+def _token_cache_put(key: bytes, payload: Dict[str, Any]) -> None:
+    if TOKEN_CACHE_TTL_SECONDS <= 0:
+        return
+    expires_at = time.time() + TOKEN_CACHE_TTL_SECONDS
+    token_exp = payload.get("exp")
+    if isinstance(token_exp, (int, float)):
+        expires_at = min(expires_at, float(token_exp))
+    _TOKEN_CACHE.set(key, dict(payload), expires_at)
+
+
+def clear_token_cache() -> None:
+    """Drop all cached token verifications (e.g. after rotating JWT_SECRET)."""
+    _TOKEN_CACHE.clear()
+
+
 def decode_access_token(token: str) -> Dict[str, Any]:
-    """Decode and validate a JWT token."""
+    """Decode and validate a JWT token.
+
+    Successful verifications are cached for a few seconds so repeated requests
+    carrying the same bearer token skip the HMAC check.
+    """
     try:
         import jwt
     except ImportError:
@@ -213,8 +292,14 @@ def decode_access_token(token: str) -> Dict[str, Any]:
         except:
             raise HTTPException(status_code=401, detail="Invalid token")
     
+    cache_key = hashlib.sha256(token.encode()).digest()
+    cached = _TOKEN_CACHE.get(cache_key)
+    if cached is not None:
+        return dict(cached)
+
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        _token_cache_put(cache_key, payload)
         return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
@@ -227,10 +312,9 @@ def create_refresh_token(user_id: int) -> str:
     try:
         import jwt
         
-        expire = datetime.now(UTC) + timedelta(days=30)
         payload = {
             "user_id": user_id,
-            "exp": expire,
+            "exp": int(time.time()) + REFRESH_TOKEN_TTL_SECONDS,
             "type": "refresh"
         }
         return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
@@ -252,6 +336,36 @@ def hash_api_key(api_key: str) -> str:
     return hashlib.sha256(api_key.encode()).hexdigest()
 
 
+# Resolved users keyed by stored API key hash, so hot keys skip the DB lookup.
+_API_KEY_CACHE: TTLCache[User] = TTLCache(API_KEY_CACHE_MAX_ENTRIES)
+
+
+def invalidate_api_key_cache(user_id: Optional[int] = None) -> None:
+    """Forget cached API key resolutions for ``user_id`` (or all users).
+
+    Only this process's cache is cleared; other workers drop their copies when
+    the entries expire after ``API_KEY_CACHE_TTL_SECONDS``.
+    """
+    if user_id is None:
+        _API_KEY_CACHE.clear()
+    else:
+        _API_KEY_CACHE.discard_where(lambda cached: cached.id == user_id)
+
+
+def _user_from_row(row) -> User:
+    # Unknown values fall through to Role() so they still raise ValueError.
+    role = _ROLE_BY_VALUE.get(row.role) or Role(row.role)
+    return User(
+        id=row.id,
+        email=row.email,
+        name=row.name,
+        role=role,
+        permissions=ROLE_PERMISSIONS[role],
+        is_active=row.is_active,
+        tenant_id=row.tenant_id or "default"
+    )
+
+
 # ============================================================================
 # FastAPI Dependencies
 # ============================================================================
@@ -263,7 +377,8 @@ api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     api_key: Optional[str] = Depends(api_key_header),
-    request: Request = None
+    request: Request = None,
+    db: Session = Depends(get_db),
 ) -> User:
     """
     Extract and validate the current user from request.
@@ -272,70 +387,68 @@ async def get_current_user(
     - Bearer JWT token
     - X-API-Key header
     """
-    from app.database import SessionLocal
     from app.models_enhanced import User as UserTable
+
+    key_hash = None
+    if (
+        not (credentials and credentials.credentials)
+        and api_key
+        and len(api_key) >= _API_KEY_MIN_LEN
+        and api_key.startswith(API_KEY_PREFIX)
+    ):
+        key_hash = hash_api_key(api_key)
+        cached_user = _API_KEY_CACHE.get(key_hash)
+        if cached_user is not None:
+            return replace(cached_user)
+
+    user_data = None
     
-    db = SessionLocal()
-    
-    try:
-        user_data = None
+    # Try JWT token first
+    if credentials and credentials.credentials:
+        token_data = decode_access_token(credentials.credentials)
+        user_id = token_data.get("user_id")
         
-        # Try JWT token first
-        if credentials and credentials.credentials:
-            token_data = decode_access_token(credentials.credentials)
-            user_id = token_data.get("user_id")
-            
-            result = db.execute(
-                UserTable.select().where(UserTable.c.id == user_id)
-            ).fetchone()
-            
-            if result:
-                user_data = result
-        
-        # Try API key
-        elif api_key and api_key.startswith(API_KEY_PREFIX):
-            key_hash = hash_api_key(api_key)
-            
-            result = db.execute(
-                UserTable.select().where(UserTable.c.api_key == key_hash)
-            ).fetchone()
-            
-            if result:
-                user_data = result
-        
-        if not user_data:
-            raise HTTPException(
-                status_code=401,
-                detail="Invalid authentication credentials",
-                headers={"WWW-Authenticate": "Bearer"}
-            )
-        
-        if not user_data.is_active:
-            raise HTTPException(status_code=403, detail="User account is disabled")
+        result = db.execute(
+            UserTable.select().where(UserTable.c.id == user_id)
+        ).fetchone()
         
-        role = Role(user_data.role)
+        if result:
+            user_data = result
+    
+    # Try API key
+    elif key_hash is not None:
+        result = db.execute(
+            UserTable.select().where(UserTable.c.api_key == key_hash)
+        ).fetchone()
         
-        return User(
-            id=user_data.id,
-            email=user_data.email,
-            name=user_data.name,
-            role=role,
-            permissions=ROLE_PERMISSIONS.get(role, []),
-            is_active=user_data.is_active,
-            tenant_id=user_data.tenant_id or "default"
+        if result:
+            user_data = result
+    
+    if not user_data:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"}
         )
-        
-    finally:
-        db.close()
+    
+    if not user_data.is_active:
+        raise HTTPException(status_code=403, detail="User account is disabled")
+    
+    user = _user_from_row(user_data)
+    if key_hash is not None and API_KEY_CACHE_TTL_SECONDS > 0:
+        _API_KEY_CACHE.set(key_hash, user, time.time() + API_KEY_CACHE_TTL_SECONDS)
+        return replace(user)
+    return user
 
 
 async def get_optional_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    api_key: Optional[str] = Depends(api_key_header)
+    api_key: Optional[str] = Depends(api_key_header),
+    db: Session = Depends(get_db),
 ) -> Optional[User]:
     """Get current user if authenticated, None otherwise."""
     try:
-        return await get_current_user(credentials, api_key)
+        return await get_current_user(credentials, api_key, db=db)
     except HTTPException:
         return None
 
@@ -346,14 +459,13 @@ async def get_optional_user(
 
 def require_permission(permission: Permission):
     """Decorator to require a specific permission."""
+    denied_detail = f"Permission denied: {permission.value}"
+
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, user: User = Depends(get_current_user), **kwargs):
-            if not user.has_permission(permission):
-                raise HTTPException(
-                    status_code=403,
-                    detail=f"Permission denied: {permission.value}"
-                )
+            if permission not in user.permissions:
+                raise HTTPException(status_code=403, detail=denied_detail)
             return await func(*args, user=user, **kwargs)
         return wrapper
     return decorator
@@ -361,10 +473,12 @@ def require_permission(permission: Permission):
 
 def require_any_permission(*permissions: Permission):
     """Decorator to require any of the specified permissions."""
+    required = frozenset(permissions)
+
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, user: User = Depends(get_current_user), **kwargs):
-            if not user.has_any_permission(list(permissions)):
+            if required.isdisjoint(user.permissions):
                 raise HTTPException(
                     status_code=403,
                     detail="Permission denied"
@@ -376,14 +490,14 @@ def require_any_permission(*permissions: Permission):
 
 def require_role(role: Role):
     """Decorator to require a specific role."""
+    allowed_roles = frozenset({role, Role.ADMIN})
+    denied_detail = f"Role required: {role.value}"
+
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, user: User = Depends(get_current_user), **kwargs):
-            if user.role != role and user.role != Role.ADMIN:
-                raise HTTPException(
-                    status_code=403,
-                    detail=f"Role required: {role.value}"
-                )
+            if user.role not in allowed_roles:
+                raise HTTPException(status_code=403, detail=denied_detail)
             return await func(*args, user=user, **kwargs)
         return wrapper
     return decorator
@@ -391,13 +505,11 @@ def require_role(role: Role):
 
 def permission_dependency(permission: Permission):
     """FastAPI dependency enforcing a specific permission."""
+    denied_detail = f"Permission denied: {permission.value}"
 
     async def dependency(user: User = Depends(get_current_user)) -> User:
-        if not user.has_permission(permission):
-            raise HTTPException(
-                status_code=403,
-                detail=f"Permission denied: {permission.value}"
-            )
+        if permission not in user.permissions:
+            raise HTTPException(status_code=403, detail=denied_detail)
         return user
 
     return dependency
@@ -405,9 +517,10 @@ def permission_dependency(permission: Permission):
 
 def permissions_dependency(*permissions: Permission):
     """FastAPI dependency enforcing any of the provided permissions."""
+    required = frozenset(permissions)
 
     async def dependency(user: User = Depends(get_current_user)) -> User:
-        if not user.has_any_permission(list(permissions)):
+        if required.isdisjoint(user.permissions):
             raise HTTPException(status_code=403, detail="Permission denied")
         return user
 
@@ -426,46 +539,23 @@ async def log_audit(
     details: Optional[Dict[str, Any]] = None,
     request: Optional[Request] = None
 ):
-    """Log an audit event."""
-    from app.database import SessionLocal
-    from app.models_enhanced import AuditLog
-    
-    db = SessionLocal()
-    try:
-        previous = db.execute(
-            AuditLog.select().order_by(AuditLog.c.id.desc()).limit(1)
-        ).fetchone()
-        previous_hash = getattr(previous, "event_hash", None)
+    """Log an audit event.
 
-        payload = {
-            "user_id": user.id,
-            "action": action,
-            "resource_type": resource_type,
-            "resource_id": resource_id,
-            "details": details or {},
-            "ip_address": request.client.host if request else None,
-            "user_agent": request.headers.get("user-agent") if request else None,
-            "timestamp": datetime.now(UTC).isoformat(),
-            "previous_hash": previous_hash,
-            "correlation_id": get_correlation_id(request),
-            "tenant_id": user.tenant_id,
-        }
-        event_hash = hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
-
-        db.execute(AuditLog.insert().values(
-            user_id=user.id,
-            action=action,
-            resource_type=resource_type,
-            resource_id=resource_id,
-            details=details or {},
-            ip_address=payload["ip_address"],
-            user_agent=payload["user_agent"],
-            correlation_id=payload["correlation_id"],
-            previous_hash=previous_hash,
-            event_hash=event_hash,
-            retention_days=AUDIT_RETENTION_DAYS,
-            tenant_id=user.tenant_id,
-        ))
-        db.commit()
-    finally:
-        db.close()
+    The event is handed to the buffered audit writer, which chains and inserts it
+    in the background when the app lifespan has started it.
+    """
+    from app.services.audit_log import audit_log_writer
+
+    await audit_log_writer.submit({
+        "user_id": user.id,
+        "action": action,
+        "resource_type": resource_type,
+        "resource_id": resource_id,
+        "details": details or {},
+        "ip_address": request.client.host if request else None,
+        "user_agent": request.headers.get("user-agent") if request else None,
+        "timestamp": datetime.now(UTC).isoformat(),
+        "correlation_id": get_correlation_id(request),
+        "tenant_id": user.tenant_id,
+        "retention_days": AUDIT_RETENTION_DAYS,
+    })
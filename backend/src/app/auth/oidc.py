@@ -1,17 +1,35 @@
 """OIDC helper utilities for Single Sign-On integrations."""
 
 import asyncio
-import json
+import hashlib
 import os
 import time
 from dataclasses import dataclass, field
 from functools import lru_cache
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
 
 import httpx
+import orjson
 from fastapi import HTTPException
 from jose import JWTError, jwt
 
+from app.utils.http_client import get_async_client
+from app.utils.ttl_cache import TTLCache
+
+ID_TOKEN_CACHE_MAX_ENTRIES = 10_000
+ID_TOKEN_CACHE_TTL_SECONDS = 5.0
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the pooled client shared by all providers on the running event loop."""
+
+    return get_async_client(
+        "oidc",
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=32),
+    )
+
 
 @dataclass
 class OIDCProviderConfig:
@@ -38,40 +56,55 @@ class OIDCProvider:
         self._metadata: Optional[Dict[str, Any]] = None
         self._metadata_fetched_at: float = 0
         self._jwks: Optional[Dict[str, Any]] = None
+        self._jwks_by_kid: Dict[Optional[str], Dict[str, Any]] = {}
         self._jwks_fetched_at: float = 0
-        self._lock = asyncio.Lock()
+        self._metadata_lock = asyncio.Lock()
+        self._jwks_lock = asyncio.Lock()
+        # Verified claims keyed by sha256(id_token); failures are never cached.
+        self._token_cache: TTLCache[Dict[str, Any]] = TTLCache(ID_TOKEN_CACHE_MAX_ENTRIES)
+
+    def _metadata_fresh(self) -> bool:
+        return bool(self._metadata) and (time.time() - self._metadata_fetched_at) < self.cache_ttl
+
+    def _jwks_fresh(self) -> bool:
+        return bool(self._jwks) and (time.time() - self._jwks_fetched_at) < self.cache_ttl
 
     async def _fetch_metadata(self) -> Dict[str, Any]:
-        async with self._lock:
-            if self._metadata and (time.time() - self._metadata_fetched_at) < self.cache_ttl:
+        # Cache hits skip the lock; only a miss serializes the refresh.
+        if self._metadata_fresh():
+            return self._metadata
+        async with self._metadata_lock:
+            if self._metadata_fresh():
                 return self._metadata
 
             discovery_url = f"{self.config.issuer.rstrip('/')}/.well-known/openid-configuration"
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(discovery_url)
-                response.raise_for_status()
-                self._metadata = response.json()
-                self._metadata_fetched_at = time.time()
-                # Force JWKS reload on metadata refresh
-                self._jwks = None
-                self._jwks_fetched_at = 0
+            response = await _get_http_client().get(discovery_url)
+            response.raise_for_status()
+            self._metadata = response.json()
+            self._metadata_fetched_at = time.time()
+            # Force JWKS reload on metadata refresh
+            self._jwks_fetched_at = 0
             return self._metadata
 
     async def _fetch_jwks(self) -> Dict[str, Any]:
         metadata = await self._fetch_metadata()
+        if self._jwks_fresh():
+            return self._jwks
+
         jwks_uri = metadata.get("jwks_uri")
         if not jwks_uri:
             raise HTTPException(status_code=500, detail="OIDC provider missing jwks_uri")
 
-        async with self._lock:
-            if self._jwks and (time.time() - self._jwks_fetched_at) < self.cache_ttl:
+        async with self._jwks_lock:
+            if self._jwks_fresh():
                 return self._jwks
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(jwks_uri)
-                response.raise_for_status()
-                self._jwks = response.json()
-                self._jwks_fetched_at = time.time()
+            response = await _get_http_client().get(jwks_uri)
+            response.raise_for_status()
+            jwks = response.json()
+            self._jwks_by_kid = {jwk_key.get("kid"): jwk_key for jwk_key in jwks.get("keys", [])}
+            self._jwks = jwks
+            self._jwks_fetched_at = time.time()
             return self._jwks
 
     async def get_metadata(self) -> Dict[str, Any]:
@@ -97,21 +130,33 @@ class OIDCProvider:
             "client_secret": self.config.client_secret,
         }
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(token_endpoint, data=data, headers={"Accept": "application/json"})
-            if response.status_code >= 400:
-                raise HTTPException(status_code=401, detail="OIDC token exchange failed")
-            return response.json()
+        response = await _get_http_client().post(
+            token_endpoint, data=data, headers={"Accept": "application/json"}
+        )
+        if response.status_code >= 400:
+            raise HTTPException(status_code=401, detail="OIDC token exchange failed")
+        return response.json()
+
+    def _cached_claims(self, cache_key: bytes) -> Optional[Dict[str, Any]]:
+        cached = self._token_cache.get(cache_key)
+        return dict(cached) if cached is not None else None
+
+    def _cache_claims(self, cache_key: bytes, claims: Dict[str, Any]) -> None:
+        expires_at = time.time() + ID_TOKEN_CACHE_TTL_SECONDS
+        token_exp = claims.get("exp")
+        if isinstance(token_exp, (int, float)):
+            expires_at = min(expires_at, float(token_exp))
+        self._token_cache.set(cache_key, dict(claims), expires_at)
 
     async def verify_id_token(self, id_token: str) -> Dict[str, Any]:
-        jwks = await self._fetch_jwks()
+        cache_key = hashlib.sha256(id_token.encode()).digest()
+        cached = self._cached_claims(cache_key)
+        if cached is not None:
+            return cached
+
+        await self._fetch_jwks()
         headers = jwt.get_unverified_header(id_token)
-        kid = headers.get("kid")
-        key = None
-        for jwk_key in jwks.get("keys", []):
-            if jwk_key.get("kid") == kid:
-                key = jwk_key
-                break
+        key = self._jwks_by_kid.get(headers.get("kid"))
 
         if not key:
             raise HTTPException(status_code=401, detail="OIDC signing key mismatch")
@@ -125,6 +170,7 @@ class OIDCProvider:
                 audience=self.config.client_id,
                 issuer=self.config.issuer,
             )
+            self._cache_claims(cache_key, claims)
             return claims
         except JWTError as exc:
             raise HTTPException(status_code=401, detail=f"Invalid ID token: {exc}") from exc
@@ -151,33 +197,36 @@ def _load_provider_configs() -> Dict[str, OIDCProviderConfig]:
     if not raw_config:
         return {}
 
-    parsed = json.loads(raw_config)
+    parsed = orjson.loads(raw_config)
     if isinstance(parsed, dict) and "providers" in parsed:
         parsed = parsed["providers"]
 
-    providers: Dict[str, OIDCProviderConfig] = {}
     if isinstance(parsed, dict):
-        items = parsed.items()
+        items = list(parsed.items())
     elif isinstance(parsed, list):
-        items = ((item.get("name"), item) for item in parsed)
+        items = [(item.get("name"), item) for item in parsed if isinstance(item, dict)]
     else:
         raise ValueError("OIDC provider config must be dict or list")
 
+    providers: Dict[str, OIDCProviderConfig] = {}
     for name, cfg in items:
         if not name or not isinstance(cfg, dict):
             continue
-        providers[name] = OIDCProviderConfig(name=name, **cfg)
+        options = {key: value for key, value in cfg.items() if key != "name"}
+        providers[name] = OIDCProviderConfig(name=name, **options)
     return providers
 
 
+# Parsed once at import; OIDCManager only materializes providers from it.
+_PROVIDER_CONFIGS: Mapping[str, OIDCProviderConfig] = MappingProxyType(_load_provider_configs())
+
+
 class OIDCManager:
     """Factory/cache for configured OIDC providers."""
 
-    def __init__(self):
-        self.providers = {
-            name: OIDCProvider(config)
-            for name, config in _load_provider_configs().items()
-        }
+    def __init__(self, configs: Optional[Mapping[str, OIDCProviderConfig]] = None):
+        configs = _PROVIDER_CONFIGS if configs is None else configs
+        self.providers = {name: OIDCProvider(config) for name, config in configs.items()}
 
     def is_enabled(self) -> bool:
         return bool(self.providers)
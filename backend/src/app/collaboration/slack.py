@@ -2,13 +2,16 @@
 
 from __future__ import annotations
 
-import json
 import os
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
+import httpx
+import orjson
 import requests
 
+from app.utils.http_client import get_async_client
+
 
 @dataclass
 class SlackMessage:
@@ -21,11 +24,18 @@ class SlackMessage:
 class SlackNotifier:
     """Send notifications to Slack webhooks for collaboration workflows."""
 
-    def __init__(self, webhook_url: Optional[str] = None, session: Optional[requests.Session] = None):
+    def __init__(
+        self,
+        webhook_url: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        async_client: Optional[httpx.AsyncClient] = None,
+    ):
         self.webhook_url = webhook_url or os.getenv("SLACK_WEBHOOK_URL")
         self.session = session or requests.Session()
+        self._async_client = async_client
 
-    def send(self, message: SlackMessage) -> Dict[str, str]:
+    @staticmethod
+    def _payload(message: SlackMessage) -> Dict[str, Any]:
         payload: Dict[str, Any] = {
             "channel": message.channel,
             "text": message.text,
@@ -33,7 +43,32 @@ class SlackNotifier:
         }
         if message.metadata:
             payload["metadata"] = message.metadata
-        response = self.session.post(self.webhook_url, data=json.dumps(payload), timeout=10)
+        return payload
+
+    def send(self, message: SlackMessage) -> Dict[str, str]:
+        """Blocking send for CLI tooling; request handlers should use ``send_async``."""
+        payload = self._payload(message)
+        response = self.session.post(
+            self.webhook_url,
+            data=orjson.dumps(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=10,
+        )
+        response.raise_for_status()
+        return {"status": "sent", "channel": message.channel}
+
+    async def send_async(self, message: SlackMessage) -> Dict[str, str]:
+        """Send without blocking the event loop, reusing pooled keep-alive connections."""
+        client = self._async_client or get_async_client(
+            "slack",
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=8),
+        )
+        response = await client.post(
+            self.webhook_url,
+            content=orjson.dumps(self._payload(message)),
+            headers={"Content-Type": "application/json"},
+        )
         response.raise_for_status()
         return {"status": "sent", "channel": message.channel}
 
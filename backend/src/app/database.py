@@ -1,24 +1,169 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from typing import Any, AsyncIterator, Dict
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, sessionmaker
 import os
 
 from app.models import metadata
+from app.services.audit_partitions import AUDIT_LOG_PARTITIONING, convert_audit_logs
 
 
 DATABASE_URL = os.getenv(
     "DATABASE_URL",
-    "postgresql://postgres:postgres@db:5432/agent_tests",
+    "postgresql+psycopg://postgres:postgres@db:5432/agent_tests",
 )
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    future=True,
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+
+# Turn metrics_daily into a TimescaleDB hypertable during init_db (needs the extension).
+TIMESCALEDB_ENABLED = os.getenv("TIMESCALEDB_ENABLED", "false").lower() in {"1", "true", "yes", "on"}
+
+# Hypertable unique keys must include the time column, hence the primary key swap.
+# Continuous aggregates need a hypertable source, so rollups are built from metrics_daily.
+_TIMESCALE_HYPERTABLE_SQL = (
+    "ALTER TABLE metrics_daily DROP CONSTRAINT IF EXISTS metrics_daily_pkey",
+    "ALTER TABLE metrics_daily ADD PRIMARY KEY (id, date)",
+    "SELECT create_hypertable('metrics_daily', 'date', chunk_time_interval => INTERVAL '7 days', "
+    "migrate_data => TRUE, create_default_indexes => FALSE)",
+)
+_TIMESCALE_POLICY_SQL = (
+    "ALTER TABLE metrics_daily SET (timescaledb.compress, "
+    "timescaledb.compress_segmentby = 'graph_id', timescaledb.compress_orderby = 'date DESC')",
+    "SELECT add_compression_policy('metrics_daily', INTERVAL '30 days', if_not_exists => TRUE)",
+    """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS metrics_weekly
+    WITH (timescaledb.continuous) AS
+    SELECT
+        time_bucket(INTERVAL '7 days', date) AS bucket,
+        graph_id,
+        sum(total_runs) AS total_runs,
+        sum(passed_runs) AS passed_runs,
+        sum(failed_runs) AS failed_runs,
+        sum(error_runs) AS error_runs,
+        sum(avg_latency_ms * total_runs) / nullif(sum(total_runs), 0) AS avg_latency_ms,
+        sum(total_cost_usd) AS total_cost_usd,
+        sum(total_tokens) AS total_tokens
+    FROM metrics_daily
+    GROUP BY bucket, graph_id
+    WITH NO DATA
+    """,
+    "SELECT add_continuous_aggregate_policy('metrics_weekly', start_offset => INTERVAL '90 days', "
+    "end_offset => INTERVAL '1 day', schedule_interval => INTERVAL '1 day', if_not_exists => TRUE)",
 )
 
+# Hash columns that used to hold hex text; init_db rewrites them in place as raw BYTEA.
+_BYTEA_HASH_COLUMNS = (
+    ("audit_logs", "previous_hash"),
+    ("audit_logs", "event_hash"),
+    ("test_graph_versions", "content_hash"),
+    ("safety_violations", "content_hash"),
+)
+
+# Indexes superseded by wider replacements in the models; dropped from existing databases.
+_SUPERSEDED_INDEXES = (
+    "idx_metrics_graph",
+    "idx_outputs_run",
+    "idx_audit_action",
+    "idx_audit_tenant",
+    "idx_safety_run",
+    "idx_safety_tenant",
+)
+
+
+def _engine_options(url: str) -> Dict[str, Any]:
+    """Pool sizing for server databases; SQLite keeps SQLAlchemy's own pool choice."""
+
+    options: Dict[str, Any] = {"pool_pre_ping": True, "future": True}
+    if not url.startswith("sqlite"):
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_recycle=DB_POOL_RECYCLE_SECONDS,
+        )
+    return options
+
+
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
+
 SessionLocal = sessionmaker(bind=engine, expire_on_commit=False, future=True)
 
 
+async def get_db() -> AsyncIterator[Session]:
+    """FastAPI dependency yielding one session per request.
+
+    FastAPI caches dependencies within a request, so every dependency that asks for
+    ``get_db`` (authentication, the route itself) shares the same session.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def enable_timescale(bind: Engine) -> None:
+    """Convert ``metrics_daily`` to a compressed hypertable with a weekly rollup. Idempotent."""
+
+    with bind.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS timescaledb"))
+        is_hypertable = conn.execute(
+            text(
+                "SELECT 1 FROM timescaledb_information.hypertables "
+                "WHERE hypertable_name = 'metrics_daily'"
+            )
+        ).first()
+        if is_hypertable is None:
+            for statement in _TIMESCALE_HYPERTABLE_SQL:
+                conn.execute(text(statement))
+        for statement in _TIMESCALE_POLICY_SQL:
+            conn.execute(text(statement))
+
+
+def convert_hash_columns(conn: Connection) -> None:
+    """Rewrite legacy hex-text hash columns as BYTEA (half the bytes, smaller indexes). Idempotent."""
+
+    for table, column in _BYTEA_HASH_COLUMNS:
+        data_type = conn.execute(
+            text(
+                "SELECT data_type FROM information_schema.columns "
+                "WHERE table_name = :table AND column_name = :column AND table_schema = current_schema()"
+            ),
+            {"table": table, "column": column},
+        ).scalar()
+        if data_type != "character varying":
+            continue
+        # Anything that is not clean hex is kept byte-for-byte rather than lost.
+        conn.execute(
+            text(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE bytea USING "
+                f"CASE WHEN {column} ~ '^([0-9a-fA-F]{{2}})*$' THEN decode({column}, 'hex') "
+                f"ELSE convert_to({column}, 'UTF8') END"
+            )
+        )
+
+
+def create_missing_indexes(conn: Connection) -> None:
+    """Add indexes declared on tables that already exist; ``create_all`` only builds them with new tables."""
+
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+    for name in _SUPERSEDED_INDEXES:
+        conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
 def init_db() -> None:
     """Create database schema using the enhanced metadata."""
     metadata.create_all(engine)
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            convert_hash_columns(conn)
+            create_missing_indexes(conn)
+    if TIMESCALEDB_ENABLED and engine.dialect.name == "postgresql":
+        enable_timescale(engine)
+    if AUDIT_LOG_PARTITIONING and engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            convert_audit_logs(conn)
@@ -9,11 +9,32 @@ Provides:
 """
 
 import re
-from typing import Dict, Any, List, Optional, Tuple
+from collections import deque
+from typing import Dict, Any, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
 import hashlib
+import threading
+
+import numpy as np
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional dependency
+    ahocorasick = None
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - optional dependency
+    njit = None
+
+try:
+    import hyperscan
+except ImportError:  # pragma: no cover - optional dependency
+    hyperscan = None
 
 
 # ============================================================================
@@ -44,12 +65,204 @@ PII_PATTERNS = {
     PIIType.PASSWORD: r'(?i)(?:password|passwd|pwd)\s*[:=]\s*[^\s]+',
 }
 
+# When two PII patterns match at the same offset, the more sensitive type is reported.
+_PII_PRIORITY = (
+    PIIType.SSN,
+    PIIType.CREDIT_CARD,
+    PIIType.API_KEY,
+    PIIType.PASSWORD,
+    PIIType.PHONE,
+    PIIType.EMAIL,
+    PIIType.ADDRESS,
+    PIIType.IP_ADDRESS,
+    PIIType.DATE_OF_BIRTH,
+    PIIType.NAME,
+)
+_PII_RANK = {pii_type: rank for rank, pii_type in enumerate(_PII_PRIORITY)}
+
+# Score weights, built once rather than per scoring call.
+_PII_SEVERITY_WEIGHTS = MappingProxyType({
+    PIIType.SSN: 1.0,
+    PIIType.CREDIT_CARD: 1.0,
+    PIIType.API_KEY: 0.9,
+    PIIType.PASSWORD: 0.9,
+    PIIType.PHONE: 0.5,
+    PIIType.EMAIL: 0.4,
+    PIIType.IP_ADDRESS: 0.3,
+    PIIType.NAME: 0.2,
+    PIIType.ADDRESS: 0.4,
+    PIIType.DATE_OF_BIRTH: 0.3,
+})
+_POLICY_SEVERITY_WEIGHTS = MappingProxyType({
+    "low": 0.1,
+    "medium": 0.3,
+    "high": 0.5,
+    "critical": 1.0,
+})
+
+# Largest keyword automaton compiled into a dense 256-column DFA for the numba scanner.
+KEYWORD_DFA_MAX_STATES = 4096
+
+# hash_pii memoizes recent texts; longer texts are hashed without caching to bound memory.
+PII_HASH_CACHE_SIZE = 4096
+PII_HASH_CACHE_MAX_CHARS = 16384
+
+_LEADING_FLAGS = re.compile(r'^\(\?([imsx]+)\)')
+
+# Toxicity heuristics: insults, excessive caps, excessive exclamation.
+_TOXICITY_RE = re.compile(r'\b(?:hate|stupid|idiot|dumb)\b|[A-Z]{5,}|!{3,}', re.IGNORECASE | re.ASCII)
+
+
+def _as_alternative(name: str, pattern: str) -> str:
+    """Wrap ``pattern`` as a named group usable inside a larger alternation.
+
+    Leading global flags such as ``(?i)`` are only legal at the start of a whole
+    pattern, so they are rewritten into a scoped ``(?i:...)`` group.
+    """
+    flags = _LEADING_FLAGS.match(pattern)
+    if flags:
+        pattern = f"(?{flags.group(1)}:{pattern[flags.end():]})"
+    return f"(?P<{name}>{pattern})"
+
+
+def _stop_scan(*_args) -> bool:
+    return True
+
+
+def _build_keyword_dfa(keywords: List[bytes]) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Compile ``keywords`` into Aho-Corasick tables for ``_keyword_scan_kernel``.
+
+    Returns a dense ``(states, 256)`` transition table with failure links folded in,
+    plus CSR-encoded output lists, or None if the automaton would be too large.
+    """
+    goto: List[Dict[int, int]] = [{}]
+    outputs: List[List[int]] = [[]]
+    for keyword_id, keyword in enumerate(keywords):
+        state = 0
+        for byte in keyword:
+            nxt = goto[state].get(byte)
+            if nxt is None:
+                nxt = len(goto)
+                goto[state][byte] = nxt
+                goto.append({})
+                outputs.append([])
+            state = nxt
+        outputs[state].append(keyword_id)
+    if len(goto) > KEYWORD_DFA_MAX_STATES:
+        return None
+
+    delta = np.zeros((len(goto), 256), dtype=np.int32)
+    fail = [0] * len(goto)
+    queue = deque()
+    for byte, nxt in goto[0].items():
+        delta[0, byte] = nxt
+        queue.append(nxt)
+    # Breadth-first, so a state's failure target is always complete before it is copied.
+    while queue:
+        state = queue.popleft()
+        outputs[state].extend(outputs[fail[state]])
+        delta[state] = delta[fail[state]]
+        for byte, nxt in goto[state].items():
+            fail[nxt] = int(delta[fail[state], byte])
+            delta[state, byte] = nxt
+            queue.append(nxt)
+
+    out_start = np.zeros(len(goto) + 1, dtype=np.int32)
+    np.cumsum([len(ids) for ids in outputs], out=out_start[1:])
+    out_ids = np.fromiter((i for ids in outputs for i in ids), dtype=np.int32, count=int(out_start[-1]))
+    return delta, out_start, out_ids
+
+
+def _keyword_scan_kernel(
+    data: np.ndarray,
+    delta: np.ndarray,
+    out_start: np.ndarray,
+    out_ids: np.ndarray,
+    n_keywords: int,
+) -> np.ndarray:
+    """Run the keyword DFA over UTF-8 bytes and flag every keyword seen."""
+
+    hits = np.zeros(n_keywords, dtype=np.bool_)
+    state = 0
+    for i in range(data.shape[0]):
+        state = delta[state, data[i]]
+        for j in range(out_start[state], out_start[state + 1]):
+            hits[out_ids[j]] = True
+    return hits
+
+
+if njit is not None:
+    _keyword_scan_kernel = njit(cache=True, boundscheck=False)(_keyword_scan_kernel)
+
+
+class _HyperscanPrefilter:
+    """Vectorized "can anything match?" gate in front of the fused ``re`` scans.
+
+    Hyperscan reports which expressions fire but not ``re``'s leftmost-greedy spans
+    or capture groups, so it only lets clean text skip the ``re`` pass entirely.
+    Patterns are compiled with ``HS_FLAG_PREFILTER`` so a miss is always a true miss.
+    """
+
+    _INLINE_FLAGS = {"i": "HS_FLAG_CASELESS", "m": "HS_FLAG_MULTILINE", "s": "HS_FLAG_DOTALL"}
+
+    def __init__(self, db):
+        self._db = db
+        self._local = threading.local()
+
+    @classmethod
+    def build(
+        cls, patterns: List[str], caseless: bool = False, ascii_only: bool = False
+    ) -> Optional["_HyperscanPrefilter"]:
+        """Compile ``patterns`` into one database, or return None if Hyperscan can't be used.
+
+        ``ascii_only`` must mirror ``re.ASCII`` on the ``re`` side so ``\\b``/``\\w`` agree.
+        """
+        if hyperscan is None or not patterns:
+            return None
+        base = hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8
+        if not ascii_only:
+            base |= hyperscan.HS_FLAG_UCP
+        if caseless:
+            base |= hyperscan.HS_FLAG_CASELESS
+        expressions, flags = [], []
+        for pattern in patterns:
+            pattern_flags = base
+            leading = _LEADING_FLAGS.match(pattern)
+            if leading:
+                if set(leading.group(1)) - cls._INLINE_FLAGS.keys():
+                    return None
+                for flag in leading.group(1):
+                    pattern_flags |= getattr(hyperscan, cls._INLINE_FLAGS[flag])
+                pattern = pattern[leading.end():]
+            expressions.append(pattern.encode())
+            flags.append(pattern_flags)
+        db = hyperscan.Database()
+        try:
+            db.compile(expressions=expressions, ids=list(range(len(expressions))), elements=len(expressions), flags=flags)
+        except hyperscan.error:
+            return None
+        return cls(db)
+
+    def may_match(self, text: str) -> bool:
+        try:
+            data = text.encode("utf-8")
+        except UnicodeEncodeError:
+            return True
+        scratch = getattr(self._local, "scratch", None)
+        if scratch is None:
+            scratch = self._local.scratch = hyperscan.Scratch(self._db)
+        try:
+            self._db.scan(data, match_event_handler=_stop_scan, scratch=scratch)
+        except hyperscan.ScanTerminated:
+            return True
+        return False
+
 
 # ============================================================================
 # Data Classes
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PIIDetection:
     """Record of detected PII."""
     pii_type: PIIType
@@ -60,7 +273,7 @@ class PIIDetection:
     confidence: float = 1.0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PolicyViolation:
     """Record of a policy violation."""
     policy_id: str
@@ -72,7 +285,7 @@ class PolicyViolation:
     recommendation: str
 
 
-@dataclass
+@dataclass(slots=True)
 class SafetyScore:
     """Safety assessment score."""
     overall_score: float  # 0-1, higher is safer
@@ -95,32 +308,42 @@ class PIIDetector:
     
     def __init__(self, patterns: Optional[Dict[PIIType, str]] = None):
         self.patterns = patterns or PII_PATTERNS
-        self._compiled = {
-            pii_type: re.compile(pattern, re.IGNORECASE)
-            for pii_type, pattern in self.patterns.items()
-        }
+        # One alternation scanned once, so detections never overlap. Alternatives are
+        # ordered by _PII_PRIORITY: at a shared start offset the most sensitive type wins.
+        # PII formats are ASCII by construction, so re.ASCII keeps \b/\d/\w on the fast tables.
+        ordered = sorted(self.patterns.items(), key=lambda item: _PII_RANK.get(item[0], len(_PII_RANK)))
+        self._fused = re.compile(
+            "|".join(_as_alternative(pii_type.value, pattern) for pii_type, pattern in ordered),
+            re.IGNORECASE | re.ASCII,
+        )
+        self._by_group = {pii_type.value: pii_type for pii_type in self.patterns}
+        self._prefilter = _HyperscanPrefilter.build(
+            list(self.patterns.values()), caseless=True, ascii_only=True
+        )
+        self._hash_pii_cached = lru_cache(maxsize=PII_HASH_CACHE_SIZE)(self._hash_pii)
     
     def detect(self, text: str) -> List[PIIDetection]:
         """Detect all PII in text."""
         detections = []
-        
-        for pii_type, pattern in self._compiled.items():
-            for match in pattern.finditer(text):
-                value = match.group()
-                start, end = match.span()
-                
-                # Get context (surrounding text)
-                context_start = max(0, start - 20)
-                context_end = min(len(text), end + 20)
-                context = text[context_start:context_end]
-                
-                detections.append(PIIDetection(
-                    pii_type=pii_type,
-                    value=value,
-                    masked_value=self._mask_value(value, pii_type),
-                    position=(start, end),
-                    context=context
-                ))
+        if self._prefilter is not None and not self._prefilter.may_match(text):
+            return detections
+        text_len = len(text)
+        
+        for match in self._fused.finditer(text):
+            pii_type = self._by_group[match.lastgroup]
+            value = match.group()
+            start, end = match.span()
+            
+            # Get context (surrounding text)
+            context = text[max(0, start - 20):min(text_len, end + 20)]
+            
+            detections.append(PIIDetection(
+                pii_type=pii_type,
+                value=value,
+                masked_value=self._mask_value(value, pii_type),
+                position=(start, end),
+                context=context
+            ))
         
         return detections
     
@@ -150,26 +373,36 @@ class PIIDetector:
     def redact(self, text: str, replacement: str = "[REDACTED]") -> Tuple[str, List[PIIDetection]]:
         """Redact all PII from text."""
         detections = self.detect(text)
+        if not detections:
+            return text, detections
         
-        # Sort by position (reverse) to avoid offset issues
-        detections.sort(key=lambda d: d.position[0], reverse=True)
-        
-        redacted = text
+        # Detections come back ascending and non-overlapping, so one sweep rebuilds the text.
+        parts = []
+        cursor = 0
         for detection in detections:
             start, end = detection.position
-            redacted = redacted[:start] + replacement + redacted[end:]
+            parts.append(text[cursor:start])
+            parts.append(replacement)
+            cursor = end
+        parts.append(text[cursor:])
         
-        return redacted, detections
+        return "".join(parts), detections
     
     def hash_pii(self, text: str) -> str:
         """Create a hash of detected PII for tracking without storing raw values."""
+        if len(text) > PII_HASH_CACHE_MAX_CHARS:
+            return self._hash_pii(text)
+        return self._hash_pii_cached(text)
+    
+    def _hash_pii(self, text: str) -> str:
         detections = self.detect(text)
         if not detections:
             return ""
         
         pii_values = sorted([d.value for d in detections])
         combined = "|".join(pii_values)
-        return hashlib.sha256(combined.encode()).hexdigest()
+        # A tracking id, not a security boundary; BLAKE2b is cheaper than SHA-256 here.
+        return hashlib.blake2b(combined.encode(), digest_size=16).hexdigest()
 
 
 # ============================================================================
@@ -232,55 +465,141 @@ class PolicyEngine:
     ]
     
     def __init__(self, rules: Optional[List[PolicyRule]] = None):
-        self.rules = rules or self.DEFAULT_RULES
-        self._compiled_patterns = {}
-        
-        for rule in self.rules:
-            if rule.pattern:
-                self._compiled_patterns[rule.id] = re.compile(rule.pattern)
+        self.rules = rules or list(self.DEFAULT_RULES)
+        self._frozen = False
+        self._build_pattern_index()
+        self._build_keyword_index()
+    
+    def freeze(self) -> "PolicyEngine":
+        """Reject further ``add_rule`` calls; used for the shared default engine."""
+        self._frozen = True
+        return self
     
     def add_rule(self, rule: PolicyRule):
         """Add a new policy rule."""
+        if self._frozen:
+            raise RuntimeError("Cannot add rules to a shared PolicyEngine; create a new PolicyEngine instead")
         self.rules.append(rule)
-        if rule.pattern:
-            self._compiled_patterns[rule.id] = re.compile(rule.pattern)
+        self._build_pattern_index()
+        self._build_keyword_index()
+    
+    def _build_pattern_index(self):
+        """Fuse every pattern rule into one alternation scanned once per check.
+
+        Each rule gets a synthetic group name (rule ids need not be valid identifiers);
+        the span of its inner groups is kept so matches render exactly as ``findall`` would.
+        """
+        alternatives = []
+        self._pattern_groups: Dict[str, Tuple[int, int, int]] = {}
+        group_offset = 1
+        for rule_idx, rule in enumerate(self.rules):
+            if not rule.pattern:
+                continue
+            inner_groups = re.compile(rule.pattern).groups
+            name = f"rule{rule_idx}"
+            alternatives.append(_as_alternative(name, rule.pattern))
+            self._pattern_groups[name] = (rule_idx, group_offset, inner_groups)
+            group_offset += inner_groups + 1
+        self._fused_policy = re.compile("|".join(alternatives)) if alternatives else None
+        self._pattern_prefilter = _HyperscanPrefilter.build(
+            [rule.pattern for rule in self.rules if rule.pattern]
+        )
+    
+    def _matched_patterns(self, text: str) -> Dict[int, List[str]]:
+        hits: Dict[int, List[str]] = {}
+        if self._pattern_prefilter is not None and not self._pattern_prefilter.may_match(text):
+            return hits
+        for match in self._fused_policy.finditer(text):
+            rule_idx, group, inner_groups = self._pattern_groups[match.lastgroup]
+            if inner_groups == 0:
+                content = match.group(group)
+            else:
+                content = " ".join(match.group(i) or "" for i in range(group + 1, group + 1 + inner_groups))
+            hits.setdefault(rule_idx, []).append(content)
+        return hits
+    
+    def _build_keyword_index(self):
+        """Map each lower-cased keyword to the (rule, keyword) slots that own it.
+
+        All keywords are matched in one automaton pass with pyahocorasick, or else
+        with a numba-compiled byte DFA; without either, each distinct keyword is a
+        substring check.
+        """
+        index: Dict[str, List[Tuple[int, int]]] = {}
+        for rule_idx, rule in enumerate(self.rules):
+            for keyword_idx, keyword in enumerate(rule.keywords or ()):
+                if keyword:
+                    index.setdefault(keyword.lower(), []).append((rule_idx, keyword_idx))
+        self._keyword_index = index
+        self._keyword_owners = list(index.values())
+        self._keyword_automaton = None
+        self._keyword_dfa = None
+        if not index:
+            return
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for keyword, owners in index.items():
+                automaton.add_word(keyword, tuple(owners))
+            automaton.make_automaton()
+            self._keyword_automaton = automaton
+        elif njit is not None:
+            self._keyword_dfa = _build_keyword_dfa([keyword.encode("utf-8", "surrogatepass") for keyword in index])
+    
+    def _matched_keywords(self, text_lower: str) -> Set[Tuple[int, int]]:
+        if self._keyword_automaton is not None:
+            hits: Set[Tuple[int, int]] = set()
+            for _, owners in self._keyword_automaton.iter(text_lower):
+                hits.update(owners)
+            return hits
+        if self._keyword_dfa is not None:
+            data = np.frombuffer(text_lower.encode("utf-8", "surrogatepass"), dtype=np.uint8)
+            found = _keyword_scan_kernel(data, *self._keyword_dfa, len(self._keyword_owners))
+            return {owner for keyword_id in np.flatnonzero(found) for owner in self._keyword_owners[keyword_id]}
+        return {
+            owner
+            for keyword, owners in self._keyword_index.items()
+            if keyword in text_lower
+            for owner in owners
+        }
     
     def check(self, text: str) -> List[PolicyViolation]:
         """Check text against all enabled policies."""
         violations = []
-        
-        for rule in self.rules:
+        matched_patterns = self._matched_patterns(text) if self._fused_policy is not None else {}
+        # Lower-case the text once for every keyword rule, and only if there are keywords.
+        text_lower = text.lower() if self._keyword_index else ""
+        matched_keywords = self._matched_keywords(text_lower) if text_lower else set()
+        if not matched_patterns and not matched_keywords:
+            return violations
+        context = text[:100] + "..." if len(text) > 100 else text
+        
+        for rule_idx, rule in enumerate(self.rules):
             if not rule.enabled:
                 continue
             
             # Check pattern-based rules
-            if rule.pattern and rule.id in self._compiled_patterns:
-                pattern = self._compiled_patterns[rule.id]
-                matches = pattern.findall(text)
-                
-                for match in matches:
-                    match_str = match if isinstance(match, str) else " ".join(match)
+            if rule.pattern:
+                for match_str in matched_patterns.get(rule_idx, ()):
                     violations.append(PolicyViolation(
                         policy_id=rule.id,
                         policy_name=rule.name,
                         violation_type="pattern_match",
                         content=match_str,
-                        context=text[:100] + "..." if len(text) > 100 else text,
+                        context=context,
                         severity=rule.severity,
                         recommendation=f"Review content for {rule.description}"
                     ))
             
             # Check keyword-based rules
             if rule.keywords:
-                text_lower = text.lower()
-                for keyword in rule.keywords:
-                    if keyword.lower() in text_lower:
+                for keyword_idx, keyword in enumerate(rule.keywords):
+                    if (rule_idx, keyword_idx) in matched_keywords:
                         violations.append(PolicyViolation(
                             policy_id=rule.id,
                             policy_name=rule.name,
                             violation_type="keyword_match",
                             content=keyword,
-                            context=text[:100] + "..." if len(text) > 100 else text,
+                            context=context,
                             severity=rule.severity,
                             recommendation=f"Content contains flagged keyword: {keyword}"
                         ))
@@ -302,8 +621,8 @@ class SafetyScorer:
         pii_detector: Optional[PIIDetector] = None,
         policy_engine: Optional[PolicyEngine] = None
     ):
-        self.pii_detector = pii_detector or PIIDetector()
-        self.policy_engine = policy_engine or PolicyEngine()
+        self.pii_detector = pii_detector or _DEFAULT_PII_DETECTOR
+        self.policy_engine = policy_engine or _DEFAULT_POLICY_ENGINE
     
     def score(self, text: str) -> SafetyScore:
         """Generate comprehensive safety score for text."""
@@ -313,17 +632,55 @@ class SafetyScorer:
         # Check policies
         policy_violations = self.policy_engine.check(text)
         
-        # Calculate scores
-        pii_score = self._calculate_pii_score(pii_detections)
+        return self._build_score(text, pii_detections, policy_violations, self._estimate_toxicity(text))
+    
+    def score_with_gate(self, text: str, min_score: float) -> SafetyScore:
+        """Score text, skipping the PII and toxicity scans once rejection is certain.
+        
+        Policies are checked first; if the overall score would fall below
+        ``min_score`` even with perfect PII and toxicity scores, that upper bound
+        is returned (with no detections) and ``metadata["gated"]`` is set.
+        """
+        policy_violations = self.policy_engine.check(text)
         policy_score = self._calculate_policy_score(policy_violations)
-        toxicity_score = self._estimate_toxicity(text)
+        best_case = self._combine(1.0, policy_score, 1.0)
+        if best_case < min_score:
+            return SafetyScore(
+                overall_score=best_case,
+                pii_score=1.0,
+                policy_score=policy_score,
+                toxicity_score=1.0,
+                violations=policy_violations,
+                metadata={
+                    "text_length": len(text),
+                    "violation_count": len(policy_violations),
+                    "gated": True,
+                }
+            )
         
+        pii_detections = self.pii_detector.detect(text)
+        return self._build_score(text, pii_detections, policy_violations, self._estimate_toxicity(text))
+    
+    @staticmethod
+    def _combine(pii_score: float, policy_score: float, toxicity_score: float) -> float:
         # Overall score (weighted average)
-        overall_score = (
+        return (
             pii_score * 0.3 +
             policy_score * 0.4 +
             toxicity_score * 0.3
         )
+    
+    def _build_score(
+        self,
+        text: str,
+        pii_detections: List[PIIDetection],
+        policy_violations: List[PolicyViolation],
+        toxicity_score: float,
+    ) -> SafetyScore:
+        # Calculate scores
+        pii_score = self._calculate_pii_score(pii_detections)
+        policy_score = self._calculate_policy_score(policy_violations)
+        overall_score = self._combine(pii_score, policy_score, toxicity_score)
         
         return SafetyScore(
             overall_score=overall_score,
@@ -345,23 +702,8 @@ class SafetyScorer:
             return 1.0
         
         # Weight by PII type severity
-        severity_weights = {
-            PIIType.SSN: 1.0,
-            PIIType.CREDIT_CARD: 1.0,
-            PIIType.API_KEY: 0.9,
-            PIIType.PASSWORD: 0.9,
-            PIIType.PHONE: 0.5,
-            PIIType.EMAIL: 0.4,
-            PIIType.IP_ADDRESS: 0.3,
-            PIIType.NAME: 0.2,
-            PIIType.ADDRESS: 0.4,
-            PIIType.DATE_OF_BIRTH: 0.3,
-        }
-        
-        total_weight = sum(
-            severity_weights.get(d.pii_type, 0.5)
-            for d in detections
-        )
+        weight = _PII_SEVERITY_WEIGHTS.get
+        total_weight = sum(weight(d.pii_type, 0.5) for d in detections)
         
         # Decay function: more PII = lower score
         return max(0, 1 - (total_weight * 0.2))
@@ -371,17 +713,8 @@ class SafetyScorer:
         if not violations:
             return 1.0
         
-        severity_weights = {
-            "low": 0.1,
-            "medium": 0.3,
-            "high": 0.5,
-            "critical": 1.0
-        }
-        
-        total_weight = sum(
-            severity_weights.get(v.severity, 0.3)
-            for v in violations
-        )
+        weight = _POLICY_SEVERITY_WEIGHTS.get
+        total_weight = sum(weight(v.severity, 0.3) for v in violations)
         
         return max(0, 1 - (total_weight * 0.25))
     
@@ -392,16 +725,8 @@ class SafetyScorer:
         Note: In production, use a proper toxicity model like Perspective API
         or a fine-tuned classifier.
         """
-        # Simple heuristic for demo purposes
-        toxic_indicators = [
-            r'\b(hate|stupid|idiot|dumb)\b',
-            r'[A-Z]{5,}',  # Excessive caps
-            r'!{3,}',  # Excessive exclamation
-        ]
-        
-        toxicity_count = 0
-        for pattern in toxic_indicators:
-            toxicity_count += len(re.findall(pattern, text, re.IGNORECASE))
+        # Simple heuristic for demo purposes; one pass, counting without building match lists
+        toxicity_count = sum(1 for _ in _TOXICITY_RE.finditer(text))
         
         # Normalize
         return max(0, 1 - (toxicity_count * 0.1))
@@ -425,11 +750,14 @@ class GovernanceMiddleware:
         block_violations: bool = False,
         min_safety_score: float = 0.5
     ):
-        self.pii_detector = pii_detector or PIIDetector()
-        self.policy_engine = policy_engine or PolicyEngine()
-        self.safety_scorer = safety_scorer or SafetyScorer(
-            self.pii_detector, self.policy_engine
-        )
+        self.pii_detector = pii_detector or _DEFAULT_PII_DETECTOR
+        self.policy_engine = policy_engine or _DEFAULT_POLICY_ENGINE
+        if safety_scorer is None:
+            if self.pii_detector is _DEFAULT_PII_DETECTOR and self.policy_engine is _DEFAULT_POLICY_ENGINE:
+                safety_scorer = _DEFAULT_SCORER
+            else:
+                safety_scorer = SafetyScorer(self.pii_detector, self.policy_engine)
+        self.safety_scorer = safety_scorer
         self.redact_pii = redact_pii
         self.block_violations = block_violations
         self.min_safety_score = min_safety_score
@@ -458,7 +786,7 @@ class GovernanceMiddleware:
     
     def process_output(self, text: str) -> Tuple[str, SafetyScore]:
         """Process output text through governance controls."""
-        score = self.safety_scorer.score(text)
+        score = self.safety_scorer.score_with_gate(text, self.min_safety_score)
         
         # Check minimum safety score
         if score.overall_score < self.min_safety_score:
@@ -474,6 +802,16 @@ class GovernanceMiddleware:
         return processed_text, score
 
 
+# ============================================================================
+# Shared Defaults
+# ============================================================================
+
+# Compiled once at import and shared by every default scorer/middleware.
+_DEFAULT_PII_DETECTOR = PIIDetector()
+_DEFAULT_POLICY_ENGINE = PolicyEngine().freeze()
+_DEFAULT_SCORER = SafetyScorer(_DEFAULT_PII_DETECTOR, _DEFAULT_POLICY_ENGINE)
+
+
 # ============================================================================
 # Export Functions
 # ============================================================================
@@ -489,8 +827,7 @@ def create_default_governance() -> GovernanceMiddleware:
 
 def check_safety(text: str) -> Dict[str, Any]:
     """Quick safety check for text."""
-    scorer = SafetyScorer()
-    score = scorer.score(text)
+    score = _DEFAULT_SCORER.score(text)
     
     return {
         "overall_score": round(score.overall_score, 2),
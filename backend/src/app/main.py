@@ -13,7 +13,6 @@ behavioral test graphs with support for:
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 import os
 import structlog
@@ -25,6 +24,11 @@ from app.config import get_settings
 from app.observability import setup_observability
 from app.observability.logging import RequestLoggingMiddleware
 from app.reliability import load_default_slos
+from app.providers import ProviderRegistry
+from app.auth import password_hashing_info
+from app.services.audit_log import audit_log_writer
+from app.utils.http_client import close_async_clients
+from app.utils.responses import ORJSONResponse
 
 logger = structlog.get_logger(__name__)
 
@@ -36,9 +40,18 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Multi-Agent Testing Platform...")
     init_db()
     logger.info("Database initialized")
+    logger.info("Password hashing configured", **password_hashing_info())
+    # FastAPI memoizes the schema on app.openapi_schema (rebuilding only when the
+    # route table changes); build it now so the first /openapi.json is not slow.
+    app.openapi()
+    # Provider types and env-configured providers are static for the process lifetime.
+    app.state.provider_registry = ProviderRegistry()
+    await audit_log_writer.start()
     yield
     # Shutdown
     logger.info("Shutting down...")
+    await audit_log_writer.stop()
+    await close_async_clients()
 
 
 app = FastAPI(
@@ -57,6 +70,7 @@ app = FastAPI(
     """,
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc"
 )
@@ -100,7 +114,7 @@ app.include_router(simulation.router)
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error", "type": type(exc).__name__}
     )
@@ -129,10 +143,9 @@ def health_check():
 
 
 @app.get("/providers", tags=["Configuration"])
-def list_available_providers():
+def list_available_providers(request: Request):
     """List available LLM providers."""
-    from app.providers import ProviderRegistry
-    registry = ProviderRegistry()
+    registry = request.app.state.provider_registry
     return {
         "available": registry.list_available_providers(),
         "configured": registry.list_providers()
@@ -10,20 +10,46 @@ Includes:
 
 from sqlalchemy import (
     Table, Column, Integer, String, JSON, Float, MetaData, 
-    Text, Boolean, DateTime, ForeignKey, Index, Enum as SQLEnum
+    Text, Boolean, DateTime, ForeignKey, Index, Enum as SQLEnum, LargeBinary, text
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from datetime import UTC, datetime
 import enum
 
+from blake3 import blake3
+
 metadata = MetaData()
 
 
+# Binary jsonb on PostgreSQL (indexable, no re-parse on read); plain JSON elsewhere.
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+def _jsonb_gin_index(name: str, column: str) -> Index:
+    """GIN(jsonb_path_ops) index serving ``@>`` containment filters; PostgreSQL only."""
+    return Index(
+        name, column, postgresql_using="gin", postgresql_ops={column: "jsonb_path_ops"}
+    ).ddl_if(dialect="postgresql")
+
+
+def _brin_index(name: str, column: str) -> Index:
+    """BRIN index for insert-ordered timestamps: a few pages instead of a full B-tree; PostgreSQL only."""
+    return Index(
+        name, column, postgresql_using="brin", postgresql_with={"pages_per_range": 32, "autosummarize": "on"}
+    ).ddl_if(dialect="postgresql")
+
+
 def utcnow():
     """Timezone-aware UTC helper to avoid deprecated datetime.utcnow()."""
     return datetime.now(UTC)
 
 
+def content_hash(payload: bytes) -> bytes:
+    """BLAKE3 digest used for ``content_hash`` columns (32 raw bytes, like SHA-256)."""
+    return blake3(payload).digest()
+
+
 # ============================================================================
 # Enums
 # ============================================================================
@@ -89,15 +115,15 @@ TestGraph = Table(
     Column("id", Integer, primary_key=True),
     Column("name", String(255), nullable=False),
     Column("description", Text),
-    Column("content", JSON, nullable=False),
+    Column("content", JSONType, nullable=False),
     Column("version", Integer, default=1),
     Column("is_active", Boolean, default=True),
     Column("created_by", Integer, ForeignKey("users.id")),
     Column("tenant_id", String(128), default="default"),
     Column("created_at", DateTime, default=utcnow),
     Column("updated_at", DateTime, default=utcnow, onupdate=utcnow),
-    Column("tags", JSON),  # ["regression", "smoke", "integration"]
-    Column("metadata", JSON),  # Additional graph metadata
+    Column("tags", JSONType),  # ["regression", "smoke", "integration"]
+    Column("metadata", JSONType),  # Additional graph metadata
     Index("idx_graphs_name", "name"),
     Index("idx_graphs_active", "is_active"),
     Index("idx_graphs_tenant", "tenant_id"),
@@ -110,8 +136,8 @@ TestGraphVersion = Table(
     Column("id", Integer, primary_key=True),
     Column("graph_id", Integer, ForeignKey("test_graphs.id"), nullable=False),
     Column("version", Integer, nullable=False),
-    Column("content", JSON, nullable=False),
-    Column("content_hash", String(64)),
+    Column("content", JSONType, nullable=False),
+    Column("content_hash", LargeBinary(32)),  # BLAKE3 of the canonical JSON content
     Column("created_by", Integer, ForeignKey("users.id")),
     Column("tenant_id", String(128), default="default"),
     Column("created_at", DateTime, default=utcnow),
@@ -134,7 +160,7 @@ TestRun = Table(
     Column("graph_version", Integer),
     Column("tenant_id", String(128)),
     Column("status", String(50), default="pending"),
-    Column("results", JSON),
+    Column("results", JSONType),
     Column("latency_ms", Float),
     Column("cost_usd", Float),
     Column("tokens_in", Integer, default=0),
@@ -153,7 +179,7 @@ TestRun = Table(
     Column("completed_at", DateTime),
     Column("created_at", DateTime, default=utcnow),
     Column("error_message", Text),
-    Column("metadata", JSON),
+    Column("metadata", JSONType),
     Index("idx_runs_graph", "graph_id"),
     Index("idx_runs_status", "status"),
     Index("idx_runs_created", "created_at"),
@@ -169,10 +195,11 @@ ExecutionTrace = Table(
     metadata,
     Column("id", Integer, primary_key=True),
     Column("run_id", Integer, ForeignKey("test_runs.id"), nullable=False),
-    Column("trace_data", JSON, nullable=False),  # Full trace object
+    Column("trace_data", JSONType, nullable=False),  # Full trace object
     Column("graph_hash", String(64)),
     Column("created_at", DateTime, default=utcnow),
     Index("idx_traces_run", "run_id"),
+    _brin_index("idx_traces_created_brin", "created_at"),
 )
 
 
@@ -183,8 +210,8 @@ AgentOutput = Table(
     Column("run_id", Integer, ForeignKey("test_runs.id"), nullable=False),
     Column("node_id", String(255), nullable=False),
     Column("agent_type", String(100)),
-    Column("input_data", JSON),
-    Column("output_data", JSON),
+    Column("input_data", JSONType),
+    Column("output_data", JSONType),
     Column("latency_ms", Float),
     Column("cost_usd", Float),
     Column("tokens_in", Integer),
@@ -193,8 +220,14 @@ AgentOutput = Table(
     Column("model", String(100)),
     Column("trace_id", String(64)),
     Column("created_at", DateTime, default=utcnow),
-    Index("idx_outputs_run", "run_id"),
+    # Covers per-run latency/cost/token rollups with an index-only scan.
+    Index(
+        "idx_outputs_run_cover",
+        "run_id",
+        postgresql_include=["latency_ms", "cost_usd", "tokens_in", "tokens_out"],
+    ),
     Index("idx_outputs_node", "node_id"),
+    _brin_index("idx_outputs_created_brin", "created_at"),
 )
 
 
@@ -210,14 +243,15 @@ AssertionResult = Table(
     Column("assertion_id", String(255)),
     Column("assertion_type", String(100)),
     Column("target_node", String(255)),
-    Column("expected", JSON),
-    Column("actual", JSON),
+    Column("expected", JSONType),
+    Column("actual", JSONType),
     Column("passed", Boolean),
     Column("message", Text),
-    Column("metadata", JSON),
+    Column("metadata", JSONType),
     Column("created_at", DateTime, default=utcnow),
     Index("idx_assertions_run", "run_id"),
     Index("idx_assertions_passed", "passed"),
+    _brin_index("idx_assertions_created_brin", "created_at"),
 )
 
 
@@ -235,12 +269,13 @@ ContractViolation = Table(
     Column("source_node", String(255)),
     Column("target_node", String(255)),
     Column("field", String(255)),
-    Column("expected", JSON),
-    Column("actual", JSON),
+    Column("expected", JSONType),
+    Column("actual", JSONType),
     Column("message", Text),
     Column("severity", String(50)),
     Column("created_at", DateTime, default=utcnow),
     Index("idx_violations_run", "run_id"),
+    _brin_index("idx_violations_created_brin", "created_at"),
 )
 
 
@@ -256,19 +291,21 @@ AuditLog = Table(
     Column("action", String(50), nullable=False),
     Column("resource_type", String(100)),  # "graph", "run", "user"
     Column("resource_id", Integer),
-    Column("details", JSON),
+    Column("details", JSONType),
     Column("ip_address", String(45)),
     Column("user_agent", String(500)),
     Column("correlation_id", String(64)),
-    Column("previous_hash", String(128)),
-    Column("event_hash", String(128)),
+    Column("previous_hash", LargeBinary(32)),  # SHA-256 digests, stored raw
+    Column("event_hash", LargeBinary(32)),
     Column("retention_days", Integer, default=365),
     Column("tenant_id", String(128), default="default"),
     Column("created_at", DateTime, default=utcnow),
     Index("idx_audit_user", "user_id"),
-    Index("idx_audit_action", "action"),
     Index("idx_audit_created", "created_at"),
-    Index("idx_audit_tenant", "tenant_id"),
+    # Tenant-scoped reads filter on tenant (and action) and page newest first.
+    Index("idx_audit_tenant_created", "tenant_id", text("created_at DESC")),
+    Index("idx_audit_tenant_action_created", "tenant_id", "action", text("created_at DESC")),
+    _jsonb_gin_index("idx_audit_details_gin", "details"),
 )
 
 
@@ -283,7 +320,7 @@ Webhook = Table(
     Column("name", String(255)),
     Column("url", String(500), nullable=False),
     Column("secret", String(255)),
-    Column("events", JSON),  # ["run_completed", "run_failed"]
+    Column("events", JSONType),  # ["run_completed", "run_failed"]
     Column("is_active", Boolean, default=True),
     Column("created_by", Integer, ForeignKey("users.id")),
     Column("created_at", DateTime, default=utcnow),
@@ -297,12 +334,13 @@ WebhookDelivery = Table(
     Column("id", Integer, primary_key=True),
     Column("webhook_id", Integer, ForeignKey("webhooks.id")),
     Column("event", String(100)),
-    Column("payload", JSON),
+    Column("payload", JSONType),
     Column("response_status", Integer),
     Column("response_body", Text),
     Column("delivered_at", DateTime),
     Column("success", Boolean),
     Index("idx_deliveries_webhook", "webhook_id"),
+    _brin_index("idx_deliveries_delivered_brin", "delivered_at"),
 )
 
 
@@ -316,7 +354,7 @@ ProviderConfig = Table(
     Column("id", Integer, primary_key=True),
     Column("name", String(100), unique=True, nullable=False),
     Column("provider_type", String(50), nullable=False),
-    Column("config", JSON),  # Encrypted in production
+    Column("config", JSONType),  # Encrypted in production
     Column("is_default", Boolean, default=False),
     Column("is_active", Boolean, default=True),
     Column("created_by", Integer, ForeignKey("users.id")),
@@ -336,7 +374,7 @@ MetricsDaily = Table(
     "metrics_daily",
     metadata,
     Column("id", Integer, primary_key=True),
-    Column("date", DateTime, nullable=False),
+    Column("date", DateTime(timezone=True), nullable=False),
     Column("graph_id", Integer, ForeignKey("test_graphs.id")),
     Column("total_runs", Integer, default=0),
     Column("passed_runs", Integer, default=0),
@@ -349,7 +387,8 @@ MetricsDaily = Table(
     Column("total_cost_usd", Float),
     Column("total_tokens", Integer),
     Index("idx_metrics_date", "date"),
-    Index("idx_metrics_graph", "graph_id"),
+    # Per-graph dashboards read the newest days first.
+    Index("idx_metrics_graph_date", "graph_id", text("date DESC")),
 )
 
 
@@ -365,12 +404,12 @@ SimulationRun = Table(
     Column("scenario", String(255)),
     Column("status", String(50), default="pending"),
     Column("tenant_id", String(128), default="default"),
-    Column("config", JSON),
+    Column("config", JSONType),
     Column("steps_executed", Integer, default=0),
     Column("started_at", DateTime),
     Column("completed_at", DateTime),
     Column("created_by", Integer, ForeignKey("users.id")),
-    Column("metadata", JSON),
+    Column("metadata", JSONType),
     Column("created_at", DateTime, default=utcnow),
     Column("updated_at", DateTime, default=utcnow, onupdate=utcnow),
     Index("idx_simrun_status", "status"),
@@ -386,7 +425,7 @@ SimulationEvent = Table(
     Column("step_index", Integer, nullable=False),
     Column("agent_id", String(128)),
     Column("event_type", String(64), nullable=False),
-    Column("payload", JSON, nullable=False),
+    Column("payload", JSONType, nullable=False),
     Column("created_at", DateTime, default=utcnow),
     Index("idx_simevent_run", "run_id"),
     Index("idx_simevent_step", "step_index"),
@@ -399,7 +438,7 @@ SimulationAgentState = Table(
     Column("run_id", Integer, ForeignKey("simulation_runs.id"), nullable=False),
     Column("agent_id", String(128), nullable=False),
     Column("agent_type", String(128)),
-    Column("state", JSON, nullable=False),
+    Column("state", JSONType, nullable=False),
     Column("last_event_id", Integer, ForeignKey("simulation_events.id")),
     Column("created_at", DateTime, default=utcnow),
     Column("updated_at", DateTime, default=utcnow, onupdate=utcnow),
@@ -418,7 +457,7 @@ SafetyPolicy = Table(
     Column("id", Integer, primary_key=True),
     Column("name", String(255), nullable=False),
     Column("description", Text),
-    Column("rules", JSON),  # Policy rules configuration
+    Column("rules", JSONType),  # Policy rules configuration
     Column("is_active", Boolean, default=True),
     Column("created_by", Integer, ForeignKey("users.id")),
     Column("tenant_id", String(128), default="default"),
@@ -433,12 +472,14 @@ SafetyViolation = Table(
     Column("run_id", Integer, ForeignKey("test_runs.id")),
     Column("policy_id", Integer, ForeignKey("safety_policies.id")),
     Column("violation_type", String(100)),
-    Column("details", JSON),
+    Column("details", JSONType),
     Column("severity", String(50)),
-    Column("content_hash", String(64)),  # Hash of offending content
+    Column("content_hash", LargeBinary(32)),  # Hash of offending content
     Column("tenant_id", String(128), default="default"),
     Column("created_at", DateTime, default=utcnow),
-    Index("idx_safety_run", "run_id"),
+    Index("idx_safety_run_created", "run_id", "created_at"),
     Index("idx_safety_type", "violation_type"),
-    Index("idx_safety_tenant", "tenant_id"),
+    Index("idx_safety_tenant_type_created", "tenant_id", "violation_type", text("created_at DESC")),
+    _brin_index("idx_safety_created_brin", "created_at"),
+    _jsonb_gin_index("idx_safety_details_gin", "details"),
 )
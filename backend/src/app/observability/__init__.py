@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import weakref
+
 from fastapi import FastAPI
 from typing import Optional
 
@@ -9,7 +11,7 @@ from .logging import configure_logging_once
 from .metrics import configure_metrics_once
 from .tracing import configure_tracing
 
-_configured_apps: set[int] = set()
+_configured_apps: "weakref.WeakSet[FastAPI]" = weakref.WeakSet()
 
 
 def setup_observability(
@@ -25,13 +27,12 @@ def setup_observability(
     for assertions.
     """
 
-    app_id = id(app)
-    if app_id in _configured_apps:
+    if app in _configured_apps:
         return
 
     configure_logging_once()
     configure_metrics_once(app)
     configure_tracing(app, exporter=tracing_exporter)
 
-    _configured_apps.add(app_id)
+    _configured_apps.add(app)
 
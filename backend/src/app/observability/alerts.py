@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
-from typing import Dict, List
+from dataclasses import dataclass
+from functools import cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Sequence
+
+import orjson
 
 
 RUNBOOK_URL = "https://github.com/example-org/multi-agent-testing/blob/main/backend/docs/runbooks.md"
@@ -16,48 +20,52 @@ class AlertRule:
     name: str
     expr: str
     for_: str
-    labels: Dict[str, str]
-    annotations: Dict[str, str]
+    labels: Mapping[str, str]
+    annotations: Mapping[str, str]
+
+
+# Built once; labels/annotations are read-only views so the shared rules can't drift.
+_DEFAULT_ALERT_RULES = (
+    AlertRule(
+        name="HighRequestLatency95",
+        expr="histogram_quantile(0.95, sum(rate(app_http_request_latency_seconds_bucket[5m])) by (le)) > 1",
+        for_="5m",
+        labels=MappingProxyType({"severity": "warning"}),
+        annotations=MappingProxyType({
+            "summary": "P95 API latency above 1s",
+            "runbook": RUNBOOK_URL + "#api-latency-spikes",
+        }),
+    ),
+    AlertRule(
+        name="RunFailuresSpike",
+        expr="sum(rate(app_run_outcomes_total{status=~\"failed|error\"}[10m])) > 5",
+        for_="10m",
+        labels=MappingProxyType({"severity": "critical"}),
+        annotations=MappingProxyType({
+            "summary": "Runs failing at an elevated rate",
+            "runbook": RUNBOOK_URL + "#run-failure-investigation",
+        }),
+    ),
+    AlertRule(
+        name="CostAnomaly",
+        expr="sum(increase(app_run_cost_usd_total[1h])) > 100",
+        for_="15m",
+        labels=MappingProxyType({"severity": "critical"}),
+        annotations=MappingProxyType({
+            "summary": "Run cost increased by more than $100 in an hour",
+            "runbook": RUNBOOK_URL + "#cost-anomalies",
+        }),
+    ),
+)
 
 
 def default_alert_rules() -> List[AlertRule]:
     """Return the default alert rules used by the platform."""
 
-    return [
-        AlertRule(
-            name="HighRequestLatency95",
-            expr="histogram_quantile(0.95, sum(rate(app_http_request_latency_seconds_bucket[5m])) by (le)) > 1",
-            for_="5m",
-            labels={"severity": "warning"},
-            annotations={
-                "summary": "P95 API latency above 1s",
-                "runbook": RUNBOOK_URL + "#api-latency-spikes",
-            },
-        ),
-        AlertRule(
-            name="RunFailuresSpike",
-            expr="sum(rate(app_run_outcomes_total{status=~\"failed|error\"}[10m])) > 5",
-            for_="10m",
-            labels={"severity": "critical"},
-            annotations={
-                "summary": "Runs failing at an elevated rate",
-                "runbook": RUNBOOK_URL + "#run-failure-investigation",
-            },
-        ),
-        AlertRule(
-            name="CostAnomaly",
-            expr="sum(increase(app_run_cost_usd_total[1h])) > 100",
-            for_="15m",
-            labels={"severity": "critical"},
-            annotations={
-                "summary": "Run cost increased by more than $100 in an hour",
-                "runbook": RUNBOOK_URL + "#cost-anomalies",
-            },
-        ),
-    ]
-
-
-def serialize_prometheus_rules(rules: List[AlertRule]) -> Dict[str, List[Dict]]:
+    return list(_DEFAULT_ALERT_RULES)
+
+
+def serialize_prometheus_rules(rules: Sequence[AlertRule]) -> Dict[str, List[Dict]]:
     """Serialize rules to a Prometheus-compatible rule group."""
 
     return {
@@ -70,8 +78,8 @@ def serialize_prometheus_rules(rules: List[AlertRule]) -> Dict[str, List[Dict]]:
                         "alert": rule.name,
                         "expr": rule.expr,
                         "for": rule.for_,
-                        "labels": rule.labels,
-                        "annotations": rule.annotations,
+                        "labels": dict(rule.labels),
+                        "annotations": dict(rule.annotations),
                     }
                     for rule in rules
                 ],
@@ -80,6 +88,20 @@ def serialize_prometheus_rules(rules: List[AlertRule]) -> Dict[str, List[Dict]]:
     }
 
 
+@cache
+def get_default_prometheus_rules() -> Dict[str, List[Dict]]:
+    """Serialized default rule group, built once; callers must treat it as read-only."""
+
+    return serialize_prometheus_rules(_DEFAULT_ALERT_RULES)
+
+
+@cache
+def get_default_prometheus_rules_bytes() -> bytes:
+    """The default rule group as JSON bytes, ready to write to disk or an HTTP body."""
+
+    return orjson.dumps(get_default_prometheus_rules())
+
+
 def build_incident_payload(rule: AlertRule) -> Dict[str, str]:
     """Construct a payload sent to incident tooling for the rule."""
 
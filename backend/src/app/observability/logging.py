@@ -4,50 +4,60 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
 import time
-from typing import Optional
+from typing import Optional, Tuple
 
 import structlog
 from fastapi import Request
 from opentelemetry import trace
+from opentelemetry.trace import INVALID_SPAN, INVALID_SPAN_ID, INVALID_TRACE_ID
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 
 _logging_configured = False
+_config_lock = threading.Lock()
+# Whether request logs survive the level filter; lets the middleware skip building them.
+_info_enabled = True
 
 
 def configure_logging_once() -> None:
-    """Configure structlog-backed logging in an idempotent way."""
+    """Configure structlog-backed logging in an idempotent, thread-safe way."""
 
-    global _logging_configured
+    global _logging_configured, _info_enabled
     if _logging_configured:
         return
 
-    log_level = os.getenv("LOG_LEVEL", "INFO").upper()
-
-    structlog.reset_defaults()
-    structlog.configure(
-        processors=[
-            structlog.contextvars.merge_contextvars,
-            structlog.processors.add_log_level,
-            structlog.processors.TimeStamper(fmt="iso", utc=True),
-            structlog.processors.StackInfoRenderer(),
-            structlog.processors.format_exc_info,
-            structlog.processors.JSONRenderer(),
-        ],
-        context_class=dict,
-        logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.make_filtering_bound_logger(getattr(logging, log_level, logging.INFO)),
-        cache_logger_on_first_use=True,
-    )
-
-    # Route stdlib logging through structlog
-    logging.basicConfig(
-        level=getattr(logging, log_level, logging.INFO),
-        format="%(message)s",
-    )
-
-    _logging_configured = True
+    with _config_lock:
+        if _logging_configured:
+            return
+
+        log_level = getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO)
+        _info_enabled = log_level <= logging.INFO
+
+        # configure() replaces every setting passed here, so no reset_defaults() first.
+        structlog.configure(
+            processors=[
+                structlog.contextvars.merge_contextvars,
+                structlog.processors.add_log_level,
+                structlog.processors.TimeStamper(fmt="iso", utc=True),
+                structlog.processors.StackInfoRenderer(),
+                structlog.processors.format_exc_info,
+                structlog.processors.JSONRenderer(),
+            ],
+            context_class=dict,
+            logger_factory=structlog.stdlib.LoggerFactory(),
+            wrapper_class=structlog.make_filtering_bound_logger(log_level),
+            cache_logger_on_first_use=True,
+        )
+
+        # Route stdlib logging through structlog
+        logging.basicConfig(
+            level=log_level,
+            format="%(message)s",
+        )
+
+        _logging_configured = True
 
 
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
@@ -58,12 +68,15 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         self.logger = structlog.get_logger(logger_name)
 
     async def dispatch(self, request: Request, call_next) -> Response:
+        if not _info_enabled:
+            return await call_next(request)
+
         start = time.perf_counter()
         initial_correlation = getattr(request.state, "correlation_id", None)
         correlation_id = initial_correlation
         status: Optional[int] = None
 
-        with structlog.contextvars.bound_contextvars(method=request.method, path=request.url.path):
+        with structlog.contextvars.bound_contextvars(method=request.method, path=request.scope["path"]):
             try:
                 response = await call_next(request)
                 status = response.status_code
@@ -71,33 +84,26 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                 return response
             finally:
                 duration = time.perf_counter() - start
-                trace_id = _current_trace_id()
-                span_id = _current_span_id()
-                structlog.contextvars.bind_contextvars(
+                trace_id, span_id = _current_trace_ids()
+                with structlog.contextvars.bound_contextvars(
                     trace_id=trace_id,
                     span_id=span_id,
                     correlation_id=correlation_id,
-                )
-                self.logger.info(
-                    "request.completed",
-                    status=status or 500,
-                    duration_ms=round(duration * 1000, 3),
-                )
-                structlog.contextvars.reset_contextvars()
+                ):
+                    self.logger.info(
+                        "request.completed",
+                        status=status or 500,
+                        duration_ms=round(duration * 1000, 3),
+                    )
 
 
-def _current_trace_id() -> Optional[str]:
-    span = trace.get_current_span()
-    span_context = span.get_span_context()
-    if span_context and span_context.trace_id:
-        return format(span_context.trace_id, "032x")
-    return None
+def _current_trace_ids() -> Tuple[Optional[str], Optional[str]]:
+    """Return the active ``(trace_id, span_id)`` as hex, or ``None``s outside a valid span."""
 
-
-def _current_span_id() -> Optional[str]:
     span = trace.get_current_span()
+    if span is INVALID_SPAN:
+        return None, None
     span_context = span.get_span_context()
-    if span_context and span_context.span_id:
-        return format(span_context.span_id, "016x")
-    return None
-
+    trace_id = format(span_context.trace_id, "032x") if span_context.trace_id != INVALID_TRACE_ID else None
+    span_id = format(span_context.span_id, "016x") if span_context.span_id != INVALID_SPAN_ID else None
+    return trace_id, span_id
@@ -2,17 +2,20 @@
 
 from __future__ import annotations
 
+import gzip
 import time
+import weakref
+from functools import lru_cache
 from typing import Optional
 
 from fastapi import FastAPI, Response
 from prometheus_client import (
-    CONTENT_TYPE_LATEST,
+    REGISTRY,
     Counter,
     Gauge,
     Histogram,
-    generate_latest,
 )
+from prometheus_client.exposition import choose_encoder
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 
@@ -46,19 +49,43 @@ WORKER_ACTIVE_GAUGE = Gauge(
     "Number of active background jobs currently executing",
 )
 
-_configured_apps: set[int] = set()
+# Weak references: a recycled id() of a collected app must not count as configured.
+_configured_apps: "weakref.WeakSet[FastAPI]" = weakref.WeakSet()
+
+# Routes are fixed after startup, so label-bound children can be reused per request
+# instead of paying ``labels()``'s lookup and lock every time.
+METRICS_LABEL_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=METRICS_LABEL_CACHE_SIZE)
+def _request_counter(method: str, route: str, status: int):
+    return REQUEST_COUNTER.labels(method, route, str(status))
+
+
+@lru_cache(maxsize=METRICS_LABEL_CACHE_SIZE)
+def _request_latency(method: str, route: str):
+    return REQUEST_LATENCY.labels(method, route)
+
+
+@lru_cache(maxsize=64)
+def _run_outcome_counter(status: str):
+    return RUN_OUTCOME_COUNTER.labels(status=status)
+
+
+@lru_cache(maxsize=64)
+def _run_cost_counter(status: str):
+    return RUN_COST_USD.labels(status=status)
 
 
 def configure_metrics_once(app: FastAPI) -> None:
     """Register metrics middleware and endpoint exactly once per app."""
 
-    app_id = id(app)
-    if app_id in _configured_apps:
+    if app in _configured_apps:
         return
 
     app.add_middleware(RequestMetricsMiddleware)
     app.add_route("/metrics/prometheus", prometheus_endpoint, methods=["GET"])
-    _configured_apps.add(app_id)
+    _configured_apps.add(app)
 
 
 class RequestMetricsMiddleware(BaseHTTPMiddleware):
@@ -71,25 +98,36 @@ class RequestMetricsMiddleware(BaseHTTPMiddleware):
 
         route = _safe_route(request)
         if not route.startswith("/metrics"):
-            REQUEST_COUNTER.labels(request.method, route, str(response.status_code)).inc()
-            REQUEST_LATENCY.labels(request.method, route).observe(duration)
+            _request_counter(request.method, route, response.status_code).inc()
+            _request_latency(request.method, route).observe(duration)
 
         return response
 
 
-async def prometheus_endpoint(request=None) -> Response:
-    """Return the Prometheus exposition format metrics payload."""
+async def prometheus_endpoint(request: Optional[Request] = None) -> Response:
+    """Return the metrics payload, in OpenMetrics when the scraper asks for it.
+
+    The exposition is plain text that compresses ~10x, so gzip-capable scrapers
+    get it compressed at the cheapest level.
+    """
 
-    payload = generate_latest()
-    return Response(payload, media_type=CONTENT_TYPE_LATEST)
+    headers = request.headers if request is not None else {}
+    encoder, content_type = choose_encoder(headers.get("accept", ""))
+    payload = encoder(REGISTRY)
+    response_headers = {"Vary": "Accept, Accept-Encoding"}
+    if "gzip" in headers.get("accept-encoding", ""):
+        payload = gzip.compress(payload, compresslevel=1)
+        response_headers["Content-Encoding"] = "gzip"
+    return Response(payload, media_type=content_type, headers=response_headers)
 
 
 def record_run_outcome(*, status: str, cost_usd: Optional[float] = None) -> None:
     """Update run outcome counters from worker and orchestration flows."""
 
-    RUN_OUTCOME_COUNTER.labels(status=status).inc()
-    if cost_usd:
-        RUN_COST_USD.labels(status=status).inc(cost_usd)
+    _run_outcome_counter(status).inc()
+    # Counters reject negative increments, and a zero increment is a wasted lookup.
+    if cost_usd is not None and cost_usd > 0:
+        _run_cost_counter(status).inc(cost_usd)
 
 
 class worker_job_active:
@@ -105,8 +143,15 @@ class worker_job_active:
 
 
 def _safe_route(request: Request) -> str:
-    route = request.scope.get("route")
+    scope = request.scope
+    resolved = scope.get("_resolved_route")
+    if resolved is not None:
+        return resolved
+    route = scope.get("route")
     if route and getattr(route, "path", None):
-        return route.path
-    return request.url.path
+        # Only a matched route is final; before routing the template isn't known yet.
+        resolved = scope["_resolved_route"] = route.path
+        return resolved
+    # scope["path"] avoids building a URL object just to read the path back.
+    return scope["path"]
 
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+import weakref
 from typing import Optional
 
 from fastapi import FastAPI
@@ -18,6 +19,7 @@ from opentelemetry.sdk.trace.export import (
     SpanExporter,
     SpanExportResult,
 )
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
 from opentelemetry.sdk.trace.sampling import TraceIdRatioBased
 
 try:
@@ -31,6 +33,12 @@ _fastapi_instrumentor = FastAPIInstrumentor()
 _requests_instrumented = False
 _provider: Optional[TracerProvider] = None
 _default_processor_configured = False
+_attached_exporters: weakref.WeakSet[SpanExporter] = weakref.WeakSet()
+
+# Batch export tuning; the OTEL_BSP_* names match the SDK's own environment variables.
+OTEL_BSP_MAX_QUEUE_SIZE = int(os.getenv("OTEL_BSP_MAX_QUEUE_SIZE", "8192"))
+OTEL_BSP_MAX_EXPORT_BATCH_SIZE = int(os.getenv("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", "512"))
+OTEL_BSP_SCHEDULE_DELAY = int(os.getenv("OTEL_BSP_SCHEDULE_DELAY", "2000"))
 
 
 def configure_tracing(app: FastAPI, *, exporter: Optional[SpanExporter] = None) -> None:
@@ -56,10 +64,13 @@ def configure_tracing(app: FastAPI, *, exporter: Optional[SpanExporter] = None)
 
     if exporter is None and not _default_processor_configured:
         exporter = _default_exporter()
-        provider.add_span_processor(BatchSpanProcessor(exporter))
+        if not isinstance(exporter, _NullSpanExporter):
+            provider.add_span_processor(_span_processor(exporter))
         _default_processor_configured = True
-    elif exporter is not None:
-        provider.add_span_processor(SimpleSpanProcessor(exporter))
+    elif exporter is not None and exporter not in _attached_exporters:
+        # Attaching the same exporter twice would export every span twice.
+        provider.add_span_processor(_span_processor(exporter))
+        _attached_exporters.add(exporter)
 
     # Re-instrument if necessary
     if _fastapi_instrumentor.is_instrumented_by_opentelemetry:
@@ -79,6 +90,19 @@ def get_tracer(name: str = "app") -> trace.Tracer:
     return trace.get_tracer(name)
 
 
+def _span_processor(exporter: SpanExporter):
+    """Batch exports off the request path; in-memory test exporters stay synchronous."""
+
+    if isinstance(exporter, InMemorySpanExporter):
+        return SimpleSpanProcessor(exporter)
+    return BatchSpanProcessor(
+        exporter,
+        max_queue_size=OTEL_BSP_MAX_QUEUE_SIZE,
+        schedule_delay_millis=OTEL_BSP_SCHEDULE_DELAY,
+        max_export_batch_size=OTEL_BSP_MAX_EXPORT_BATCH_SIZE,
+    )
+
+
 def _default_exporter() -> SpanExporter:
     otlp_endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT")
     if otlp_endpoint and OTLPSpanExporter:
@@ -12,16 +12,103 @@ Configurable at runtime via provider registry.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, Mapping, Optional, List, Tuple
 from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+import asyncio
 import os
-import json
+import sys
+import threading
 import time
 
+import httpx
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.providers.resilience import CircuitBreaker, CircuitOpenError, backoff_delay, is_transient_error
 from app.services.secrets import resolve_provider_api_key
+from app.utils.http_client import get_async_client
+from app.utils.rate_limit import TokenBucket
+
+try:
+    import openai
+except ImportError:  # pragma: no cover - optional dependency
+    openai = None
+
+try:
+    import anthropic
+except ImportError:  # pragma: no cover - optional dependency
+    anthropic = None
+
+PROVIDER_MAX_CONNECTIONS = int(os.getenv("PROVIDER_MAX_CONNECTIONS", "100"))
+PROVIDER_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("PROVIDER_MAX_KEEPALIVE_CONNECTIONS", "50"))
+PROVIDER_CONCURRENCY_LIMIT = int(os.getenv("PROVIDER_CONCURRENCY_LIMIT", "32"))
+
+
+def _provider_http_client() -> httpx.AsyncClient:
+    """Return the pooled client shared by all providers on the running event loop."""
+
+    return get_async_client(
+        "providers",
+        timeout=60.0,
+        limits=httpx.Limits(
+            max_connections=PROVIDER_MAX_CONNECTIONS,
+            max_keepalive_connections=PROVIDER_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
+
+
+def _prompt_json(input_data: Any) -> str:
+    """Serialize ``input_data`` for a prompt.
+
+    Sorted keys keep the prompt text stable for equal inputs, so provider-side
+    prompt caching and the response cache both see identical requests.
+    """
+
+    return orjson.dumps(input_data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode()
+
+
+@lru_cache(maxsize=256)
+def _default_system_prompt(agent_type: str) -> str:
+    return f"You are a {agent_type} agent."
+
+
+def _system_prompt(agent_type: str, agent_config: Dict[str, Any]) -> str:
+    # The default is only built (once per agent type) when the node has no prompt of its own.
+    prompt = agent_config.get("system_prompt")
+    return _default_system_prompt(agent_type) if prompt is None else prompt
+
+
+def _estimate_tokens(payload: Any) -> int:
+    """Rough four-characters-per-token count for mock responses.
+
+    orjson serializes large inputs far faster than ``str(dict)`` and never
+    raises here, since unknown types fall back to ``str``.
+    """
+
+    return len(orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS, default=str)) // 4
+
+
+def _per_token_pricing(pricing: Dict[str, Dict[str, float]]) -> Dict[str, Tuple[float, float]]:
+    """Convert per-1K-token ``PRICING`` tables to ``(input, output)`` USD per token."""
+
+    return {model: (rates["input"] / 1000, rates["output"] / 1000) for model, rates in pricing.items()}
 
 
-@dataclass
+async def _stream_chat_completion(client: Any, request: Dict[str, Any]) -> AsyncIterator[str]:
+    """Yield content deltas from an OpenAI-compatible streaming chat completion."""
+
+    stream = await client.chat.completions.create(**request, stream=True)
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+@dataclass(slots=True)
 class ProviderConfig:
     """Configuration for an LLM provider."""
     name: str
@@ -30,11 +117,11 @@ class ProviderConfig:
     default_model: str = ""
     timeout: int = 30
     max_retries: int = 3
-    rate_limit_rpm: int = 60
+    rate_limit_rpm: int = 0  # requests per minute; 0 means no client-side limit
     extra: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass 
+@dataclass(slots=True)
 class ExecutionResult:
     """Result from provider execution."""
     response: str
@@ -49,10 +136,21 @@ class ExecutionResult:
 
 class BaseProvider(ABC):
     """Base class for LLM providers."""
+
+    # USD per (input, output) token for models missing from ``_pricing``.
+    _FALLBACK_RATES: Tuple[float, float] = (0.0, 0.0)
     
     def __init__(self, config: ProviderConfig):
         self.config = config
         self.name = config.name
+        self._pricing: Dict[str, Tuple[float, float]] = {}
+        self._client: Any = None
+        self._async_client: Optional[tuple] = None
+        # Enforces rate_limit_rpm for hosted APIs; concurrency_limit caps in-flight async calls.
+        self._bucket = TokenBucket(config.rate_limit_rpm)
+        self._concurrency_limit = int(config.extra.get("concurrency_limit", PROVIDER_CONCURRENCY_LIMIT))
+        self._semaphore: Optional[tuple] = None
+        self._breaker = CircuitBreaker(**config.extra.get("circuit_breaker", {}))
     
     @abstractmethod
     def execute(
@@ -63,6 +161,130 @@ class BaseProvider(ABC):
     ) -> Dict[str, Any]:
         """Execute an agent task through the provider."""
         pass
+
+    async def execute_async(
+        self,
+        agent_type: str,
+        agent_config: Dict[str, Any],
+        input_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Execute without blocking the event loop.
+
+        Providers without an async client run ``execute`` in a worker thread.
+        """
+        async with self._concurrency_slot():
+            return await asyncio.to_thread(self.execute, agent_type, agent_config, input_data)
+
+    async def execute_stream(
+        self,
+        agent_type: str,
+        agent_config: Dict[str, Any],
+        input_data: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """Yield response text as it is generated.
+
+        Providers without a streaming API yield the whole response once. Unlike
+        ``execute``, native streams raise on failure, since a partially consumed
+        stream cannot be turned into an error result.
+        """
+        result = await self.execute_async(agent_type, agent_config, input_data)
+        yield result.get("response", "")
+
+    async def execute_batch(
+        self,
+        requests: List[Tuple[str, Dict[str, Any], Dict[str, Any]]]
+    ) -> List[Any]:
+        """Execute ``(agent_type, agent_config, input_data)`` requests as one batch.
+
+        The default issues them concurrently over the shared connection pool;
+        failures are returned in place of results rather than raised.
+        """
+        return await asyncio.gather(
+            *(self.execute_async(*request) for request in requests),
+            return_exceptions=True,
+        )
+
+    @asynccontextmanager
+    async def _concurrency_slot(self) -> AsyncIterator[None]:
+        """Hold one of this provider's in-flight slots on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore[0] is not loop:
+            self._semaphore = (loop, asyncio.Semaphore(self._concurrency_limit))
+        async with self._semaphore[1]:
+            yield
+
+    @asynccontextmanager
+    async def _rate_limited(self) -> AsyncIterator[None]:
+        """Hold an in-flight slot and wait for a rate-limit token before calling the API."""
+        async with self._concurrency_slot():
+            await self._bucket.acquire()
+            yield
+
+    def _call_api(self, call: Callable[[], Any], *, retries: int = 0) -> Any:
+        """Make one vendor API call through the circuit breaker.
+
+        Transient failures are retried ``retries`` times with jittered backoff;
+        SDK clients retry internally, so their callers leave ``retries`` at 0.
+        Raises :class:`CircuitOpenError` without calling out while the circuit is open.
+        """
+        for attempt in range(retries + 1):
+            if not self._breaker.allow():
+                raise CircuitOpenError(f"Provider {self.name} circuit is open")
+            try:
+                result = call()
+            except Exception as exc:
+                transient = is_transient_error(exc)
+                self._breaker.record(not transient)
+                if not transient or attempt == retries:
+                    raise
+                time.sleep(backoff_delay(attempt))
+                continue
+            except BaseException:
+                self._breaker.abandon()
+                raise
+            self._breaker.record(True)
+            return result
+
+    async def _acall_api(self, call: Callable[[], Awaitable[Any]], *, retries: int = 0) -> Any:
+        """Async counterpart of :meth:`_call_api`."""
+        for attempt in range(retries + 1):
+            if not self._breaker.allow():
+                raise CircuitOpenError(f"Provider {self.name} circuit is open")
+            try:
+                result = await call()
+            except Exception as exc:
+                transient = is_transient_error(exc)
+                self._breaker.record(not transient)
+                if not transient or attempt == retries:
+                    raise
+                await asyncio.sleep(backoff_delay(attempt))
+                continue
+            except BaseException:
+                # Cancellation must not leave a half-open probe outstanding forever.
+                self._breaker.abandon()
+                raise
+            self._breaker.record(True)
+            return result
+
+    def _sdk_client(self, factory: Callable[[], Any]) -> Any:
+        """Return this provider's sync SDK client, built on first use and reused afterwards.
+
+        SDK clients own their connection pool, so building one per call would pay
+        for a fresh pool and TLS handshake on every request.
+        """
+        if self._client is None:
+            self._client = factory()
+        return self._client
+
+    def _async_sdk_client(self, factory: Callable[[httpx.AsyncClient], Any]) -> Any:
+        """Return this provider's async SDK client, built on the shared connection pool.
+
+        The SDK client is rebuilt only when the pooled HTTP client changes (new event loop).
+        """
+        http_client = _provider_http_client()
+        if self._async_client is None or self._async_client[0] is not http_client:
+            self._async_client = (http_client, factory(http_client))
+        return self._async_client[1]
     
     @abstractmethod
     def get_models(self) -> List[str]:
@@ -85,12 +307,14 @@ class OpenAIProvider(BaseProvider):
         "gpt-4o-mini": {"input": 0.00015, "output": 0.0006},
         "gpt-3.5-turbo": {"input": 0.0005, "output": 0.0015},
     }
+    _FALLBACK_RATES = (0.000001, 0.000002)
     
     def __init__(self, config: ProviderConfig):
         super().__init__(config)
         self.api_key = resolve_provider_api_key("openai", "OPENAI_API_KEY", config.api_key)
         self.base_url = config.base_url or "https://api.openai.com/v1"
         self.default_model = config.default_model or "gpt-4o-mini"
+        self._pricing = _per_token_pricing(self.PRICING)
     
     def execute(
         self,
@@ -99,63 +323,116 @@ class OpenAIProvider(BaseProvider):
         input_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Execute through OpenAI API."""
+        if openai is None:
+            return self._mock_response(agent_type, input_data)
+        self._bucket.acquire_sync()
         try:
-            import openai
-            
-            client = openai.OpenAI(
-                api_key=self.api_key,
-                base_url=self.base_url
+            client = self._sdk_client(
+                lambda: openai.OpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    max_retries=self.config.max_retries,
+                )
             )
-            
-            model = agent_config.get("model", self.default_model)
-            system_prompt = agent_config.get("system_prompt", f"You are a {agent_type} agent.")
-            
-            messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": json.dumps(input_data)}
-            ]
-            
+            request = self._chat_request(agent_type, agent_config, input_data)
             start = time.perf_counter()
-            response = client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=agent_config.get("temperature", 0.7),
-                max_tokens=agent_config.get("max_tokens", 1024)
-            )
-            latency_ms = (time.perf_counter() - start) * 1000
-            
-            tokens_in = response.usage.prompt_tokens
-            tokens_out = response.usage.completion_tokens
-            
-            return {
-                "response": response.choices[0].message.content,
-                "confidence": 0.95,
-                "_tokens_in": tokens_in,
-                "_tokens_out": tokens_out,
-                "_latency_ms": latency_ms,
-                "_cost_usd": self.estimate_cost(tokens_in, tokens_out, model),
-                "_model": model,
-                "_provider": "openai"
-            }
-            
-        except ImportError:
-            return self._mock_response(agent_type, input_data)
+            response = self._call_api(lambda: client.chat.completions.create(**request))
+            return self._chat_result(response, request["model"], (time.perf_counter() - start) * 1000)
         except Exception as e:
-            return {
-                "response": f"Error: {str(e)}",
-                "error": str(e),
-                "_tokens_in": 0,
-                "_tokens_out": 0,
-                "_model": agent_config.get("model", self.default_model),
-                "_provider": "openai"
-            }
+            return self._error_result(agent_config, e)
+
+    async def execute_async(
+        self,
+        agent_type: str,
+        agent_config: Dict[str, Any],
+        input_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Execute through OpenAI's async client on the shared connection pool."""
+        if openai is None:
+            return self._mock_response(agent_type, input_data)
+        async with self._rate_limited():
+            try:
+                client = self._async_api_client()
+                request = self._chat_request(agent_type, agent_config, input_data)
+                start = time.perf_counter()
+                response = await self._acall_api(lambda: client.chat.completions.create(**request))
+                return self._chat_result(response, request["model"], (time.perf_counter() - start) * 1000)
+            except Exception as e:
+                return self._error_result(agent_config, e)
+
+    async def execute_stream(
+        self,
+        agent_type: str,
+        agent_config: Dict[str, Any],
+        input_data: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """Stream completion text from OpenAI as it is generated."""
+        if openai is None:
+            yield self._mock_response(agent_type, input_data)["response"]
+            return
+        async with self._rate_limited():
+            request = self._chat_request(agent_type, agent_config, input_data)
+            async for text in _stream_chat_completion(self._async_api_client(), request):
+                yield text
+
+    def _async_api_client(self) -> Any:
+        return self._async_sdk_client(
+            lambda http_client: openai.AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=self.config.timeout,
+                max_retries=self.config.max_retries,
+                http_client=http_client,
+            )
+        )
+
+    def _chat_request(
+        self,
+        agent_type: str,
+        agent_config: Dict[str, Any],
+        input_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        system_prompt = _system_prompt(agent_type, agent_config)
+        return {
+            "model": agent_config.get("model", self.default_model),
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": _prompt_json(input_data)}
+            ],
+            "temperature": agent_config.get("temperature", 0.7),
+            "max_tokens": agent_config.get("max_tokens", 1024),
+        }
+
+    def _chat_result(self, response: Any, model: str, latency_ms: float) -> Dict[str, Any]:
+        tokens_in = response.usage.prompt_tokens
+        tokens_out = response.usage.completion_tokens
+        return {
+            "response": response.choices[0].message.content,
+            "confidence": 0.95,
+            "_tokens_in": tokens_in,
+            "_tokens_out": tokens_out,
+            "_latency_ms": latency_ms,
+            "_cost_usd": self.estimate_cost(tokens_in, tokens_out, model),
+            "_model": model,
+            "_provider": "openai"
+        }
+
+    def _error_result(self, agent_config: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        return {
+            "response": f"Error: {str(error)}",
+            "error": str(error),
+            "_tokens_in": 0,
+            "_tokens_out": 0,
+            "_model": agent_config.get("model", self.default_model),
+            "_provider": "openai"
+        }
     
     def _mock_response(self, agent_type: str, input_data: Dict) -> Dict[str, Any]:
         """Mock response when OpenAI package not available."""
         return {
-            "response": f"[MOCK] {agent_type} response for: {json.dumps(input_data)[:100]}",
+            "response": f"[MOCK] {agent_type} response for: {_prompt_json(input_data)[:100]}",
             "confidence": 0.9,
-            "_tokens_in": len(str(input_data)) // 4,
+            "_tokens_in": _estimate_tokens(input_data),
             "_tokens_out": 50,
             "_mock": True,
             "_provider": "openai"
@@ -165,8 +442,8 @@ class OpenAIProvider(BaseProvider):
         return list(self.PRICING.keys())
     
     def estimate_cost(self, tokens_in: int, tokens_out: int, model: str) -> float:
-        pricing = self.PRICING.get(model, {"input": 0.001, "output": 0.002})
-        return (tokens_in * pricing["input"] + tokens_out * pricing["output"]) / 1000
+        rate_in, rate_out = self._pricing.get(model, self._FALLBACK_RATES)
+        return tokens_in * rate_in + tokens_out * rate_out
 
 
 class AnthropicProvider(BaseProvider):
@@ -178,11 +455,13 @@ class AnthropicProvider(BaseProvider):
         "claude-3-sonnet-20240229": {"input": 0.003, "output": 0.015},
         "claude-3-haiku-20240307": {"input": 0.00025, "output": 0.00125},
     }
+    _FALLBACK_RATES = (0.000001, 0.000005)
     
     def __init__(self, config: ProviderConfig):
         super().__init__(config)
         self.api_key = resolve_provider_api_key("anthropic", "ANTHROPIC_API_KEY", config.api_key)
         self.default_model = config.default_model or "claude-3-haiku-20240307"
+        self._pricing = _per_token_pricing(self.PRICING)
     
     def execute(
         self,
@@ -191,56 +470,109 @@ class AnthropicProvider(BaseProvider):
         input_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Execute through Anthropic API."""
+        if anthropic is None:
+            return self._mock_response(agent_type, input_data)
+        self._bucket.acquire_sync()
         try:
-            import anthropic
-            
-            client = anthropic.Anthropic(api_key=self.api_key)
-            
-            model = agent_config.get("model", self.default_model)
-            system_prompt = agent_config.get("system_prompt", f"You are a {agent_type} agent.")
-            
-            start = time.perf_counter()
-            response = client.messages.create(
-                model=model,
-                max_tokens=agent_config.get("max_tokens", 1024),
-                system=system_prompt,
-                messages=[
-                    {"role": "user", "content": json.dumps(input_data)}
-                ]
+            client = self._sdk_client(
+                lambda: anthropic.Anthropic(api_key=self.api_key, max_retries=self.config.max_retries)
             )
-            latency_ms = (time.perf_counter() - start) * 1000
-            
-            tokens_in = response.usage.input_tokens
-            tokens_out = response.usage.output_tokens
-            
-            return {
-                "response": response.content[0].text,
-                "confidence": 0.95,
-                "_tokens_in": tokens_in,
-                "_tokens_out": tokens_out,
-                "_latency_ms": latency_ms,
-                "_cost_usd": self.estimate_cost(tokens_in, tokens_out, model),
-                "_model": model,
-                "_provider": "anthropic"
-            }
-            
-        except ImportError:
-            return self._mock_response(agent_type, input_data)
+            request = self._messages_request(agent_type, agent_config, input_data)
+            start = time.perf_counter()
+            response = self._call_api(lambda: client.messages.create(**request))
+            return self._messages_result(response, request["model"], (time.perf_counter() - start) * 1000)
         except Exception as e:
-            return {
-                "response": f"Error: {str(e)}",
-                "error": str(e),
-                "_tokens_in": 0,
-                "_tokens_out": 0,
-                "_model": agent_config.get("model", self.default_model),
-                "_provider": "anthropic"
-            }
+            return self._error_result(agent_config, e)
+
+    async def execute_async(
+        self,
+        agent_type: str,
+        agent_config: Dict[str, Any],
+        input_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Execute through Anthropic's async client on the shared connection pool."""
+        if anthropic is None:
+            return self._mock_response(agent_type, input_data)
+        async with self._rate_limited():
+            try:
+                client = self._async_api_client()
+                request = self._messages_request(agent_type, agent_config, input_data)
+                start = time.perf_counter()
+                response = await self._acall_api(lambda: client.messages.create(**request))
+                return self._messages_result(response, request["model"], (time.perf_counter() - start) * 1000)
+            except Exception as e:
+                return self._error_result(agent_config, e)
+
+    async def execute_stream(
+        self,
+        agent_type: str,
+        agent_config: Dict[str, Any],
+        input_data: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """Stream completion text from Anthropic as it is generated."""
+        if anthropic is None:
+            yield self._mock_response(agent_type, input_data)["response"]
+            return
+        async with self._rate_limited():
+            request = self._messages_request(agent_type, agent_config, input_data)
+            async with self._async_api_client().messages.stream(**request) as stream:
+                async for text in stream.text_stream:
+                    yield text
+
+    def _async_api_client(self) -> Any:
+        return self._async_sdk_client(
+            lambda http_client: anthropic.AsyncAnthropic(
+                api_key=self.api_key,
+                timeout=self.config.timeout,
+                max_retries=self.config.max_retries,
+                http_client=http_client,
+            )
+        )
+
+    def _messages_request(
+        self,
+        agent_type: str,
+        agent_config: Dict[str, Any],
+        input_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        return {
+            "model": agent_config.get("model", self.default_model),
+            "max_tokens": agent_config.get("max_tokens", 1024),
+            "system": _system_prompt(agent_type, agent_config),
+            "messages": [
+                {"role": "user", "content": _prompt_json(input_data)}
+            ],
+        }
+
+    def _messages_result(self, response: Any, model: str, latency_ms: float) -> Dict[str, Any]:
+        tokens_in = response.usage.input_tokens
+        tokens_out = response.usage.output_tokens
+        return {
+            "response": response.content[0].text,
+            "confidence": 0.95,
+            "_tokens_in": tokens_in,
+            "_tokens_out": tokens_out,
+            "_latency_ms": latency_ms,
+            "_cost_usd": self.estimate_cost(tokens_in, tokens_out, model),
+            "_model": model,
+            "_provider": "anthropic"
+        }
+
+    def _error_result(self, agent_config: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        return {
+            "response": f"Error: {str(error)}",
+            "error": str(error),
+            "_tokens_in": 0,
+            "_tokens_out": 0,
+            "_model": agent_config.get("model", self.default_model),
+            "_provider": "anthropic"
+        }
     
     def _mock_response(self, agent_type: str, input_data: Dict) -> Dict[str, Any]:
         return {
             "response": f"[MOCK] Claude {agent_type} response",
             "confidence": 0.9,
-            "_tokens_in": len(str(input_data)) // 4,
+            "_tokens_in": _estimate_tokens(input_data),
             "_tokens_out": 50,
             "_mock": True,
             "_provider": "anthropic"
@@ -250,8 +582,8 @@ class AnthropicProvider(BaseProvider):
         return list(self.PRICING.keys())
     
     def estimate_cost(self, tokens_in: int, tokens_out: int, model: str) -> float:
-        pricing = self.PRICING.get(model, {"input": 0.001, "output": 0.005})
-        return (tokens_in * pricing["input"] + tokens_out * pricing["output"]) / 1000
+        rate_in, rate_out = self._pricing.get(model, self._FALLBACK_RATES)
+        return tokens_in * rate_in + tokens_out * rate_out
 
 
 class AzureOpenAIProvider(BaseProvider):
@@ -271,44 +603,98 @@ class AzureOpenAIProvider(BaseProvider):
         input_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Execute through Azure OpenAI."""
+        if openai is None:
+            return {"response": "[MOCK] Azure OpenAI response", "_mock": True}
+        self._bucket.acquire_sync()
         try:
-            from openai import AzureOpenAI
-            
-            client = AzureOpenAI(
-                api_key=self.api_key,
-                api_version=self.api_version,
-                azure_endpoint=self.base_url
+            client = self._sdk_client(
+                lambda: openai.AzureOpenAI(
+                    api_key=self.api_key,
+                    api_version=self.api_version,
+                    azure_endpoint=self.base_url,
+                    max_retries=self.config.max_retries
+                )
             )
-            
-            deployment = agent_config.get("deployment", self.deployment)
-            system_prompt = agent_config.get("system_prompt", f"You are a {agent_type} agent.")
-            
+            request = self._chat_request(agent_type, agent_config, input_data)
             start = time.perf_counter()
-            response = client.chat.completions.create(
-                model=deployment,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": json.dumps(input_data)}
-                ],
-                temperature=agent_config.get("temperature", 0.7),
-                max_tokens=agent_config.get("max_tokens", 1024)
-            )
-            latency_ms = (time.perf_counter() - start) * 1000
-            
-            return {
-                "response": response.choices[0].message.content,
-                "confidence": 0.95,
-                "_tokens_in": response.usage.prompt_tokens,
-                "_tokens_out": response.usage.completion_tokens,
-                "_latency_ms": latency_ms,
-                "_deployment": deployment,
-                "_provider": "azure_openai"
-            }
-            
-        except ImportError:
-            return {"response": "[MOCK] Azure OpenAI response", "_mock": True}
+            response = self._call_api(lambda: client.chat.completions.create(**request))
+            return self._chat_result(response, request["model"], (time.perf_counter() - start) * 1000)
         except Exception as e:
             return {"response": f"Error: {str(e)}", "error": str(e)}
+
+    async def execute_async(
+        self,
+        agent_type: str,
+        agent_config: Dict[str, Any],
+        input_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Execute through Azure OpenAI's async client on the shared connection pool."""
+        if openai is None:
+            return {"response": "[MOCK] Azure OpenAI response", "_mock": True}
+        async with self._rate_limited():
+            try:
+                client = self._async_api_client()
+                request = self._chat_request(agent_type, agent_config, input_data)
+                start = time.perf_counter()
+                response = await self._acall_api(lambda: client.chat.completions.create(**request))
+                return self._chat_result(response, request["model"], (time.perf_counter() - start) * 1000)
+            except Exception as e:
+                return {"response": f"Error: {str(e)}", "error": str(e)}
+
+    async def execute_stream(
+        self,
+        agent_type: str,
+        agent_config: Dict[str, Any],
+        input_data: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """Stream completion text from Azure OpenAI as it is generated."""
+        if openai is None:
+            yield "[MOCK] Azure OpenAI response"
+            return
+        async with self._rate_limited():
+            request = self._chat_request(agent_type, agent_config, input_data)
+            async for text in _stream_chat_completion(self._async_api_client(), request):
+                yield text
+
+    def _async_api_client(self) -> Any:
+        return self._async_sdk_client(
+            lambda http_client: openai.AsyncAzureOpenAI(
+                api_key=self.api_key,
+                api_version=self.api_version,
+                azure_endpoint=self.base_url,
+                timeout=self.config.timeout,
+                max_retries=self.config.max_retries,
+                http_client=http_client,
+            )
+        )
+
+    def _chat_request(
+        self,
+        agent_type: str,
+        agent_config: Dict[str, Any],
+        input_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        system_prompt = _system_prompt(agent_type, agent_config)
+        return {
+            "model": agent_config.get("deployment", self.deployment),
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": _prompt_json(input_data)}
+            ],
+            "temperature": agent_config.get("temperature", 0.7),
+            "max_tokens": agent_config.get("max_tokens", 1024),
+        }
+
+    def _chat_result(self, response: Any, deployment: str, latency_ms: float) -> Dict[str, Any]:
+        return {
+            "response": response.choices[0].message.content,
+            "confidence": 0.95,
+            "_tokens_in": response.usage.prompt_tokens,
+            "_tokens_out": response.usage.completion_tokens,
+            "_latency_ms": latency_ms,
+            "_deployment": deployment,
+            "_provider": "azure_openai"
+        }
     
     def get_models(self) -> List[str]:
         return [self.deployment]
@@ -321,6 +707,21 @@ class OllamaProvider(BaseProvider):
         super().__init__(config)
         self.base_url = config.base_url or "http://localhost:11434"
         self.default_model = config.default_model or "llama2"
+        self._session: Optional[requests.Session] = None
+
+    def _http_session(self) -> requests.Session:
+        """Return a keep-alive session so repeated calls reuse pooled connections."""
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=50,
+                max_retries=Retry(total=self.config.max_retries, backoff_factor=0.2),
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
     
     def execute(
         self,
@@ -330,48 +731,112 @@ class OllamaProvider(BaseProvider):
     ) -> Dict[str, Any]:
         """Execute through Ollama."""
         try:
-            import requests
-            
-            model = agent_config.get("model", self.default_model)
-            system_prompt = agent_config.get("system_prompt", f"You are a {agent_type} agent.")
-            
+            payload = self._generate_payload(agent_type, agent_config, input_data)
+
+            def post() -> requests.Response:
+                response = self._http_session().post(
+                    f"{self.base_url}/api/generate",
+                    json=payload,
+                    timeout=self.config.timeout
+                )
+                response.raise_for_status()
+                return response
+
             start = time.perf_counter()
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json={
-                    "model": model,
-                    "prompt": f"{system_prompt}\n\nInput: {json.dumps(input_data)}",
-                    "stream": False
-                },
-                timeout=self.config.timeout
-            )
+            response = self._call_api(post)
             latency_ms = (time.perf_counter() - start) * 1000
-            
-            data = response.json()
-            
-            return {
-                "response": data.get("response", ""),
-                "confidence": 0.9,
-                "_tokens_in": data.get("prompt_eval_count", 0),
-                "_tokens_out": data.get("eval_count", 0),
-                "_latency_ms": latency_ms,
-                "_model": model,
-                "_provider": "ollama"
-            }
-            
+            return self._generate_result(response.json(), payload["model"], latency_ms)
         except Exception as e:
-            return {
-                "response": f"[MOCK] Ollama response for {agent_type}",
-                "confidence": 0.8,
-                "_mock": True,
-                "_error": str(e),
-                "_provider": "ollama"
-            }
+            return self._fallback_result(agent_type, e)
+
+    async def execute_async(
+        self,
+        agent_type: str,
+        agent_config: Dict[str, Any],
+        input_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Execute through Ollama on the shared connection pool."""
+        async with self._concurrency_slot():
+            try:
+                payload = self._generate_payload(agent_type, agent_config, input_data)
+
+                async def post() -> httpx.Response:
+                    response = await _provider_http_client().post(
+                        f"{self.base_url}/api/generate",
+                        json=payload,
+                        timeout=self.config.timeout,
+                    )
+                    response.raise_for_status()
+                    return response
+
+                # httpx has no transport-level retries, so transient failures are retried here.
+                start = time.perf_counter()
+                response = await self._acall_api(post, retries=self.config.max_retries)
+                latency_ms = (time.perf_counter() - start) * 1000
+                return self._generate_result(response.json(), payload["model"], latency_ms)
+            except Exception as e:
+                return self._fallback_result(agent_type, e)
+
+    async def execute_stream(
+        self,
+        agent_type: str,
+        agent_config: Dict[str, Any],
+        input_data: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """Stream generated text from Ollama's newline-delimited JSON responses."""
+        async with self._concurrency_slot():
+            payload = {**self._generate_payload(agent_type, agent_config, input_data), "stream": True}
+            async with _provider_http_client().stream(
+                "POST",
+                f"{self.base_url}/api/generate",
+                json=payload,
+                timeout=self.config.timeout,
+            ) as response:
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    data = orjson.loads(line)
+                    if data.get("response"):
+                        yield data["response"]
+                    if data.get("done"):
+                        break
+
+    def _generate_payload(
+        self,
+        agent_type: str,
+        agent_config: Dict[str, Any],
+        input_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        system_prompt = _system_prompt(agent_type, agent_config)
+        return {
+            "model": agent_config.get("model", self.default_model),
+            "prompt": f"{system_prompt}\n\nInput: {_prompt_json(input_data)}",
+            "stream": False
+        }
+
+    def _generate_result(self, data: Dict[str, Any], model: str, latency_ms: float) -> Dict[str, Any]:
+        return {
+            "response": data.get("response", ""),
+            "confidence": 0.9,
+            "_tokens_in": data.get("prompt_eval_count", 0),
+            "_tokens_out": data.get("eval_count", 0),
+            "_latency_ms": latency_ms,
+            "_model": model,
+            "_provider": "ollama"
+        }
+
+    def _fallback_result(self, agent_type: str, error: Exception) -> Dict[str, Any]:
+        return {
+            "response": f"[MOCK] Ollama response for {agent_type}",
+            "confidence": 0.8,
+            "_mock": True,
+            "_error": str(error),
+            "_provider": "ollama"
+        }
     
     def get_models(self) -> List[str]:
         try:
-            import requests
-            response = requests.get(f"{self.base_url}/api/tags")
+            response = self._http_session().get(f"{self.base_url}/api/tags", timeout=self.config.timeout)
             data = response.json()
             return [m["name"] for m in data.get("models", [])]
         except:
@@ -402,16 +867,17 @@ class GoogleGeminiProvider(BaseProvider):
         try:
             import google.generativeai as genai
             
+            self._bucket.acquire_sync()
             genai.configure(api_key=self.api_key)
             
             model_name = agent_config.get("model", self.default_model)
             model = genai.GenerativeModel(model_name)
             
-            system_prompt = agent_config.get("system_prompt", f"You are a {agent_type} agent.")
-            prompt = f"{system_prompt}\n\nInput: {json.dumps(input_data)}"
+            system_prompt = _system_prompt(agent_type, agent_config)
+            prompt = f"{system_prompt}\n\nInput: {_prompt_json(input_data)}"
             
             start = time.perf_counter()
-            response = model.generate_content(prompt)
+            response = self._call_api(lambda: model.generate_content(prompt))
             latency_ms = (time.perf_counter() - start) * 1000
             
             return {
@@ -447,7 +913,19 @@ class MockProvider(BaseProvider):
     ) -> Dict[str, Any]:
         """Return mock response."""
         time.sleep(self.latency_ms / 1000)  # Simulate latency
-        
+        return self._mock_result(agent_type, input_data)
+
+    async def execute_async(
+        self,
+        agent_type: str,
+        agent_config: Dict[str, Any],
+        input_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Return mock response, simulating latency without holding a thread."""
+        await asyncio.sleep(self.latency_ms / 1000)
+        return self._mock_result(agent_type, input_data)
+
+    def _mock_result(self, agent_type: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
         response = self.responses.get(
             agent_type, 
             f"Mock response from {agent_type} agent"
@@ -456,7 +934,7 @@ class MockProvider(BaseProvider):
         return {
             "response": response,
             "confidence": 0.99,
-            "_tokens_in": len(str(input_data)) // 4,
+            "_tokens_in": _estimate_tokens(input_data),
             "_tokens_out": len(response) // 4,
             "_latency_ms": self.latency_ms,
             "_mock": True,
@@ -467,6 +945,135 @@ class MockProvider(BaseProvider):
         return ["mock-model"]
 
 
+class MultiEndpointProvider(BaseProvider):
+    """Spread one provider type across several endpoints (vLLM/Ollama hosts, proxies, regions).
+
+    Built from ``config.extra["endpoints"]``, a list of per-endpoint overrides
+    such as ``base_url``, ``api_key`` and ``concurrency_limit``. Each call goes to
+    the endpoint with the lowest in-flight load relative to its limit, ties
+    broken by an EWMA of recent latency; failed calls move on to the next
+    endpoint unless ``fallback`` is disabled.
+    """
+
+    LATENCY_EWMA_ALPHA = 0.2
+
+    def __init__(self, config: ProviderConfig):
+        super().__init__(config)
+        shared = {key: value for key, value in config.extra.items() if key != "endpoints"}
+        provider_class = ProviderRegistry.PROVIDER_CLASSES[config.name.lower()]
+        self.endpoints: List[BaseProvider] = [
+            provider_class(
+                ProviderConfig(
+                    name=config.name,
+                    api_key=endpoint.get("api_key", config.api_key),
+                    base_url=endpoint.get("base_url", config.base_url),
+                    default_model=endpoint.get("default_model", config.default_model),
+                    timeout=endpoint.get("timeout", config.timeout),
+                    max_retries=endpoint.get("max_retries", config.max_retries),
+                    rate_limit_rpm=endpoint.get("rate_limit_rpm", config.rate_limit_rpm),
+                    extra={**shared, **endpoint},
+                )
+            )
+            for endpoint in config.extra["endpoints"]
+        ]
+        self.fallback = bool(config.extra.get("fallback", True))
+        self.inflight = [0] * len(self.endpoints)
+        self.latency_ewma = [0.0] * len(self.endpoints)
+        self._limits = [max(endpoint._concurrency_limit, 1) for endpoint in self.endpoints]
+        self._lock = threading.Lock()
+
+    def _ranked(self) -> List[int]:
+        with self._lock:
+            return sorted(
+                range(len(self.endpoints)),
+                key=lambda i: (self.inflight[i] / self._limits[i], self.latency_ewma[i]),
+            )
+
+    def _begin(self, index: int) -> float:
+        with self._lock:
+            self.inflight[index] += 1
+        return time.perf_counter()
+
+    def _finish(self, index: int, started: float) -> None:
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.inflight[index] -= 1
+            previous = self.latency_ewma[index]
+            self.latency_ewma[index] = (
+                elapsed if previous == 0.0
+                else previous + self.LATENCY_EWMA_ALPHA * (elapsed - previous)
+            )
+
+    @staticmethod
+    def _failed(result: Dict[str, Any]) -> bool:
+        return "error" in result or "_error" in result
+
+    def _candidates(self) -> List[int]:
+        ranked = self._ranked()
+        return ranked if self.fallback else ranked[:1]
+
+    def execute(
+        self,
+        agent_type: str,
+        agent_config: Dict[str, Any],
+        input_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Execute on the least-loaded endpoint, failing over on errors."""
+        result: Dict[str, Any] = {}
+        for index in self._candidates():
+            started = self._begin(index)
+            try:
+                result = self.endpoints[index].execute(agent_type, agent_config, input_data)
+            except Exception as e:
+                result = {"response": f"Error: {str(e)}", "error": str(e), "_provider": self.name}
+            finally:
+                self._finish(index, started)
+            if not self._failed(result):
+                break
+        return result
+
+    async def execute_async(
+        self,
+        agent_type: str,
+        agent_config: Dict[str, Any],
+        input_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Async counterpart of :meth:`execute`."""
+        result: Dict[str, Any] = {}
+        for index in self._candidates():
+            started = self._begin(index)
+            try:
+                result = await self.endpoints[index].execute_async(agent_type, agent_config, input_data)
+            except Exception as e:
+                result = {"response": f"Error: {str(e)}", "error": str(e), "_provider": self.name}
+            finally:
+                self._finish(index, started)
+            if not self._failed(result):
+                break
+        return result
+
+    async def execute_stream(
+        self,
+        agent_type: str,
+        agent_config: Dict[str, Any],
+        input_data: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """Stream from the least-loaded endpoint; streams are not retried mid-flight."""
+        index = self._ranked()[0]
+        started = self._begin(index)
+        try:
+            async for text in self.endpoints[index].execute_stream(agent_type, agent_config, input_data):
+                yield text
+        finally:
+            self._finish(index, started)
+
+    def get_models(self) -> List[str]:
+        return self.endpoints[0].get_models()
+
+    def estimate_cost(self, tokens_in: int, tokens_out: int, model: str) -> float:
+        return self.endpoints[0].estimate_cost(tokens_in, tokens_out, model)
+
+
 class ProviderRegistry:
     """
     Registry for managing LLM providers.
@@ -474,7 +1081,8 @@ class ProviderRegistry:
     Allows runtime configuration and switching between providers.
     """
     
-    PROVIDER_CLASSES = {
+    # Read-only after import; keys are lowercase provider types.
+    PROVIDER_CLASSES: Mapping[str, type] = MappingProxyType({
         "openai": OpenAIProvider,
         "anthropic": AnthropicProvider,
         "azure_openai": AzureOpenAIProvider,
@@ -483,7 +1091,7 @@ class ProviderRegistry:
         "google": GoogleGeminiProvider,
         "gemini": GoogleGeminiProvider,
         "mock": MockProvider,
-    }
+    })
     
     def __init__(self, *, strategy: Optional[str] = None):
         self.providers: Dict[str, BaseProvider] = {}
@@ -492,14 +1100,17 @@ class ProviderRegistry:
     
     def register(self, name: str, config: ProviderConfig) -> BaseProvider:
         """Register a provider with configuration."""
-        provider_type = config.name
+        provider_type = sys.intern(config.name.lower())
         if self.strategy == "mock" and provider_type != "mock":
             provider_class = MockProvider
             config = ProviderConfig(name="mock", extra=config.extra)
         else:
-            provider_class = self.PROVIDER_CLASSES.get(provider_type)
-        if not provider_class:
-            raise ValueError(f"Unknown provider type: {provider_type}")
+            try:
+                provider_class = self.PROVIDER_CLASSES[provider_type]
+            except KeyError:
+                raise ValueError(f"Unknown provider type: {config.name}") from None
+            if config.extra.get("endpoints"):
+                provider_class = MultiEndpointProvider
         
         provider = provider_class(config)
         self.providers[name] = provider
@@ -557,11 +1168,19 @@ def configure_providers(config: Dict[str, Any]) -> ProviderRegistry:
             "openai": {
                 "type": "openai",
                 "api_key": "sk-...",
-                "default_model": "gpt-4o-mini"
+                "default_model": "gpt-4o-mini",
+                "rate_limit_rpm": 500
             },
             "claude": {
                 "type": "anthropic",
                 "api_key": "sk-ant-..."
+            },
+            "local": {
+                "type": "ollama",
+                "endpoints": [
+                    {"base_url": "http://gpu-1:11434"},
+                    {"base_url": "http://gpu-2:11434", "concurrency_limit": 8}
+                ]
             }
         },
         "default": "openai"
@@ -580,6 +1199,7 @@ def configure_providers(config: Dict[str, Any]) -> ProviderRegistry:
                 default_model=provider_config.get("default_model", ""),
                 timeout=provider_config.get("timeout", 30),
                 max_retries=provider_config.get("max_retries", 3),
+                rate_limit_rpm=provider_config.get("rate_limit_rpm", 0),
                 extra=provider_config
             )
         )
@@ -0,0 +1,145 @@
+"""Coalesce concurrent provider calls into per-model batches.
+
+Fan-outs that fire many agent steps at once submit them through a
+:class:`RequestBatcher`. Requests arriving within ``PROVIDER_BATCH_INTERVAL_MS``
+of each other are grouped by ``(provider, model, temperature)`` and handed to
+:meth:`BaseProvider.execute_batch` together, which by default issues them
+concurrently over the shared connection pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+PROVIDER_BATCH_INTERVAL_MS = int(os.getenv("PROVIDER_BATCH_INTERVAL_MS", "50"))
+PROVIDER_BATCH_MAX_SIZE = int(os.getenv("PROVIDER_BATCH_MAX_SIZE", "32"))
+
+
+@dataclass
+class BatchedRequest:
+    """One queued provider call and the future its result is delivered on."""
+
+    provider: Any
+    agent_type: str
+    agent_config: Dict[str, Any]
+    input_data: Dict[str, Any]
+    future: asyncio.Future = field(repr=False)
+
+    @property
+    def batch_key(self) -> Tuple[int, Any, Any]:
+        return (
+            id(self.provider),
+            self.agent_config.get("model"),
+            self.agent_config.get("temperature"),
+        )
+
+
+class RequestBatcher:
+    """Collect provider calls for a short window and dispatch them per batch key."""
+
+    def __init__(
+        self,
+        *,
+        batch_interval: float = PROVIDER_BATCH_INTERVAL_MS / 1000,
+        max_batch_size: int = PROVIDER_BATCH_MAX_SIZE,
+    ):
+        self.batch_interval = batch_interval
+        self.max_batch_size = max(max_batch_size, 1)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: Set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def submit(
+        self,
+        provider: Any,
+        agent_type: str,
+        agent_config: Dict[str, Any],
+        input_data: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Queue a call and wait for its result; the flusher starts on first use."""
+
+        loop = asyncio.get_running_loop()
+        if not self.running or self._loop is not loop:
+            self._start(loop)
+        assert self._queue is not None
+        request = BatchedRequest(provider, agent_type, agent_config, input_data, loop.create_future())
+        await self._queue.put(request)
+        return await request.future
+
+    async def stop(self) -> None:
+        """Dispatch anything still queued and stop the flusher."""
+
+        if not self.running:
+            return
+        assert self._queue is not None and self._task is not None
+        await self._queue.join()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._queue = None
+        self._loop = None
+
+    def _start(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._queue = asyncio.Queue()
+        self._loop = loop
+        self._task = loop.create_task(self._flusher())
+
+    async def _flusher(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            pending = [await queue.get()]
+            deadline = asyncio.get_running_loop().time() + self.batch_interval
+            while len(pending) < self.max_batch_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            groups: Dict[Tuple[int, Any, Any], List[BatchedRequest]] = {}
+            for request in pending:
+                groups.setdefault(request.batch_key, []).append(request)
+            for batch in groups.values():
+                task = asyncio.create_task(self._dispatch(batch))
+                self._inflight.add(task)
+                task.add_done_callback(self._inflight.discard)
+            for _ in pending:
+                queue.task_done()
+
+    async def _dispatch(self, batch: List[BatchedRequest]) -> None:
+        provider = batch[0].provider
+        try:
+            results = await provider.execute_batch(
+                [(request.agent_type, request.agent_config, request.input_data) for request in batch]
+            )
+        except Exception as exc:
+            logger.exception("Provider batch failed", provider=getattr(provider, "name", None), size=len(batch))
+            results = [exc] * len(batch)
+        for request, result in zip(batch, results):
+            if request.future.done():
+                continue
+            if isinstance(result, BaseException):
+                request.future.set_exception(result)
+            else:
+                request.future.set_result(result)
+
@@ -0,0 +1,156 @@
+"""Response cache consulted before paid provider calls.
+
+Identical ``(provider, agent_type, agent_config, input_data)`` requests at low
+temperature are answered from an in-process TTL/LRU cache, optionally backed by
+Redis so Celery workers and API processes share hits. Opt-in via
+``PROVIDER_CACHE_ENABLED``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+PROVIDER_CACHE_ENABLED = os.getenv("PROVIDER_CACHE_ENABLED", "false").lower() in {"1", "true", "yes", "on"}
+PROVIDER_CACHE_TTL_SECONDS = int(os.getenv("PROVIDER_CACHE_TTL_SECONDS", "3600"))
+PROVIDER_CACHE_MAX_ENTRIES = int(os.getenv("PROVIDER_CACHE_MAX_ENTRIES", "10000"))
+# Sampled responses above this temperature are meant to vary, so they are never cached.
+PROVIDER_CACHE_MAX_TEMPERATURE = float(os.getenv("PROVIDER_CACHE_MAX_TEMPERATURE", "0.3"))
+PROVIDER_CACHE_SHARED = os.getenv("PROVIDER_CACHE_SHARED", "false").lower() in {"1", "true", "yes", "on"}
+
+_KEY_PREFIX = "provider-cache:"
+
+
+def cache_key(provider: str, agent_type: str, agent_config: Dict[str, Any], input_data: Dict[str, Any]) -> bytes:
+    """BLAKE2b digest of the canonical request; any config difference changes the key."""
+
+    payload = orjson.dumps(
+        {"provider": provider, "agent_type": agent_type, "config": agent_config, "input": input_data},
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        default=str,
+    )
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def is_cacheable_request(agent_config: Dict[str, Any]) -> bool:
+    return float(agent_config.get("temperature", 0.7)) <= PROVIDER_CACHE_MAX_TEMPERATURE
+
+
+def is_cacheable_result(result: Dict[str, Any]) -> bool:
+    return "error" not in result and "_error" not in result and not result.get("_mock")
+
+
+class ResponseCache:
+    """Thread-safe TTL/LRU cache of provider results with an optional Redis tier."""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: int = PROVIDER_CACHE_TTL_SECONDS,
+        max_entries: int = PROVIDER_CACHE_MAX_ENTRIES,
+        shared: bool = PROVIDER_CACHE_SHARED,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = _shared_client() if shared else None
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    return dict(entry[1])
+                del self._entries[key]
+
+        if self._redis is None:
+            return None
+        try:
+            raw = self._redis.get(_KEY_PREFIX + key.hex())
+        except Exception:  # pragma: no cover - shared tier is best effort
+            logger.debug("Provider cache lookup failed", exc_info=True)
+            return None
+        if raw is None:
+            return None
+        result = orjson.loads(raw)
+        self._store_local(key, result, now)
+        return dict(result)
+
+    def set(self, key: bytes, result: Dict[str, Any]) -> None:
+        self._store_local(key, dict(result), time.monotonic())
+        if self._redis is None:
+            return
+        try:
+            self._redis.setex(_KEY_PREFIX + key.hex(), self.ttl_seconds, orjson.dumps(result, default=str))
+        except Exception:  # pragma: no cover - shared tier is best effort
+            logger.debug("Provider cache store failed", exc_info=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _store_local(self, key: bytes, result: Dict[str, Any], now: float) -> None:
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def _provider_identity(provider: Any) -> str:
+    # Two providers of one type can point at different endpoints or default models.
+    identity = "|".join(
+        str(getattr(provider, attr, "") or "")
+        for attr in ("name", "base_url", "default_model", "deployment")
+    )
+    endpoints = getattr(provider, "endpoints", None)
+    if endpoints:
+        # Multi-endpoint pools carry the model and URLs on their wrapped endpoints.
+        identity += "[" + ",".join(_provider_identity(endpoint) for endpoint in endpoints) + "]"
+    return identity
+
+
+def _cache_hit(result: Dict[str, Any]) -> Dict[str, Any]:
+    # A cached answer spends no tokens, so it must not count toward run cost.
+    return {**result, "_cached": True, "_tokens_in": 0, "_tokens_out": 0, "_cost_usd": 0.0, "_latency_ms": 0.0}
+
+
+def cached_execute(
+    provider: Any,
+    agent_type: str,
+    agent_config: Dict[str, Any],
+    input_data: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Call ``provider.execute`` behind the response cache when enabled and cacheable."""
+
+    if not PROVIDER_CACHE_ENABLED or not is_cacheable_request(agent_config):
+        return provider.execute(agent_type, agent_config, input_data)
+    key = cache_key(_provider_identity(provider), agent_type, agent_config, input_data)
+    cached = response_cache.get(key)
+    if cached is not None:
+        return _cache_hit(cached)
+    result = provider.execute(agent_type, agent_config, input_data)
+    if is_cacheable_result(result):
+        response_cache.set(key, result)
+    return result
+
+
+def _shared_client():
+    import redis
+
+    return redis.Redis.from_url(os.getenv("REDIS_URL", "redis://redis:6379/0"), decode_responses=False)
+
+
+response_cache = ResponseCache()
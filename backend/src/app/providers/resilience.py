@@ -0,0 +1,143 @@
+"""Retry and circuit-breaker helpers for provider API calls.
+
+Transient failures (timeouts, dropped connections, 408/409/429/5xx responses)
+are retried with full-jitter exponential backoff; client errors such as bad
+requests or authentication failures never are. A :class:`CircuitBreaker` per
+provider fast-fails calls while a vendor is failing most requests, so worker
+threads are not tied up waiting on an outage.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+import httpx
+import requests
+
+try:
+    import openai
+except ImportError:  # pragma: no cover - optional dependency
+    openai = None
+
+try:
+    import anthropic
+except ImportError:  # pragma: no cover - optional dependency
+    anthropic = None
+
+_TRANSIENT_STATUS = frozenset({408, 409, 429})
+_TRANSIENT_ERRORS: Tuple[type, ...] = (
+    httpx.TransportError,
+    requests.ConnectionError,
+    requests.Timeout,
+    *((openai.APIConnectionError,) if openai is not None else ()),
+    *((anthropic.APIConnectionError,) if anthropic is not None else ()),
+)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """Return True for failures worth retrying (and counting against the breaker)."""
+
+    if isinstance(exc, _TRANSIENT_ERRORS):
+        return True
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return isinstance(status, int) and (status in _TRANSIENT_STATUS or status >= 500)
+
+
+def backoff_delay(attempt: int, base_delay: float = 0.25, max_delay: float = 8.0) -> float:
+    """Full-jitter exponential backoff for the zero-based ``attempt``."""
+
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """Open when the transient failure rate over ``window_seconds`` reaches ``failure_threshold``.
+
+    While open, :meth:`allow` refuses calls until ``cooldown_seconds`` have
+    passed; then one probe call is let through and its outcome closes or
+    re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: float = 0.5,
+        window_seconds: float = 60.0,
+        cooldown_seconds: float = 30.0,
+        min_calls: int = 10,
+    ):
+        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.min_calls = max(min_calls, 1)
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._probing or time.monotonic() - self._opened_at >= self.cooldown_seconds:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._probing or time.monotonic() - self._opened_at < self.cooldown_seconds:
+                return False
+            self._probing = True
+            return True
+
+    def record(self, success: bool) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self._opened_at is not None:
+                # Only the half-open probe decides; stragglers from before the trip are ignored.
+                if self._probing:
+                    self._probing = False
+                    if success:
+                        self._opened_at = None
+                        self._outcomes.clear()
+                        self._failures = 0
+                    else:
+                        self._opened_at = now
+                return
+
+            self._outcomes.append((now, success))
+            if not success:
+                self._failures += 1
+            while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+                _, ok = self._outcomes.popleft()
+                if not ok:
+                    self._failures -= 1
+            if (
+                len(self._outcomes) >= self.min_calls
+                and self._failures / len(self._outcomes) >= self.failure_threshold
+            ):
+                self._opened_at = now
+
+    def abandon(self) -> None:
+        """Account for a call that never finished (cancelled or interrupted).
+
+        An abandoned half-open probe counts as a failure, so the circuit re-opens
+        and a later call gets to probe; otherwise the call is ignored rather than
+        skewing the failure rate.
+        """
+        with self._lock:
+            if self._probing:
+                self._probing = False
+                self._opened_at = time.monotonic()
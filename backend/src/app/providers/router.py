@@ -7,6 +7,10 @@ from typing import Dict, Iterable, List, Optional
 from app.providers import ProviderConfig, ProviderRegistry
 
 
+def _first_candidate(candidates: Iterable[str]) -> Optional[str]:
+    return next((candidate for candidate in candidates if candidate), None)
+
+
 class ProviderRouter:
     """Selects providers based on strategy configuration."""
 
@@ -18,6 +22,11 @@ class ProviderRouter:
             region.lower(): list(candidates)
             for region, candidates in (self.strategy.get("per_region") or {}).items()
         }
+        # resolve() runs for every node, so each chain's first candidate is picked once up front.
+        self._region_first: Dict[str, Optional[str]] = {
+            region: _first_candidate(candidates) for region, candidates in self.per_region.items()
+        }
+        self._fallback_first = _first_candidate(self.fallback_order)
 
     def register_region(self, region: str, providers: Iterable[str]) -> None:
         """Register providers for a region dynamically."""
@@ -27,12 +36,14 @@ class ProviderRouter:
         for provider in providers:
             if provider and provider not in self.per_region[normalized]:
                 self.per_region[normalized].append(provider)
+        self._region_first[normalized] = _first_candidate(self.per_region[normalized])
 
     def register_fallback(self, provider: str) -> None:
         """Append a provider to the fallback chain."""
 
         if provider and provider not in self.fallback_order:
             self.fallback_order.append(provider)
+        self._fallback_first = _first_candidate(self.fallback_order)
 
     def _ensure_registered(self, provider_name: str) -> None:
         if provider_name not in self.registry.providers:
@@ -40,12 +51,12 @@ class ProviderRouter:
             self.registry.register(provider_name, ProviderConfig(name=provider_name))
 
     def _first_available(self, candidates: Iterable[str]) -> Optional[str]:
-        for candidate in candidates:
-            if not candidate:
-                continue
-            self._ensure_registered(candidate)
-            return candidate
-        return None
+        return self._registered(_first_candidate(candidates))
+
+    def _registered(self, provider: Optional[str]) -> Optional[str]:
+        if provider:
+            self._ensure_registered(provider)
+        return provider
 
     def resolve(self, *, node_config: Dict[str, any], agent_type: str = "") -> str:
         """Resolve provider name for a node execution."""
@@ -57,7 +68,9 @@ class ProviderRouter:
 
         region = node_config.get("region")
         if region:
-            provider = self._first_available(self.per_region.get(region.lower(), []))
+            provider = self._registered(
+                self._region_first.get(region) or self._region_first.get(region.lower())
+            )
             if provider:
                 node_config.setdefault("provider", provider)
                 return provider
@@ -68,7 +81,7 @@ class ProviderRouter:
                 node_config.setdefault("provider", provider)
                 return provider
 
-        provider = self._first_available(self.fallback_order)
+        provider = self._registered(self._fallback_first)
         if provider:
             node_config.setdefault("provider", provider)
             return provider
@@ -1,12 +1,13 @@
 """Deployment reliability utilities."""
 
-from .slo import SLOConfig, ErrorBudget, load_default_slos
+from .slo import SLOConfig, ErrorBudget, load_default_slos, rolling_exhausted
 from .release_guard import ReleaseMetrics, ReleaseDecision, evaluate_release, gate_release
 
 __all__ = [
     "SLOConfig",
     "ErrorBudget",
     "load_default_slos",
+    "rolling_exhausted",
     "ReleaseMetrics",
     "ReleaseDecision",
     "evaluate_release",
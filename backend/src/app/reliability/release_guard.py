@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, List
+from functools import lru_cache
+from typing import Iterable, List, Tuple
 
 from app.reliability.slo import ErrorBudget, SLOConfig, load_default_slos
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ReleaseMetrics:
     """Metrics collected during pre-production verification."""
 
@@ -20,35 +21,49 @@ class ReleaseMetrics:
     slo_name: str = "default"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ReleaseDecision:
     """Outcome of a release evaluation."""
 
     approved: bool
-    reasons: List[str]
+    reasons: Tuple[str, ...]
 
     def raise_if_blocked(self) -> None:
         if not self.approved:
             raise RuntimeError("; ".join(self.reasons))
 
 
-def _find_slo(configs: Iterable[SLOConfig], name: str) -> SLOConfig | None:
-    for slo in configs:
-        if slo.name == name:
-            return slo
-    return None
+def evaluate_release(
+    metrics: ReleaseMetrics,
+    slos: Iterable[SLOConfig] | None = None,
+    *,
+    include_all_reasons: bool = True,
+) -> ReleaseDecision:
+    """Evaluate a prospective release against SLOs and guardrails.
 
+    With ``include_all_reasons=False`` an active incident blocks immediately
+    without running the remaining checks. Decisions are immutable, so repeated
+    evaluations of the same metrics and SLOs (dashboard refreshes) are cached.
+    """
 
-def evaluate_release(metrics: ReleaseMetrics, slos: Iterable[SLOConfig] | None = None) -> ReleaseDecision:
-    """Evaluate a prospective release against SLOs and guardrails."""
+    return _evaluate_cached(metrics, tuple(slos or load_default_slos()), include_all_reasons)
 
-    active_slos = list(slos or load_default_slos())
-    slo = _find_slo(active_slos, metrics.slo_name) or _find_slo(active_slos, "default")
+
+@lru_cache(maxsize=64)
+def _evaluate_cached(
+    metrics: ReleaseMetrics,
+    slos: Tuple[SLOConfig, ...],
+    include_all_reasons: bool,
+) -> ReleaseDecision:
+    by_name = {slo.name: slo for slo in slos}
+    slo = by_name.get(metrics.slo_name) or by_name.get("default")
 
     reasons: List[str] = []
 
     if metrics.active_incidents > 0:
         reasons.append("Active incidents present")
+        if not include_all_reasons:
+            return ReleaseDecision(approved=False, reasons=tuple(reasons))
 
     if not metrics.regression_tests_passed:
         reasons.append("Regression suite failed")
@@ -65,7 +80,7 @@ def evaluate_release(metrics: ReleaseMetrics, slos: Iterable[SLOConfig] | None =
     else:
         reasons.append(f"SLO '{metrics.slo_name}' not defined")
 
-    return ReleaseDecision(approved=not reasons, reasons=reasons)
+    return ReleaseDecision(approved=not reasons, reasons=tuple(reasons))
 
 
 def gate_release(metrics: ReleaseMetrics, slos: Iterable[SLOConfig] | None = None) -> None:
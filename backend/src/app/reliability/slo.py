@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import cache, lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Tuple
 
+import numpy as np
 import yaml
 
+# libyaml's C loader parses several times faster when PyYAML was built with it.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class ErrorBudget:
     """Represents an error budget window."""
 
@@ -21,8 +26,41 @@ class ErrorBudget:
 
         return success_rate < self.target
 
+    def exhausted_batch(self, success_rates: Iterable[float]) -> np.ndarray:
+        """Vectorized :meth:`exhausted` over a series of success rates."""
+
+        return np.asarray(success_rates, dtype=np.float64) < self.target
+
+    def rolling_exhausted(self, successes: Iterable[int], totals: Iterable[int], window: int) -> np.ndarray:
+        """Flag each ``window``-bucket span whose aggregate success rate misses the target."""
+
+        return rolling_exhausted(successes, totals, window, self.target)
+
+
+def rolling_exhausted(
+    successes: Iterable[int],
+    totals: Iterable[int],
+    window: int,
+    target: float,
+) -> np.ndarray:
+    """Return one flag per full window of per-bucket ``successes``/``totals`` counts.
 
-@dataclass(frozen=True)
+    Window sums come from differences of prefix sums, so the whole series is
+    evaluated in a few array passes. Windows without traffic are never flagged.
+    """
+
+    succeeded = np.concatenate(([0.0], np.cumsum(np.asarray(successes, dtype=np.float64))))
+    attempted = np.concatenate(([0.0], np.cumsum(np.asarray(totals, dtype=np.float64))))
+    if window <= 0 or window >= succeeded.size:
+        return np.zeros(0, dtype=bool)
+    window_successes = succeeded[window:] - succeeded[:-window]
+    window_totals = attempted[window:] - attempted[:-window]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rates = window_successes / window_totals
+    return (window_totals > 0) & (rates < target)
+
+
+@dataclass(frozen=True, slots=True)
 class SLOConfig:
     """SLO definition for a service endpoint."""
 
@@ -33,8 +71,9 @@ class SLOConfig:
     notes: str = ""
 
 
+@cache
 def _default_slo_path() -> Path:
-    """Best-effort attempt to locate the default SLO catalog."""
+    """Best-effort attempt to locate the default SLO catalog; resolved once per process."""
 
     current = Path(__file__).resolve()
     for parent in current.parents:
@@ -46,13 +85,22 @@ def _default_slo_path() -> Path:
 
 
 def load_default_slos(path: Path | None = None) -> List[SLOConfig]:
-    """Load the default SLO catalog from disk."""
+    """Load the default SLO catalog from disk.
+
+    Parsed catalogs are cached by file modification time, so edits are still picked up.
+    """
 
     source = path or _default_slo_path()
-    if not source.exists():
+    try:
+        mtime_ns = source.stat().st_mtime_ns
+    except FileNotFoundError:
         return []
+    return list(_parse_slos(source, mtime_ns))
+
 
-    raw = yaml.safe_load(source.read_text()) or {}
+@lru_cache(maxsize=8)
+def _parse_slos(source: Path, mtime_ns: int) -> Tuple[SLOConfig, ...]:
+    raw = yaml.load(source.read_text(), Loader=_YAML_LOADER) or {}
     configs: List[SLOConfig] = []
     for entry in raw.get("slos", []):
         availability = entry.get("availability", {})
@@ -68,5 +116,5 @@ def load_default_slos(path: Path | None = None) -> List[SLOConfig]:
                 notes=entry.get("notes", ""),
             )
         )
-    return configs
+    return tuple(configs)
 
@@ -1,13 +1,15 @@
 from typing import List
 
-from fastapi import APIRouter, Body
+import numpy as np
+from fastapi import APIRouter
 from pydantic import BaseModel, Field
 
 from app.analytics.anomaly import (
     detect_latency_anomalies,
+    detect_smoothed_zscore_anomalies,
     detect_zscore_anomalies,
-    moving_average,
 )
+from app.utils.responses import ORJSONResponse
 
 
 class LatencyAnomalyRequest(BaseModel):
@@ -16,35 +18,50 @@ class LatencyAnomalyRequest(BaseModel):
     threshold: float = Field(3.0, description="Z-score threshold for anomaly detection")
 
 
+class SeriesAnomalyRequest(BaseModel):
+    series: List[float] = Field(default_factory=list, description="Numeric samples to scan")
+    z_threshold: float = Field(3.0, description="Z-score threshold for anomaly detection")
+    smoothing_window: int = Field(0, description="Trailing moving-average window; 0 disables smoothing")
+    include_processed: bool = Field(False, description="Echo the (smoothed) series back in the response")
+
+
 router = APIRouter()
 
 
-@router.post("/anomalies/latency")
-def latency_anomalies(payload: LatencyAnomalyRequest) -> dict:
+# Both routes return ORJSONResponse directly so numeric payloads (including
+# ndarrays) are encoded by orjson rather than walked by jsonable_encoder.
+
+
+@router.post("/anomalies/latency", response_class=ORJSONResponse)
+def latency_anomalies(payload: LatencyAnomalyRequest) -> ORJSONResponse:
     """Detect latency anomalies between baseline and candidate windows."""
 
     result = detect_latency_anomalies(payload.baseline, payload.candidate, threshold=payload.threshold)
-    return {"score": result.score, "thresholds": result.thresholds, "anomalies": result.anomalies}
+    return ORJSONResponse({"score": result.score, "thresholds": result.thresholds, "anomalies": result.anomalies})
 
 
-@router.post("/anomalies/series")
-def series_anomalies(payload: dict = Body(...)) -> dict:
+@router.post("/anomalies/series", response_class=ORJSONResponse)
+def series_anomalies(payload: SeriesAnomalyRequest) -> ORJSONResponse:
     """Run anomaly detection over an arbitrary numeric series."""
 
-    series = payload.get("series") or []
-    z_threshold = float(payload.get("z_threshold", 3.0))
-    window = int(payload.get("smoothing_window", 0))
-
-    processed = series
-    if window and window > 0:
-        processed = moving_average(series, window)
+    processed = np.asarray(payload.series, dtype=np.float64)
+    if payload.smoothing_window > 0:
+        result, processed = detect_smoothed_zscore_anomalies(
+            processed,
+            payload.smoothing_window,
+            z_threshold=payload.z_threshold,
+            keep_smoothed=payload.include_processed,
+        )
+    else:
+        result = detect_zscore_anomalies(processed, z_threshold=payload.z_threshold)
 
-    result = detect_zscore_anomalies(processed, z_threshold=z_threshold)
-    return {
+    response = {
         "anomaly_indices": result.indices,
         "mean": result.mean,
         "stddev": result.stddev,
         "threshold": result.threshold,
-        "processed_series": processed,
     }
+    if payload.include_processed:
+        response["processed_series"] = processed
+    return ORJSONResponse(response)
 
@@ -8,18 +8,23 @@ Provides:
 - API key management
 """
 
-import secrets
+import asyncio
 from datetime import UTC, datetime
-from typing import Optional
+from typing import Any, Callable, Optional, TypeVar
 
 from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel, EmailStr
+from sqlalchemy import bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 
 from app.auth import (
     User, Role, Permission,
-    hash_password, verify_password,
+    UNUSABLE_PASSWORD_HASH, hash_password, verify_password,
     create_access_token, create_refresh_token, decode_access_token,
-    generate_api_key, hash_api_key,
+    generate_api_key, hash_api_key, invalidate_api_key_cache,
     get_current_user, require_permission, log_audit
 )
 from app.auth.oidc import get_oidc_manager
@@ -28,6 +33,67 @@ from app.models_enhanced import User as UserTable
 
 router = APIRouter()
 
+T = TypeVar("T")
+
+# Statements are built once and executed with bound parameters, so requests skip
+# Core construction and hit SQLAlchemy's compiled cache directly.
+_SELECT_BY_EMAIL = UserTable.select().where(UserTable.c.email == bindparam("email"))
+_SELECT_BY_ID = UserTable.select().where(UserTable.c.id == bindparam("user_id"))
+_SELECT_BY_TENANT = UserTable.select().where(UserTable.c.tenant_id == bindparam("tenant_id"))
+_UPDATE_LAST_LOGIN = (
+    UserTable.update()
+    .where(UserTable.c.id == bindparam("user_id"))
+    .values(last_login=bindparam("login_at"))
+)
+_UPDATE_OIDC_PROFILE = (
+    UserTable.update()
+    .where(UserTable.c.id == bindparam("user_id"))
+    .values(
+        name=bindparam("new_name"),
+        role=bindparam("new_role"),
+        tenant_id=bindparam("new_tenant_id"),
+        last_login=bindparam("login_at"),
+    )
+)
+_UPDATE_PASSWORD = (
+    UserTable.update()
+    .where(UserTable.c.id == bindparam("user_id"))
+    .values(password_hash=bindparam("new_password_hash"))
+)
+_UPDATE_API_KEY = (
+    UserTable.update()
+    .where(UserTable.c.id == bindparam("user_id"))
+    .values(api_key=bindparam("new_api_key"))
+)
+# INSERT that yields no id when the email is already taken, instead of a separate
+# existence check that races with concurrent registrations.
+_INSERT_NEW_USER = {
+    "postgresql": pg_insert(UserTable)
+    .on_conflict_do_nothing(index_elements=[UserTable.c.email])
+    .returning(UserTable.c.id),
+    "sqlite": sqlite_insert(UserTable)
+    .on_conflict_do_nothing(index_elements=[UserTable.c.email])
+    .returning(UserTable.c.id),
+}
+_INSERT_USER = UserTable.insert().returning(UserTable.c.id)
+
+
+async def _run_db(work: Callable[..., T], *args: Any) -> T:
+    """Run ``work(db, *args)`` with a fresh session on a worker thread.
+
+    Sessions are synchronous, so the query round trips (and the password
+    hashing done alongside them) happen off the event loop.
+    """
+
+    def run() -> T:
+        db = SessionLocal()
+        try:
+            return work(db, *args)
+        finally:
+            db.close()
+
+    return await asyncio.to_thread(run)
+
 
 # ============================================================================
 # Request/Response Models
@@ -90,6 +156,37 @@ async def list_oidc_providers():
     return await manager.list_public_configs()
 
 
+def _upsert_oidc_user(db: Session, email: str, name: str, role: Role, tenant_id: Optional[str]) -> int:
+    existing = db.execute(_SELECT_BY_EMAIL, {"email": email}).fetchone()
+
+    if existing:
+        db.execute(
+            _UPDATE_OIDC_PROFILE,
+            {
+                "user_id": existing.id,
+                "new_name": name,
+                "new_role": role.value,
+                "new_tenant_id": tenant_id,
+                "login_at": datetime.now(UTC),
+            },
+        )
+        user_id = existing.id
+    else:
+        user_id = db.execute(
+            _INSERT_USER,
+            {
+                "email": email,
+                "password_hash": UNUSABLE_PASSWORD_HASH,
+                "name": name,
+                "role": role.value,
+                "tenant_id": tenant_id,
+                "last_login": datetime.now(UTC),
+            },
+        ).scalar_one()
+    db.commit()
+    return user_id
+
+
 @router.post("/oidc/login", response_model=LoginResponse)
 async def oidc_login(request: OIDCAuthRequest, req: Request):
     """Complete OIDC code exchange and issue local JWT tokens."""
@@ -118,130 +215,99 @@ async def oidc_login(request: OIDCAuthRequest, req: Request):
     except ValueError:
         role = Role(provider.config.default_role)
 
-    db = SessionLocal()
-    try:
-        existing = db.execute(
-            UserTable.select().where(UserTable.c.email == email)
-        ).fetchone()
-
-        if existing:
-            db.execute(
-                UserTable.update()
-                .where(UserTable.c.id == existing.id)
-                .values(
-                    name=name,
-                    role=role.value,
-                    tenant_id=tenant_id,
-                    last_login=datetime.now(UTC),
-                )
-            )
-            user_id = existing.id
-        else:
-            result = db.execute(UserTable.insert().values(
-                email=email,
-                password_hash=hash_password(secrets.token_urlsafe(32)),
-                name=name,
-                role=role.value,
-                tenant_id=tenant_id,
-                last_login=datetime.now(UTC),
-            ))
-            user_id = result.lastrowid
-        db.commit()
-
-        token_payload = {
-            "user_id": user_id,
+    user_id = await _run_db(_upsert_oidc_user, email, name, role, tenant_id)
+
+    token_payload = {
+        "user_id": user_id,
+        "email": email,
+        "role": role.value,
+        "tenant_id": tenant_id,
+    }
+
+    response = LoginResponse(
+        access_token=create_access_token(token_payload),
+        refresh_token=create_refresh_token(user_id),
+        expires_in=86400,
+        user={
+            "id": user_id,
             "email": email,
+            "name": name,
             "role": role.value,
             "tenant_id": tenant_id,
-        }
+        },
+    )
 
-        response = LoginResponse(
-            access_token=create_access_token(token_payload),
-            refresh_token=create_refresh_token(user_id),
-            expires_in=86400,
-            user={
-                "id": user_id,
-                "email": email,
-                "name": name,
-                "role": role.value,
-                "tenant_id": tenant_id,
-            },
-        )
+    await log_audit(
+        user=User(
+            id=user_id,
+            email=email,
+            name=name,
+            role=role,
+            permissions=[],
+            tenant_id=tenant_id,
+        ),
+        action="oidc_login",
+        resource_type="user",
+        resource_id=user_id,
+        details={"provider": provider.config.name},
+        request=req,
+    )
 
-        await log_audit(
-            user=User(
-                id=user_id,
-                email=email,
-                name=name,
-                role=role,
-                permissions=[],
-                tenant_id=tenant_id,
-            ),
-            action="oidc_login",
-            resource_type="user",
-            resource_id=user_id,
-            details={"provider": provider.config.name},
-            request=req,
-        )
+    return response
+
+
+def _authenticate(db: Session, email: str, password: str):
+    result = db.execute(_SELECT_BY_EMAIL, {"email": email}).fetchone()
+    # End the read transaction before hashing so no connection state or row lock
+    # is held across the PBKDF2 work; only a verified login writes.
+    db.rollback()
+
+    if not result:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    if not verify_password(password, result.password_hash):
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    if not result.is_active:
+        raise HTTPException(status_code=403, detail="Account is disabled")
 
-        return response
-    finally:
-        db.close()
+    db.execute(_UPDATE_LAST_LOGIN, {"user_id": result.id, "login_at": datetime.now(UTC)})
+    db.commit()
+    return result
 
 
 @router.post("/login", response_model=LoginResponse)
 async def login(request: LoginRequest, req: Request):
     """Authenticate user and return tokens."""
-    db = SessionLocal()
-    
-    try:
-        result = db.execute(
-            UserTable.select().where(UserTable.c.email == request.email)
-        ).fetchone()
-        
-        if not result:
-            raise HTTPException(status_code=401, detail="Invalid credentials")
-        
-        if not verify_password(request.password, result.password_hash):
-            raise HTTPException(status_code=401, detail="Invalid credentials")
-        
-        if not result.is_active:
-            raise HTTPException(status_code=403, detail="Account is disabled")
-        
-        # Update last login
-        db.execute(
-            UserTable.update()
-            .where(UserTable.c.id == result.id)
-            .values(last_login=datetime.now(UTC))
-        )
-        db.commit()
-        
-        # Create tokens
-        token_data = {
-            "user_id": result.id,
+    result = await _run_db(_authenticate, request.email, request.password)
+
+    # Create tokens
+    token_data = {
+        "user_id": result.id,
+        "email": result.email,
+        "role": result.role,
+        "tenant_id": result.tenant_id or "default",
+    }
+
+    access_token = create_access_token(token_data)
+    refresh_token = create_refresh_token(result.id)
+
+    return LoginResponse(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        expires_in=86400,  # 24 hours
+        user={
+            "id": result.id,
             "email": result.email,
+            "name": result.name,
             "role": result.role,
             "tenant_id": result.tenant_id or "default",
         }
-        
-        access_token = create_access_token(token_data)
-        refresh_token = create_refresh_token(result.id)
-        
-        return LoginResponse(
-            access_token=access_token,
-            refresh_token=refresh_token,
-            expires_in=86400,  # 24 hours
-            user={
-                "id": result.id,
-                "email": result.email,
-                "name": result.name,
-                "role": result.role,
-                "tenant_id": result.tenant_id or "default",
-            }
-        )
-        
-    finally:
-        db.close()
+    )
+
+
+def _fetch_user_by_id(db: Session, user_id: int):
+    return db.execute(_SELECT_BY_ID, {"user_id": user_id}).fetchone()
 
 
 @router.post("/refresh")
@@ -249,41 +315,67 @@ async def refresh_token(request: TokenRefreshRequest):
     """Refresh access token using refresh token."""
     try:
         payload = decode_access_token(request.refresh_token)
-        
+
         if payload.get("type") != "refresh":
             raise HTTPException(status_code=401, detail="Invalid refresh token")
-        
-        user_id = payload.get("user_id")
-        
-        db = SessionLocal()
-        try:
-            result = db.execute(
-                UserTable.select().where(UserTable.c.id == user_id)
-            ).fetchone()
-            
-            if not result or not result.is_active:
-                raise HTTPException(status_code=401, detail="User not found or disabled")
-            
-            token_data = {
-                "user_id": result.id,
-                "email": result.email,
-                "role": result.role,
-                "tenant_id": result.tenant_id or "default",
-            }
-            
-            return {
-                "access_token": create_access_token(token_data),
-                "token_type": "bearer"
-            }
-        finally:
-            db.close()
-            
+
+        result = await _run_db(_fetch_user_by_id, payload.get("user_id"))
+
+        if not result or not result.is_active:
+            raise HTTPException(status_code=401, detail="User not found or disabled")
+
+        token_data = {
+            "user_id": result.id,
+            "email": result.email,
+            "role": result.role,
+            "tenant_id": result.tenant_id or "default",
+        }
+
+        return {
+            "access_token": create_access_token(token_data),
+            "token_type": "bearer"
+        }
+
     except HTTPException:
         raise
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid refresh token")
 
 
+def _create_user(db: Session, request: RegisterRequest, tenant_id: Optional[str]) -> int:
+    # Validate role
+    try:
+        Role(request.role)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid role: {request.role}")
+
+    # Cheap existence check first so duplicates never pay for a password hash;
+    # the conflict-aware INSERT below still guards against concurrent signups.
+    existing = db.execute(_SELECT_BY_EMAIL, {"email": request.email}).first()
+    db.rollback()
+    if existing:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    values = {
+        "email": request.email,
+        "password_hash": hash_password(request.password),
+        "name": request.name,
+        "role": request.role,
+        "tenant_id": tenant_id,
+    }
+    try:
+        user_id = db.execute(_INSERT_NEW_USER.get(db.get_bind().dialect.name, _INSERT_USER), values).scalar()
+    except IntegrityError:
+        user_id = None
+
+    if user_id is None:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    db.commit()
+    return user_id
+
+
 @router.post("/register")
 @require_permission(Permission.USER_CREATE)
 async def register_user(
@@ -292,55 +384,26 @@ async def register_user(
     req: Request = None
 ):
     """Register a new user (admin only)."""
-    db = SessionLocal()
-    
-    try:
-        # Check if email exists
-        existing = db.execute(
-            UserTable.select().where(UserTable.c.email == request.email)
-        ).fetchone()
-        
-        if existing:
-            raise HTTPException(status_code=400, detail="Email already registered")
-        
-        # Validate role
-        try:
-            role = Role(request.role)
-        except ValueError:
-            raise HTTPException(status_code=400, detail=f"Invalid role: {request.role}")
-        
-        # Create user
-        result = db.execute(UserTable.insert().values(
-            email=request.email,
-            password_hash=hash_password(request.password),
-            name=request.name,
-            role=request.role,
-            tenant_id=request.tenant_id or user.tenant_id,
-        ))
-        db.commit()
-        
-        user_id = result.lastrowid
-        
-        # Audit log
-        await log_audit(
-            user=user,
-            action="create",
-            resource_type="user",
-            resource_id=user_id,
-            details={"email": request.email, "role": request.role},
-            request=req
-        )
-        
-        return {
-            "id": user_id,
-            "email": request.email,
-            "name": request.name,
-            "role": request.role,
-            "tenant_id": request.tenant_id or user.tenant_id,
-        }
-        
-    finally:
-        db.close()
+    tenant_id = request.tenant_id or user.tenant_id
+    user_id = await _run_db(_create_user, request, tenant_id)
+
+    # Audit log
+    await log_audit(
+        user=user,
+        action="create",
+        resource_type="user",
+        resource_id=user_id,
+        details={"email": request.email, "role": request.role},
+        request=req
+    )
+
+    return {
+        "id": user_id,
+        "email": request.email,
+        "name": request.name,
+        "role": request.role,
+        "tenant_id": tenant_id,
+    }
 
 
 @router.get("/me")
@@ -352,37 +415,33 @@ async def get_current_user_info(user: User = Depends(get_current_user)):
         "name": user.name,
         "role": user.role.value,
         "tenant_id": user.tenant_id,
-        "permissions": [p.value for p in user.permissions]
+        "permissions": sorted(p.value for p in user.permissions)
     }
 
 
+def _change_password(db: Session, user_id: int, current_password: str, new_password: str) -> None:
+    result = _fetch_user_by_id(db, user_id)
+
+    if not verify_password(current_password, result.password_hash):
+        raise HTTPException(status_code=400, detail="Current password is incorrect")
+
+    db.execute(_UPDATE_PASSWORD, {"user_id": user_id, "new_password_hash": hash_password(new_password)})
+    db.commit()
+
+
 @router.post("/change-password")
 async def change_password(
     request: ChangePasswordRequest,
     user: User = Depends(get_current_user)
 ):
     """Change current user's password."""
-    db = SessionLocal()
-    
-    try:
-        result = db.execute(
-            UserTable.select().where(UserTable.c.id == user.id)
-        ).fetchone()
-        
-        if not verify_password(request.current_password, result.password_hash):
-            raise HTTPException(status_code=400, detail="Current password is incorrect")
-        
-        db.execute(
-            UserTable.update()
-            .where(UserTable.c.id == user.id)
-            .values(password_hash=hash_password(request.new_password))
-        )
-        db.commit()
-        
-        return {"message": "Password changed successfully"}
-        
-    finally:
-        db.close()
+    await _run_db(_change_password, user.id, request.current_password, request.new_password)
+    return {"message": "Password changed successfully"}
+
+
+def _set_api_key(db: Session, user_id: int, key_hash: Optional[str]) -> None:
+    db.execute(_UPDATE_API_KEY, {"user_id": user_id, "new_api_key": key_hash})
+    db.commit()
 
 
 @router.post("/api-keys", response_model=APIKeyResponse)
@@ -391,72 +450,46 @@ async def create_api_key(
     user: User = Depends(get_current_user)
 ):
     """Generate a new API key for the current user."""
-    db = SessionLocal()
-    
-    try:
-        api_key = generate_api_key()
-        key_hash = hash_api_key(api_key)
-        
-        db.execute(
-            UserTable.update()
-            .where(UserTable.c.id == user.id)
-            .values(api_key=key_hash)
-        )
-        db.commit()
-        
-        return APIKeyResponse(
-            api_key=api_key,
-            name=name,
-            created_at=datetime.now(UTC).isoformat()
-        )
-        
-    finally:
-        db.close()
+    api_key = generate_api_key()
+    await _run_db(_set_api_key, user.id, hash_api_key(api_key))
+    invalidate_api_key_cache(user.id)
+
+    return APIKeyResponse(
+        api_key=api_key,
+        name=name,
+        created_at=datetime.now(UTC).isoformat()
+    )
 
 
 @router.delete("/api-keys")
 async def revoke_api_key(user: User = Depends(get_current_user)):
     """Revoke current API key."""
-    db = SessionLocal()
-    
-    try:
-        db.execute(
-            UserTable.update()
-            .where(UserTable.c.id == user.id)
-            .values(api_key=None)
-        )
-        db.commit()
-        
-        return {"message": "API key revoked"}
-        
-    finally:
-        db.close()
+    await _run_db(_set_api_key, user.id, None)
+    invalidate_api_key_cache(user.id)
+
+    return {"message": "API key revoked"}
+
+
+def _list_tenant_users(db: Session, tenant_id: Optional[str]):
+    return db.execute(_SELECT_BY_TENANT, {"tenant_id": tenant_id}).fetchall()
 
 
 @router.get("/users")
 @require_permission(Permission.USER_READ)
 async def list_users(user: User = Depends(get_current_user)):
     """List all users (admin/operator only)."""
-    db = SessionLocal()
-    
-    try:
-        results = db.execute(
-            UserTable.select().where(UserTable.c.tenant_id == user.tenant_id)
-        ).fetchall()
-        
-        return [
-            {
-                "id": r.id,
-                "email": r.email,
-                "name": r.name,
-                "role": r.role,
-                "is_active": r.is_active,
-                "tenant_id": r.tenant_id,
-                "created_at": r.created_at.isoformat() if r.created_at else None,
-                "last_login": r.last_login.isoformat() if r.last_login else None
-            }
-            for r in results
-        ]
-        
-    finally:
-        db.close()
+    results = await _run_db(_list_tenant_users, user.tenant_id)
+
+    return [
+        {
+            "id": r.id,
+            "email": r.email,
+            "name": r.name,
+            "role": r.role,
+            "is_active": r.is_active,
+            "tenant_id": r.tenant_id,
+            "created_at": r.created_at.isoformat() if r.created_at else None,
+            "last_login": r.last_login.isoformat() if r.last_login else None
+        }
+        for r in results
+    ]
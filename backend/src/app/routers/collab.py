@@ -9,7 +9,7 @@ router = APIRouter()
 
 
 @router.post("/slack/notify")
-def slack_notify(
+async def slack_notify(
     channel: str = Body(...),
     text: str = Body(...),
     username: str = Body("multi-agent-bot"),
@@ -19,6 +19,6 @@ def slack_notify(
         raise HTTPException(status_code=500, detail="SLACK_WEBHOOK_URL not configured")
 
     notifier = SlackNotifier(webhook)
-    result = notifier.send(SlackMessage(channel=channel, text=text, username=username))
+    result = await notifier.send_async(SlackMessage(channel=channel, text=text, username=username))
     return result
 
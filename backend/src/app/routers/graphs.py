@@ -8,10 +8,10 @@ Provides:
 - Export capabilities
 """
 
-import hashlib
 from datetime import UTC, datetime
 from typing import Optional, List
 
+import orjson
 import yaml
 from fastapi import APIRouter, UploadFile, HTTPException, Query, Depends, Request
 from pydantic import BaseModel
@@ -20,6 +20,7 @@ from sqlalchemy import and_
 from app.utils.load_graph import load_yaml
 from app.database import SessionLocal
 from app.models import TestGraph, TestGraphVersion
+from app.models_enhanced import content_hash
 from app.auth import User, Permission, permission_dependency, log_audit
 
 router = APIRouter()
@@ -57,8 +58,9 @@ class GraphVersionCreate(BaseModel):
     description: Optional[str] = None
 
 
-def _hash_content(content: dict) -> str:
-    return hashlib.sha256(str(content).encode()).hexdigest()
+def _hash_content(content: dict) -> bytes:
+    # Sorted keys make the hash independent of dict insertion order.
+    return content_hash(orjson.dumps(content, option=orjson.OPT_SORT_KEYS))
 
 
 def _create_graph_version(
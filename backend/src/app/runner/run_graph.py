@@ -24,6 +24,7 @@ from .assertions import AssertionEngine, AssertionResult
 from .contracts import ContractValidator, ContractViolation
 from .state_machine import ExecutionStateMachine, NodeState
 from app.governance import GovernanceMiddleware, SafetyScore
+from app.providers.cache import cached_execute
 from app.providers.router import ProviderRouter
 
 
@@ -290,7 +291,7 @@ class GraphRunner:
             if not provider_name:
                 provider_name = "openai"
             provider = self.provider_registry.get_provider(provider_name)
-            return provider.execute(agent_type, config, input_data)
+            return cached_execute(provider, agent_type, config, input_data)
         
         # Mock execution for testing
         return {
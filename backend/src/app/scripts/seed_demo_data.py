@@ -271,7 +271,7 @@ def main() -> None:
     cfg = SeedConfig(
         database_url=os.getenv(
             "DATABASE_URL",
-            "postgresql://postgres:postgres@db:5432/agent_tests",
+            "postgresql+psycopg://postgres:postgres@db:5432/agent_tests",
         ),
         tenant_id=os.getenv("TENANT_ID", "demo"),
         demo_runs=int(os.getenv("DEMO_RUNS", "8")),
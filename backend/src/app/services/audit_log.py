@@ -0,0 +1,301 @@
+"""Buffered, hash-chained audit log writer.
+
+Request handlers enqueue audit events; a single background task drains the
+queue, chains ``previous_hash``/``event_hash`` from the current chain head and
+writes each batch with one multi-row INSERT. When the flusher is not running (CLI scripts,
+workers, tests without a lifespan) events are written inline instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+import orjson
+import structlog
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+
+logger = structlog.get_logger(__name__)
+
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "256"))
+AUDIT_QUEUE_MAX = int(os.getenv("AUDIT_QUEUE_MAX", "10000"))
+# Batches at least this large are streamed with COPY when the driver supports it.
+AUDIT_COPY_MIN_ROWS = int(os.getenv("AUDIT_COPY_MIN_ROWS", "32"))
+# Batches failing on transient database errors are retried with capped exponential
+# backoff; after that (or on any other error) rows are written one at a time and
+# the ones that still fail are dead-lettered.
+AUDIT_RETRY_ATTEMPTS = int(os.getenv("AUDIT_RETRY_ATTEMPTS", "8"))
+AUDIT_RETRY_BASE_DELAY = float(os.getenv("AUDIT_RETRY_BASE_DELAY", "0.5"))
+AUDIT_RETRY_MAX_DELAY = float(os.getenv("AUDIT_RETRY_MAX_DELAY", "30"))
+AUDIT_DEAD_LETTER_MAX = int(os.getenv("AUDIT_DEAD_LETTER_MAX", "1000"))
+# Upper bound on how long stop() waits for queued events during shutdown.
+AUDIT_SHUTDOWN_TIMEOUT = float(os.getenv("AUDIT_SHUTDOWN_TIMEOUT", "30"))
+
+# Transaction-scoped advisory lock serializing chain appends across processes.
+_AUDIT_CHAIN_LOCK_KEY = 0x61756469745F6C67  # "audit_lg"
+
+# Fields covered by the event hash but not stored as a column, and vice versa.
+_HASH_ONLY_FIELDS = ("timestamp",)
+_ROW_ONLY_FIELDS = ("retention_days",)
+
+# Column order used for COPY; created_at is explicit because COPY bypasses
+# SQLAlchemy's Python-side column defaults.
+_COPY_COLUMNS = (
+    "user_id",
+    "action",
+    "resource_type",
+    "resource_id",
+    "details",
+    "ip_address",
+    "user_agent",
+    "correlation_id",
+    "previous_hash",
+    "event_hash",
+    "retention_days",
+    "tenant_id",
+    "created_at",
+)
+
+
+def compute_event_hash(payload: Dict[str, Any]) -> bytes:
+    """Hash an audit payload (including its ``previous_hash``) for the chain.
+
+    The payload is canonicalized with sorted keys so the hash is reproducible.
+    Digests are stored as raw bytes but chained as hex, so chains written before
+    the BYTEA columns still verify.
+    """
+
+    previous_hash = payload.get("previous_hash")
+    if isinstance(previous_hash, bytes):
+        payload = {**payload, "previous_hash": previous_hash.hex()}
+    return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).digest()
+
+
+def _copy_rows(db, table, rows: Sequence[Dict[str, Any]]) -> bool:
+    """Stream ``rows`` with PostgreSQL COPY via psycopg 3; return False if unsupported."""
+
+    conn = db.connection()
+    if conn.dialect.name != "postgresql" or conn.dialect.driver != "psycopg":
+        return False
+
+    from app.models_enhanced import utcnow
+
+    created_at = utcnow()
+    statement = f"COPY {table.name} ({', '.join(_COPY_COLUMNS)}) FROM STDIN"
+    with conn.connection.driver_connection.cursor() as cursor:
+        with cursor.copy(statement) as copy:
+            for row in rows:
+                copy.write_row(
+                    tuple(
+                        orjson.dumps(row[column]).decode() if column == "details"
+                        else created_at if column == "created_at"
+                        else row.get(column)
+                        for column in _COPY_COLUMNS
+                    )
+                )
+    return True
+
+
+def verify_audit_chain(
+    db,
+    start: datetime,
+    end: datetime,
+    tenant_id: Optional[str] = None,
+) -> List[int]:
+    """Return ids of rows in ``[start, end)`` whose ``previous_hash`` doesn't link to the prior row.
+
+    The comparison runs as one windowed query instead of walking rows from Python.
+    The chain spans all tenants, so links are checked in global id order and
+    ``tenant_id`` only narrows which breaks are reported. ``event_hash`` itself
+    can't be recomputed in SQL because the hashed timestamp is not stored.
+    """
+
+    from app.models_enhanced import AuditLog
+
+    first_id = (
+        select(func.min(AuditLog.c.id)).where(AuditLog.c.created_at >= start).scalar_subquery()
+    )
+    # Start one row early so the first row in range has a predecessor to compare with.
+    anchor_id = func.coalesce(
+        select(func.max(AuditLog.c.id)).where(AuditLog.c.id < first_id).scalar_subquery(),
+        first_id,
+    )
+    ordered = (
+        select(
+            AuditLog.c.id,
+            AuditLog.c.tenant_id,
+            AuditLog.c.previous_hash,
+            func.lag(AuditLog.c.event_hash).over(order_by=AuditLog.c.id).label("expected_previous"),
+        )
+        .where(AuditLog.c.id >= anchor_id, AuditLog.c.created_at < end)
+        .subquery()
+    )
+    query = (
+        select(ordered.c.id)
+        .where(
+            ordered.c.id >= first_id,
+            ordered.c.previous_hash.is_distinct_from(ordered.c.expected_previous),
+        )
+        .order_by(ordered.c.id)
+    )
+    if tenant_id is not None:
+        query = query.where(ordered.c.tenant_id == tenant_id)
+    return list(db.execute(query).scalars())
+
+
+def _is_transient_db_error(exc: BaseException) -> bool:
+    if isinstance(exc, (OperationalError, InterfaceError)):
+        return True
+    return isinstance(exc, DBAPIError) and exc.connection_invalidated
+
+
+def _default_session_factory():
+    from app.database import SessionLocal
+
+    return SessionLocal()
+
+
+class AuditLogWriter:
+    """Serialize audit events into the ``audit_logs`` hash chain."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Any]] = None,
+        *,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        max_queue: int = AUDIT_QUEUE_MAX,
+    ):
+        self._session_factory = session_factory or _default_session_factory
+        self._batch_size = max(batch_size, 1)
+        self._max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Events that could not be written; also logged with their payload.
+        self.dead_letters: Deque[Dict[str, Any]] = deque(maxlen=AUDIT_DEAD_LETTER_MAX)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Spawn the background flusher on the running event loop."""
+
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_queue)
+        self._task = asyncio.create_task(self._flusher())
+
+    async def stop(self) -> None:
+        """Flush pending events (for at most ``AUDIT_SHUTDOWN_TIMEOUT``) and stop the background task."""
+
+        if not self.running:
+            return
+        assert self._queue is not None and self._task is not None
+        try:
+            await asyncio.wait_for(self._queue.join(), AUDIT_SHUTDOWN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.error("Audit flush timed out during shutdown", pending=self._queue.qsize())
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._queue = None
+
+    async def submit(self, payload: Dict[str, Any]) -> None:
+        """Record an audit event without waiting on the database when buffered.
+
+        A full queue applies backpressure to the caller rather than dropping events.
+        """
+
+        if self.running:
+            assert self._queue is not None
+            await self._queue.put(payload)
+            return
+        await asyncio.to_thread(self.write_batch, [payload])
+
+    async def _flusher(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self._batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self._write_with_retry(batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _write_with_retry(self, batch: List[Dict[str, Any]]) -> None:
+        # Events are re-chained on each attempt, so a retry after a partial
+        # outage still links to whatever head is current by then.
+        for attempt in range(AUDIT_RETRY_ATTEMPTS + 1):
+            try:
+                await asyncio.to_thread(self.write_batch, batch)
+                return
+            except Exception as exc:
+                if not _is_transient_db_error(exc) or attempt == AUDIT_RETRY_ATTEMPTS:
+                    logger.exception("Failed to flush audit events", count=len(batch), attempt=attempt + 1)
+                    break
+                delay = min(AUDIT_RETRY_MAX_DELAY, AUDIT_RETRY_BASE_DELAY * (2 ** attempt))
+                logger.warning(
+                    "Transient error flushing audit events; retrying",
+                    count=len(batch),
+                    attempt=attempt + 1,
+                    retry_in=delay,
+                    error=str(exc),
+                )
+                await asyncio.sleep(delay)
+
+        # Isolate poison rows so one bad event cannot hold back the rest.
+        for payload in batch:
+            try:
+                await asyncio.to_thread(self.write_batch, [payload])
+            except Exception:
+                self.dead_letters.append(payload)
+                logger.exception("Dead-lettered audit event", payload=payload)
+
+    def write_batch(self, payloads: Sequence[Dict[str, Any]]) -> None:
+        """Chain and insert ``payloads`` in a single transaction.
+
+        The chain head is read inside that transaction every time, under an
+        advisory lock on PostgreSQL, so API workers and Celery processes writing
+        concurrently extend one chain instead of forking it.
+        """
+
+        if not payloads:
+            return
+        from app.models_enhanced import AuditLog
+
+        db = self._session_factory()
+        try:
+            if db.get_bind().dialect.name == "postgresql":
+                db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _AUDIT_CHAIN_LOCK_KEY})
+            previous_hash = db.execute(
+                select(AuditLog.c.event_hash).order_by(AuditLog.c.id.desc()).limit(1)
+            ).scalar()
+            rows: List[Dict[str, Any]] = []
+            for payload in payloads:
+                chained = {**payload, "previous_hash": previous_hash}
+                hashed = {key: value for key, value in chained.items() if key not in _ROW_ONLY_FIELDS}
+                event_hash = compute_event_hash(hashed)
+                row = {key: value for key, value in chained.items() if key not in _HASH_ONLY_FIELDS}
+                row["event_hash"] = event_hash
+                rows.append(row)
+                previous_hash = event_hash
+
+            if len(rows) < AUDIT_COPY_MIN_ROWS or not _copy_rows(db, AuditLog, rows):
+                db.execute(insert(AuditLog), rows)
+            db.commit()
+        finally:
+            db.close()
+
+
+audit_log_writer = AuditLogWriter()
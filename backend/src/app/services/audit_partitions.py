@@ -0,0 +1,154 @@
+"""Monthly range partitioning for ``audit_logs`` on PostgreSQL.
+
+Retention then drops whole monthly partitions instead of deleting rows (no MVCC
+bloat or vacuum debt), and scans filtered on ``created_at`` prune to the months
+they touch. Opt-in via ``AUDIT_LOG_PARTITIONING``: ``init_db`` converts the table
+once, and a daily Celery beat task keeps future partitions created and drops
+expired ones.
+"""
+
+from __future__ import annotations
+
+import os
+from datetime import UTC, datetime
+from typing import List, Optional
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+logger = structlog.get_logger(__name__)
+
+AUDIT_LOG_PARTITIONING = os.getenv("AUDIT_LOG_PARTITIONING", "false").lower() in {"1", "true", "yes", "on"}
+AUDIT_PARTITION_MONTHS_AHEAD = int(os.getenv("AUDIT_PARTITION_MONTHS_AHEAD", "3"))
+
+_PARENT = "audit_logs"
+_DEFAULT_PARTITION = f"{_PARENT}_default"
+# Rows written without retention_days fall back to the column default.
+_DEFAULT_RETENTION_DAYS = 365
+
+
+def _month_start(moment: datetime) -> datetime:
+    # created_at is a naive UTC timestamp, so partition bounds are naive too.
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(UTC).replace(tzinfo=None)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{_PARENT}_{month:%Y%m}"
+
+
+def is_partitioned(conn: Connection) -> bool:
+    return conn.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = :name AND pg_table_is_visible(c.oid)"
+        ),
+        {"name": _PARENT},
+    ).first() is not None
+
+
+def ensure_audit_partitions(
+    conn: Connection,
+    now: Optional[datetime] = None,
+    months_ahead: int = AUDIT_PARTITION_MONTHS_AHEAD,
+    since: Optional[datetime] = None,
+) -> List[str]:
+    """Create monthly partitions from ``since`` (default: this month) through ``months_ahead``.
+
+    A DEFAULT partition catches rows outside every range so inserts never fail.
+    """
+
+    current = _month_start(since or now or datetime.now(UTC))
+    last = _add_months(_month_start(now or datetime.now(UTC)), months_ahead)
+    created: List[str] = []
+    while current <= last:
+        upper = _add_months(current, 1)
+        name = partition_name(current)
+        conn.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {_PARENT} "
+                f"FOR VALUES FROM ('{current:%Y-%m-%d}') TO ('{upper:%Y-%m-%d}')"
+            )
+        )
+        created.append(name)
+        current = upper
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {_DEFAULT_PARTITION} PARTITION OF {_PARENT} DEFAULT"))
+    return created
+
+
+def drop_expired_audit_partitions(conn: Connection, now: Optional[datetime] = None) -> List[str]:
+    """Drop past monthly partitions in which every row has outlived its ``retention_days``."""
+
+    now = now or datetime.now(UTC)
+    this_month = partition_name(_month_start(now))
+    partitions = conn.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "WHERE parent.relname = :parent AND child.relname ~ :pattern ORDER BY child.relname"
+        ),
+        {"parent": _PARENT, "pattern": rf"^{_PARENT}_\d{{6}}$"},
+    ).scalars().all()
+
+    dropped: List[str] = []
+    for name in partitions:
+        if name >= this_month:
+            break
+        expires_at = conn.execute(
+            text(
+                f"SELECT max(created_at + coalesce(retention_days, {_DEFAULT_RETENTION_DAYS}) "
+                f"* INTERVAL '1 day') FROM {name}"
+            )
+        ).scalar()
+        if expires_at is not None and expires_at.replace(tzinfo=expires_at.tzinfo or UTC) >= now.astimezone(UTC):
+            continue
+        conn.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    return dropped
+
+
+def convert_audit_logs(conn: Connection, now: Optional[datetime] = None) -> None:
+    """Rebuild ``audit_logs`` as a partitioned table, keeping rows, ids and indexes.
+
+    Must run inside a transaction; a no-op when the table is already partitioned.
+    """
+
+    from app.models_enhanced import AuditLog
+
+    if is_partitioned(conn):
+        return
+
+    legacy = f"{_PARENT}_legacy"
+    conn.execute(text(f"ALTER TABLE {_PARENT} RENAME TO {legacy}"))
+    conn.execute(text(f"ALTER TABLE {legacy} RENAME CONSTRAINT {_PARENT}_pkey TO {legacy}_pkey"))
+    # Index names are schema-wide, so move the old ones aside before recreating them.
+    for index in AuditLog.indexes:
+        conn.execute(text(f"ALTER INDEX IF EXISTS {index.name} RENAME TO {index.name}_legacy"))
+    conn.execute(text(f"UPDATE {legacy} SET created_at = now() WHERE created_at IS NULL"))
+
+    conn.execute(
+        text(f"CREATE TABLE {_PARENT} (LIKE {legacy} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)")
+    )
+    # Unique keys on a partitioned table must include the partition column.
+    conn.execute(text(f"ALTER TABLE {_PARENT} ADD PRIMARY KEY (id, created_at)"))
+    conn.execute(text(f"ALTER TABLE {_PARENT} ADD FOREIGN KEY (user_id) REFERENCES users (id)"))
+    for index in AuditLog.indexes:
+        index.create(conn)
+
+    oldest = conn.execute(text(f"SELECT min(created_at) FROM {legacy}")).scalar()
+    ensure_audit_partitions(conn, now=now, since=oldest)
+    conn.execute(text(f"INSERT INTO {_PARENT} SELECT * FROM {legacy}"))
+
+    sequence = conn.execute(text(f"SELECT pg_get_serial_sequence('{legacy}', 'id')")).scalar()
+    if sequence:
+        conn.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {_PARENT}.id"))
+    conn.execute(text(f"DROP TABLE {legacy}"))
+    logger.info("Partitioned audit_logs by month", oldest=str(oldest))
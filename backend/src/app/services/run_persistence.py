@@ -1,8 +1,10 @@
 """Utilities for persisting execution traces and artifacts."""
 
+import os
 from typing import Sequence
 
-from sqlalchemy import insert
+import orjson
+from sqlalchemy import JSON, insert
 from sqlalchemy.engine import Connection
 
 from app.models import (
@@ -11,12 +13,46 @@ from app.models import (
     AssertionResult as AssertionResultTable,
     ContractViolation as ContractViolationTable,
 )
+from app.models_enhanced import utcnow
 from app.services.artifact_storage import artifact_storage
 
+# Row batches at least this large are streamed with COPY when the driver supports it.
+PERSIST_COPY_MIN_ROWS = int(os.getenv("PERSIST_COPY_MIN_ROWS", "32"))
+
+
+def _copy_rows(conn: Connection, table, rows: Sequence[dict]) -> bool:
+    """Stream ``rows`` with PostgreSQL COPY via psycopg 3; return False if unsupported."""
+
+    if conn.dialect.name != "postgresql" or conn.dialect.driver != "psycopg":
+        return False
+
+    # COPY bypasses SQLAlchemy's Python-side defaults, so created_at is filled in here.
+    columns = [
+        column for column in table.columns
+        if column.name in rows[0] or column.name == "created_at"
+    ]
+    json_columns = {column.name for column in columns if isinstance(column.type, JSON)}
+    created_at = utcnow()
+    statement = f"COPY {table.name} ({', '.join(column.name for column in columns)}) FROM STDIN"
+    with conn.connection.driver_connection.cursor() as cursor:
+        with cursor.copy(statement) as copy:
+            for row in rows:
+                copy.write_row(
+                    tuple(
+                        orjson.dumps(row.get(column.name)).decode() if column.name in json_columns
+                        else row.get(column.name, created_at) if column.name == "created_at"
+                        else row.get(column.name)
+                        for column in columns
+                    )
+                )
+    return True
+
 
 def _bulk_insert(conn: Connection, table, rows: Sequence[dict]) -> None:
     if not rows:
         return
+    if len(rows) >= PERSIST_COPY_MIN_ROWS and _copy_rows(conn, table, rows):
+        return
     conn.execute(insert(table), rows)
 
 
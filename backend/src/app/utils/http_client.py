@@ -0,0 +1,66 @@
+"""Shared, connection-pooled async HTTP clients."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import Any, Dict, Set, Tuple
+
+import httpx
+
+_clients: Dict[str, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+# Keeps close tasks for replaced clients alive until they finish.
+_closing: Set[asyncio.Task] = set()
+
+
+def get_async_client(name: str, **client_kwargs: Any) -> httpx.AsyncClient:
+    """Return the pooled client registered under ``name`` for the running event loop.
+
+    httpx clients are bound to the loop they were first used on, so a new client
+    is created when the loop changes (e.g. between ``asyncio.run`` calls) and the
+    one it replaces is closed.
+    """
+
+    loop = asyncio.get_running_loop()
+    entry = _clients.get(name)
+    if entry is not None and entry[0] is loop and not entry[1].is_closed:
+        return entry[1]
+    if entry is not None:
+        _retire(*entry)
+    client = httpx.AsyncClient(**client_kwargs)
+    _clients[name] = (loop, client)
+    return client
+
+
+async def close_async_clients() -> None:
+    """Close every client owned by the running loop (called on application shutdown).
+
+    Clients owned by other loops stay registered; they are closed when replaced.
+    """
+
+    loop = asyncio.get_running_loop()
+    for name, (owner, client) in list(_clients.items()):
+        if owner is not loop:
+            continue
+        if not client.is_closed:
+            await client.aclose()
+        _clients.pop(name, None)
+
+
+def _retire(owner: asyncio.AbstractEventLoop, client: httpx.AsyncClient) -> None:
+    """Release the pool of a client that is being replaced."""
+
+    if client.is_closed:
+        return
+    if owner.is_running() and owner is not asyncio.get_running_loop():
+        asyncio.run_coroutine_threadsafe(client.aclose(), owner)
+        return
+    # The owning loop is gone; close what can be closed from here.
+    task = asyncio.get_running_loop().create_task(_aclose_quietly(client))
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+async def _aclose_quietly(client: httpx.AsyncClient) -> None:
+    with contextlib.suppress(Exception):
+        await client.aclose()
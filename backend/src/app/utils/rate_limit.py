@@ -0,0 +1,52 @@
+"""Token-bucket rate limiter usable from both threads and coroutines."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Refill ``rate_per_minute`` tokens per minute, bursting up to ``capacity``.
+
+    Callers reserve tokens under a lock and then sleep outside it, so waiting
+    never blocks other callers from computing their own reservation. A
+    non-positive rate disables limiting.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.refill_rate_per_s = rate_per_minute / 60
+        self.capacity = float(capacity if capacity is not None else max(rate_per_minute, 1))
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.refill_rate_per_s > 0
+
+    def reserve(self, n: float = 1) -> float:
+        """Take ``n`` tokens and return how many seconds the caller must wait for them."""
+
+        if not self.enabled:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate_per_s)
+            self.last_refill = now
+            self.tokens -= n
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.refill_rate_per_s
+
+    async def acquire(self, n: float = 1) -> None:
+        delay = self.reserve(n)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self, n: float = 1) -> None:
+        delay = self.reserve(n)
+        if delay > 0:
+            time.sleep(delay)
@@ -0,0 +1,20 @@
+"""orjson-backed JSON responses."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered with orjson.
+
+    FastAPI's own ``ORJSONResponse`` is deprecated in newer releases, but routes
+    here mostly return plain dicts without a response model, which still go
+    through the response class for serialization.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
@@ -303,6 +303,47 @@ def cleanup_old_runs(days: int = 30) -> Dict[str, Any]:
         db.close()
 
 
+@celery_app.task
+def maintain_audit_partitions() -> Dict[str, Any]:
+    """Create upcoming monthly audit_logs partitions and drop fully expired ones."""
+    from app.database import engine
+    from app.services.audit_partitions import (
+        AUDIT_LOG_PARTITIONING,
+        drop_expired_audit_partitions,
+        ensure_audit_partitions,
+        is_partitioned,
+    )
+
+    if not AUDIT_LOG_PARTITIONING or engine.dialect.name != "postgresql":
+        return {"enabled": False}
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            return {"enabled": False}
+        created = ensure_audit_partitions(conn)
+        dropped = drop_expired_audit_partitions(conn)
+    if dropped:
+        logger.info("Dropped expired audit partitions", partitions=dropped)
+    return {"enabled": True, "partitions": created, "dropped": dropped}
+
+
+@celery_app.task
+def verify_audit_log_chain(hours: int = 25) -> Dict[str, Any]:
+    """Check the audit hash chain over the last ``hours`` and log any broken links."""
+    from app.database import SessionLocal
+    from app.models_enhanced import utcnow
+    from app.services.audit_log import verify_audit_chain
+
+    end = utcnow()
+    db = SessionLocal()
+    try:
+        broken = verify_audit_chain(db, end - timedelta(hours=hours), end)
+    finally:
+        db.close()
+    if broken:
+        logger.error("Audit log hash chain broken", audit_log_ids=broken[:100], count=len(broken))
+    return {"checked_hours": hours, "broken": broken}
+
+
 @celery_app.task
 def recover_orphan_runs(
     queued_timeout_minutes: int = 5,
@@ -397,5 +438,13 @@ celery_app.conf.beat_schedule = {
         "task": "workers.tasks.recover_orphan_runs",
         "schedule": 300,  # Every 5 minutes
         "args": (5, 30)
+    },
+    "maintain-audit-partitions": {
+        "task": "app.workers.tasks.maintain_audit_partitions",
+        "schedule": 86400,  # Daily
+    },
+    "verify-audit-log-chain": {
+        "task": "app.workers.tasks.verify_audit_log_chain",
+        "schedule": 86400,  # Daily; the 25h default window overlaps the previous run
     }
 }
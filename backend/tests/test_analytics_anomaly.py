@@ -19,7 +19,15 @@ def test_drift_analyzer_detects_anomalies():
 def test_detect_latency_anomalies_helper():
     result = detect_latency_anomalies([100, 105, 110], [120, 130, 300], threshold=2.0)
     assert 2 in result.anomalies
-from app.analytics.anomaly import AnomalyDetectionResult, detect_zscore_anomalies, moving_average
+import numpy as np
+import pytest
+
+from app.analytics.anomaly import (
+    AnomalyDetectionResult,
+    detect_zscore_anomalies,
+    moving_average,
+    smooth_series,
+)
 
 
 def test_detect_zscore_anomalies_identifies_outliers():
@@ -46,3 +54,103 @@ def test_moving_average_guardrails():
     else:
         raise AssertionError("Expected ValueError for non-positive window")
 
+
+def test_smooth_series_matches_windowed_mean():
+    arr = np.random.default_rng(7).normal(100.0, 15.0, size=500)
+    expected = [arr[max(0, i - 4) : i + 1].mean() for i in range(arr.size)]
+    assert np.allclose(smooth_series(arr, 5), expected)
+
+
+
+def test_drift_analyzer_handles_empty_windows():
+    analyzer = DriftAnalyzer(threshold=2.0)
+    result = analyzer.analyze(MetricWindow([]), MetricWindow([]))
+    assert result.score == 0.0
+    assert result.anomalies == []
+
+
+def test_metric_window_reused_as_baseline():
+    baseline = MetricWindow([100, 110, 120, 115])
+    analyzer = DriftAnalyzer(threshold=2.5)
+    first = analyzer.analyze(baseline, MetricWindow([105, 500]))
+    second = analyzer.analyze(baseline, MetricWindow([500, 105]))
+    assert first.anomalies == [1]
+    assert second.anomalies == [0]
+    assert first.score == second.score
+
+
+def test_detect_zscore_anomalies_handles_empty_and_flat_series():
+    empty = detect_zscore_anomalies([])
+    assert empty.indices == [] and empty.stddev == 0.0
+
+    flat = detect_zscore_anomalies([5, 5, 5])
+    assert flat.indices == []
+    assert flat.mean == 5.0
+
+
+def test_zscore_kernel_matches_vectorised_detector():
+    from app.analytics.anomaly import _zscore_kernel
+
+    arr = np.random.default_rng(3).normal(50.0, 5.0, size=200)
+    arr[[17, 120]] = [120.0, -40.0]
+    indices, mean, stddev = _zscore_kernel(arr, 3.0)
+    expected = detect_zscore_anomalies(arr, z_threshold=3.0)
+    assert indices.tolist() == expected.indices
+    assert np.isclose(mean, expected.mean)
+    assert np.isclose(stddev, expected.stddev)
+
+
+def test_fused_smoothing_kernel_matches_two_pass():
+    from app.analytics.anomaly import _smoothed_zscore, detect_smoothed_zscore_anomalies
+
+    arr = np.random.default_rng(11).normal(20.0, 2.0, size=300)
+    arr[150:155] = 60.0
+    smoothed = smooth_series(arr, 4)
+    expected = detect_zscore_anomalies(smoothed, z_threshold=2.5)
+
+    indices, mean, stddev, out = _smoothed_zscore(arr, 4, 2.5, True)
+    assert indices.tolist() == expected.indices
+    assert np.isclose(mean, expected.mean) and np.isclose(stddev, expected.stddev)
+    assert np.allclose(out, smoothed)
+    assert _smoothed_zscore(arr, 4, 2.5, False)[3].size == 0
+
+    result, kept = detect_smoothed_zscore_anomalies(arr, 4, z_threshold=2.5, keep_smoothed=False)
+    assert result.indices == expected.indices
+    assert kept is None
+
+
+def test_jitted_kernels_match_numpy_path_on_nan_and_constant_data(monkeypatch):
+    pytest.importorskip("numba")
+    from app.analytics import anomaly
+
+    assert anomaly._zscore_kernel_jit is not None
+    noisy = np.random.default_rng(5).normal(10.0, 1.0, size=64)
+    with_nan = noisy.copy()
+    with_nan[20] = np.nan
+    series = {
+        "nan": with_nan,
+        "constant": np.full(64, 7.0),
+        "constant_window": np.concatenate([np.full(32, 7.0), noisy[:32]]),
+    }
+
+    jitted = {}
+    for name, arr in series.items():
+        jitted[name] = (
+            anomaly.detect_zscore_anomalies(arr, z_threshold=2.0),
+            anomaly.detect_smoothed_zscore_anomalies(arr, 4, z_threshold=2.0),
+        )
+    monkeypatch.setattr(anomaly, "_zscore_kernel_jit", None)
+    monkeypatch.setattr(anomaly, "_smoothed_zscore_jit", None)
+
+    for name, arr in series.items():
+        plain, (smoothed_result, smoothed) = jitted[name]
+        expected = anomaly.detect_zscore_anomalies(arr, z_threshold=2.0)
+        expected_smoothed_result, expected_smoothed = anomaly.detect_smoothed_zscore_anomalies(
+            arr, 4, z_threshold=2.0
+        )
+        assert plain.indices == expected.indices, name
+        assert np.isclose(plain.mean, expected.mean, equal_nan=True), name
+        assert np.isclose(plain.stddev, expected.stddev, equal_nan=True), name
+        assert smoothed_result.indices == expected_smoothed_result.indices, name
+        assert np.isclose(smoothed_result.stddev, expected_smoothed_result.stddev, equal_nan=True), name
+        assert np.allclose(smoothed, expected_smoothed, equal_nan=True), name
@@ -23,4 +23,12 @@ def test_series_anomaly_endpoint_detects_outlier():
     assert response.status_code == 200
     data = response.json()
     assert data["anomaly_indices"] == [3]
-    assert "processed_series" in data
+    assert "processed_series" not in data
+
+
+def test_series_anomaly_endpoint_smooths_series():
+    client = TestClient(app)
+    payload = {"series": [1, 2, 3, 4], "smoothing_window": 2, "z_threshold": 3.0, "include_processed": True}
+    response = client.post("/analytics/anomalies/series", json=payload)
+    assert response.status_code == 200
+    assert response.json()["processed_series"] == [1, 1.5, 2.5, 3.5]
@@ -0,0 +1,257 @@
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app import auth
+
+
+@pytest.fixture(autouse=True)
+def _clear_token_cache():
+    auth.clear_token_cache()
+    yield
+    auth.clear_token_cache()
+
+
+def test_decode_access_token_caches_verified_claims(monkeypatch):
+    token = auth.create_access_token({"user_id": 7, "email": "a@example.com"})
+    first = auth.decode_access_token(token)
+    assert first["user_id"] == 7
+
+    import jwt
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("cache hit should skip jwt.decode")
+
+    monkeypatch.setattr(jwt, "decode", _fail)
+    second = auth.decode_access_token(token)
+    assert second == first
+
+    second["user_id"] = 99
+    assert auth.decode_access_token(token)["user_id"] == 7
+
+
+def test_decode_access_token_does_not_cache_invalid_tokens():
+    with pytest.raises(HTTPException) as exc:
+        auth.decode_access_token("not-a-token")
+    assert exc.value.status_code == 401
+    assert not auth._TOKEN_CACHE
+
+
+def test_decode_access_token_rejects_expired_tokens():
+    token = auth.create_access_token({"user_id": 1}, expires_delta=timedelta(seconds=-1))
+    with pytest.raises(HTTPException) as exc:
+        auth.decode_access_token(token)
+    assert exc.value.detail == "Token expired"
+
+
+def test_token_cache_evicts_oldest_entries(monkeypatch):
+    monkeypatch.setattr(auth._TOKEN_CACHE, "max_entries", 2)
+    tokens = [auth.create_access_token({"user_id": idx}) for idx in range(3)]
+    for token in tokens:
+        auth.decode_access_token(token)
+    assert len(auth._TOKEN_CACHE) == 2
+
+
+def test_hash_password_round_trip_records_iterations(monkeypatch):
+    monkeypatch.setattr(auth, "PASSWORD_HASH_ITERATIONS", 1000)
+    hashed = auth.hash_password("s3cret")
+    assert hashed.startswith("1000$")
+    assert auth.verify_password("s3cret", hashed)
+    assert not auth.verify_password("wrong", hashed)
+
+
+def test_verify_password_accepts_legacy_format():
+    import hashlib
+
+    digest = hashlib.pbkdf2_hmac("sha256", b"legacy", b"abc", auth.LEGACY_PASSWORD_HASH_ITERATIONS)
+    assert auth.verify_password("legacy", f"abc${digest.hex()}")
+    assert not auth.verify_password("legacy", "malformed")
+
+
+def test_user_permissions_are_normalized_to_frozenset():
+    user = auth.User(
+        id=1,
+        email="op@example.com",
+        name="Operator",
+        role=auth.Role.OPERATOR,
+        permissions=[auth.Permission.RUN_READ, auth.Permission.GRAPH_READ],
+    )
+    assert isinstance(user.permissions, frozenset)
+    assert user.has_permission(auth.Permission.RUN_READ)
+    assert user.has_any_permission([auth.Permission.USER_DELETE, auth.Permission.GRAPH_READ])
+    assert not user.has_any_permission([auth.Permission.USER_DELETE])
+    assert user.has_all_permissions([auth.Permission.RUN_READ, auth.Permission.GRAPH_READ])
+    assert not user.has_all_permissions([auth.Permission.RUN_READ, auth.Permission.USER_DELETE])
+    assert auth.ROLE_PERMISSIONS[auth.Role.ADMIN] == frozenset(auth.Permission)
+
+
+def test_api_key_resolution_is_cached_until_invalidated(monkeypatch):
+    import asyncio
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from app.models import metadata
+    from app.models_enhanced import User as UserTable
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        future=True,
+    )
+    metadata.create_all(engine)
+    executed = []
+    db = sessionmaker(bind=engine, expire_on_commit=False, future=True)()
+    original_execute = db.execute
+
+    def counting_execute(*args, **kwargs):
+        executed.append(True)
+        return original_execute(*args, **kwargs)
+
+    monkeypatch.setattr(db, "execute", counting_execute)
+    api_key = auth.generate_api_key()
+    with engine.begin() as conn:
+        conn.execute(UserTable.insert().values(
+            id=5, email="api@example.com", name="API", role="api",
+            is_active=True, api_key=auth.hash_api_key(api_key), tenant_id="t1",
+        ))
+
+    auth.invalidate_api_key_cache()
+    first = asyncio.run(auth.get_current_user(None, api_key, db=db))
+    second = asyncio.run(auth.get_current_user(None, api_key, db=db))
+    assert first == second
+    assert first.tenant_id == "t1"
+    assert first.permissions == auth.ROLE_PERMISSIONS[auth.Role.API]
+    assert len(executed) == 1
+
+    auth.invalidate_api_key_cache(5)
+    asyncio.run(auth.get_current_user(None, api_key, db=db))
+    assert len(executed) == 2
+    auth.invalidate_api_key_cache()
+
+
+def test_short_api_keys_are_rejected_before_hashing(monkeypatch):
+    import asyncio
+
+    def _fail(api_key):
+        raise AssertionError("malformed keys must not be hashed")
+
+    monkeypatch.setattr(auth, "hash_api_key", _fail)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(auth.get_current_user(None, auth.API_KEY_PREFIX + "short", db=None))
+    assert exc.value.status_code == 401
+
+
+def test_permission_dependencies_use_precomputed_sets():
+    import asyncio
+
+    viewer = auth.User(
+        id=3,
+        email="viewer@example.com",
+        name="Viewer",
+        role=auth.Role.VIEWER,
+        permissions=auth.ROLE_PERMISSIONS[auth.Role.VIEWER],
+    )
+    allow = auth.permission_dependency(auth.Permission.RUN_READ)
+    assert asyncio.run(allow(user=viewer)) is viewer
+
+    deny = auth.permission_dependency(auth.Permission.RUN_CREATE)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(deny(user=viewer))
+    assert exc.value.detail == "Permission denied: run:create"
+
+    any_of = auth.permissions_dependency(auth.Permission.USER_DELETE, auth.Permission.METRICS_READ)
+    assert asyncio.run(any_of(user=viewer)) is viewer
+    none_of = auth.permissions_dependency(auth.Permission.USER_DELETE)
+    with pytest.raises(HTTPException):
+        asyncio.run(none_of(user=viewer))
+
+
+def test_access_token_uses_integer_epoch_claims():
+    import time
+
+    import jwt
+
+    token = auth.create_access_token({"user_id": 1}, expires_delta=timedelta(minutes=5))
+    claims = jwt.decode(token, auth.JWT_SECRET, algorithms=[auth.JWT_ALGORITHM])
+    assert claims["exp"] - claims["iat"] == 300
+    assert abs(claims["iat"] - time.time()) < 5
+
+
+def test_verify_password_rejects_unusable_hash_without_hashing(monkeypatch):
+    def _fail(*args, **kwargs):
+        raise AssertionError("unusable hashes must not be run through PBKDF2")
+
+    monkeypatch.setattr(auth.hashlib, "pbkdf2_hmac", _fail)
+    assert not auth.verify_password("", auth.UNUSABLE_PASSWORD_HASH)
+    assert not auth.verify_password("anything", None)
+
+
+def test_password_hashing_is_bounded_by_slots(monkeypatch):
+    import threading
+
+    monkeypatch.setattr(auth, "PASSWORD_HASH_ITERATIONS", 1000)
+    monkeypatch.setattr(auth, "_PASSWORD_HASH_SLOTS", threading.BoundedSemaphore(1))
+    active = []
+    peak = []
+    real = auth.hashlib.pbkdf2_hmac
+
+    def tracking(*args):
+        active.append(1)
+        peak.append(len(active))
+        try:
+            return real(*args)
+        finally:
+            active.pop()
+
+    monkeypatch.setattr(auth.hashlib, "pbkdf2_hmac", tracking)
+    threads = [threading.Thread(target=auth.hash_password, args=("pw",)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(peak) == 1
+
+
+def test_revoked_api_key_expires_from_other_workers_caches_within_ttl(monkeypatch):
+    import asyncio
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from app.models import metadata
+    from app.models_enhanced import User as UserTable
+    from app.utils import ttl_cache
+
+    now = [1000.0]
+    monkeypatch.setattr(auth.time, "time", lambda: now[0])
+    monkeypatch.setattr(ttl_cache.time, "time", lambda: now[0])
+    assert auth.API_KEY_CACHE_TTL_SECONDS <= 5
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    metadata.create_all(engine)
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+    api_key = auth.generate_api_key()
+    with engine.begin() as conn:
+        conn.execute(UserTable.insert().values(
+            id=9, email="svc@example.com", name="Svc", role="api",
+            is_active=True, api_key=auth.hash_api_key(api_key),
+        ))
+
+    auth.invalidate_api_key_cache()
+    assert asyncio.run(auth.get_current_user(None, api_key, db=db)).id == 9
+
+    # Another worker revokes the key: this process's cache is not told.
+    with engine.begin() as conn:
+        conn.execute(UserTable.update().where(UserTable.c.id == 9).values(api_key=None))
+    assert asyncio.run(auth.get_current_user(None, api_key, db=db)).id == 9
+
+    now[0] += auth.API_KEY_CACHE_TTL_SECONDS
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(auth.get_current_user(None, api_key, db=db))
+    assert exc.value.status_code == 401
+    auth.invalidate_api_key_cache()
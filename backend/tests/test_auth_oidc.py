@@ -0,0 +1,109 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+from app.auth import oidc
+
+
+def build_provider(monkeypatch, calls):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.endswith("openid-configuration"):
+            return httpx.Response(
+                200,
+                json={
+                    "jwks_uri": "https://idp.example.com/jwks",
+                    "authorization_endpoint": "https://idp.example.com/authorize",
+                },
+            )
+        return httpx.Response(200, json={"keys": [{"kid": "k1", "kty": "oct", "k": "c2VjcmV0"}]})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(oidc, "_get_http_client", lambda: client)
+    config = oidc.OIDCProviderConfig(
+        name="test",
+        issuer="https://idp.example.com",
+        client_id="client",
+        client_secret="secret",
+        redirect_uri="https://app.example.com/callback",
+    )
+    return oidc.OIDCProvider(config)
+
+
+def test_metadata_and_jwks_are_cached(monkeypatch):
+    calls = []
+    provider = build_provider(monkeypatch, calls)
+
+    async def scenario():
+        results = await asyncio.gather(*(provider._fetch_jwks() for _ in range(5)))
+        await provider.public_metadata()
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(result["keys"][0]["kid"] == "k1" for result in results)
+    assert calls == ["/.well-known/openid-configuration", "/jwks"]
+    assert set(provider._jwks_by_kid) == {"k1"}
+
+
+def test_verify_id_token_rejects_unknown_kid(monkeypatch):
+    provider = build_provider(monkeypatch, [])
+    token = jwt.encode({"sub": "user"}, "secret", algorithm="HS256", headers={"kid": "unknown"})
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(provider.verify_id_token(token))
+    assert exc.value.status_code == 401
+    assert exc.value.detail == "OIDC signing key mismatch"
+
+
+def test_verify_id_token_caches_valid_claims(monkeypatch):
+    provider = build_provider(monkeypatch, [])
+    token = jwt.encode(
+        {"sub": "user", "aud": "client", "iss": "https://idp.example.com"},
+        "secret",
+        algorithm="HS256",
+        headers={"kid": "k1"},
+    )
+
+    first = asyncio.run(provider.verify_id_token(token))
+    assert first["sub"] == "user"
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("cache hit should skip signature verification")
+
+    monkeypatch.setattr(oidc.jwt, "decode", _fail)
+    assert asyncio.run(provider.verify_id_token(token)) == first
+
+
+def test_load_provider_configs_accepts_list_and_dict(monkeypatch):
+    monkeypatch.setenv(
+        "OIDC_PROVIDER_CONFIG",
+        '{"providers": [{"name": "okta", "issuer": "https://okta.example.com", "client_id": "c",'
+        ' "client_secret": "s", "redirect_uri": "https://app/cb"}]}',
+    )
+    configs = oidc._load_provider_configs()
+    assert configs["okta"].issuer == "https://okta.example.com"
+
+    monkeypatch.setenv(
+        "OIDC_PROVIDER_CONFIG",
+        '{"azure": {"issuer": "https://login.example.com", "client_id": "c",'
+        ' "client_secret": "s", "redirect_uri": "https://app/cb"}}',
+    )
+    manager = oidc.OIDCManager(oidc._load_provider_configs())
+    assert manager.is_enabled()
+    assert manager.get_provider("azure").config.name == "azure"
+
+
+def test_id_token_cache_never_outlives_token_exp(monkeypatch):
+    provider = build_provider(monkeypatch, [])
+    now = [1000.0]
+    monkeypatch.setattr(oidc.time, "time", lambda: now[0])
+    from app.utils import ttl_cache
+
+    monkeypatch.setattr(ttl_cache.time, "time", lambda: now[0])
+    provider._cache_claims(b"k", {"sub": "user", "exp": 1002})
+    assert provider._cached_claims(b"k") == {"sub": "user", "exp": 1002}
+    now[0] = 1002.0
+    assert provider._cached_claims(b"k") is None
@@ -1,5 +1,7 @@
+import asyncio
 import json
 
+import httpx
 from fastapi.testclient import TestClient
 
 from app.collaboration.slack import SlackNotifier, SlackMessage
@@ -20,10 +22,11 @@ def test_slack_notifier_sends_payload(monkeypatch):
     captured = {}
 
     class DummySession:
-        def post(self, url, data, timeout):
+        def post(self, url, data, timeout, headers=None):
             captured["url"] = url
             captured["payload"] = json.loads(data)
             captured["timeout"] = timeout
+            captured["headers"] = headers
             return DummyResponse()
 
     notifier = SlackNotifier("https://hooks.slack.com/foo", session=DummySession())
@@ -31,6 +34,7 @@ def test_slack_notifier_sends_payload(monkeypatch):
     assert result["status"] == "sent"
     assert captured["payload"]["channel"] == "#ops"
     assert captured["payload"]["text"] == "hello"
+    assert captured["headers"]["Content-Type"] == "application/json"
 
 
 def test_slack_notifier_skips_without_webhook():
@@ -43,7 +47,7 @@ def test_slack_notifier_posts_payload(monkeypatch):
     captured = {}
 
     class DummySession:
-        def post(self, url, data, timeout):
+        def post(self, url, data, timeout, headers=None):
             captured["payload"] = json.loads(data)
             captured["url"] = url
             return DummyResponse()
@@ -59,10 +63,10 @@ def test_slack_notifier_posts_payload(monkeypatch):
 def test_slack_router_endpoint(monkeypatch):
     monkeypatch.setenv("SLACK_WEBHOOK_URL", "https://hooks.slack.com/test")
 
-    def fake_send(self, message):
+    async def fake_send(self, message):
         return {"status": "sent", "channel": message.channel}
 
-    monkeypatch.setattr(SlackNotifier, "send", fake_send)
+    monkeypatch.setattr(SlackNotifier, "send_async", fake_send)
 
     client = TestClient(app)
     response = client.post(
@@ -71,3 +75,24 @@ def test_slack_router_endpoint(monkeypatch):
     )
     assert response.status_code == 200
     assert response.json()["status"] == "sent"
+
+
+def test_slack_notifier_send_async_posts_json():
+    captured = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        captured["url"] = str(request.url)
+        captured["payload"] = json.loads(request.content)
+        captured["content_type"] = request.headers["content-type"]
+        return httpx.Response(200, text="ok")
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            notifier = SlackNotifier("https://hooks.slack.test/async", async_client=client)
+            return await notifier.send_async(SlackMessage(channel="#ops", text="async hello"))
+
+    result = asyncio.run(scenario())
+    assert result == {"status": "sent", "channel": "#ops"}
+    assert captured["url"] == "https://hooks.slack.test/async"
+    assert captured["payload"]["text"] == "async hello"
+    assert captured["content_type"] == "application/json"
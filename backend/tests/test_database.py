@@ -9,10 +9,167 @@ def test_init_db_invokes_metadata(monkeypatch):
     def fake_create_all(engine):
         captured["engine"] = engine
 
-    dummy_engine = object()
+    dummy_engine = SimpleNamespace(dialect=SimpleNamespace(name="sqlite"))
     monkeypatch.setattr(database, "metadata", SimpleNamespace(create_all=fake_create_all))
     monkeypatch.setattr(database, "engine", dummy_engine)
 
     database.init_db()
 
     assert captured["engine"] is dummy_engine
+
+
+def test_get_db_yields_and_closes_session(monkeypatch):
+    import asyncio
+
+    events = []
+
+    class DummySession:
+        def close(self):
+            events.append("closed")
+
+    monkeypatch.setattr(database, "SessionLocal", DummySession)
+
+    async def scenario():
+        gen = database.get_db()
+        session = await gen.__anext__()
+        assert isinstance(session, DummySession)
+        assert events == []
+        await gen.aclose()
+
+    asyncio.run(scenario())
+    assert events == ["closed"]
+
+
+def test_engine_options_size_pool_for_server_databases(monkeypatch):
+    monkeypatch.setattr(database, "DB_POOL_SIZE", 7)
+    monkeypatch.setattr(database, "DB_MAX_OVERFLOW", 3)
+
+    options = database._engine_options("postgresql+psycopg://u:p@db/x")
+    assert options["pool_size"] == 7
+    assert options["max_overflow"] == 3
+    assert options["pool_recycle"] == database.DB_POOL_RECYCLE_SECONDS
+
+    sqlite_options = database._engine_options("sqlite:///:memory:")
+    assert "pool_size" not in sqlite_options
+    assert sqlite_options["pool_pre_ping"] is True
+
+
+def test_init_db_enables_timescale_on_postgres(monkeypatch):
+    executed = []
+
+    class FakeConnection:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, statement, params=None):
+            sql = str(statement)
+            executed.append(sql)
+            return SimpleNamespace(first=lambda: None, scalar=lambda: "bytea")
+
+    fake_engine = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"), begin=FakeConnection)
+    monkeypatch.setattr(database, "metadata", SimpleNamespace(create_all=lambda engine: None))
+    monkeypatch.setattr(database, "engine", fake_engine)
+    monkeypatch.setattr(database, "TIMESCALEDB_ENABLED", True)
+    monkeypatch.setattr(database, "create_missing_indexes", lambda conn: None)
+
+    database.init_db()
+
+    assert "CREATE EXTENSION IF NOT EXISTS timescaledb" in executed
+    assert any("create_hypertable('metrics_daily', 'date'" in sql for sql in executed)
+    assert any("add_compression_policy" in sql for sql in executed)
+    assert any("CREATE MATERIALIZED VIEW IF NOT EXISTS metrics_weekly" in sql for sql in executed)
+
+
+def test_jsonb_gin_indexes_are_postgres_only():
+    from sqlalchemy import create_engine, inspect
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.schema import CreateIndex
+
+    from app.models_enhanced import AuditLog, metadata
+
+    gin = next(index for index in AuditLog.indexes if index.name == "idx_audit_details_gin")
+    ddl = str(CreateIndex(gin).compile(dialect=postgresql.dialect()))
+    assert "USING gin (details jsonb_path_ops)" in ddl
+
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    names = {index["name"] for index in inspect(engine).get_indexes("audit_logs")}
+    assert "idx_audit_created" in names
+    assert "idx_audit_details_gin" not in names
+
+
+def test_convert_hash_columns_rewrites_only_varchar_columns():
+    executed = []
+
+    class FakeConnection:
+        def execute(self, statement, params=None):
+            sql = str(statement)
+            executed.append(sql)
+            legacy = params is not None and params["table"] == "audit_logs"
+            return SimpleNamespace(scalar=lambda: "character varying" if legacy else "bytea")
+
+    database.convert_hash_columns(FakeConnection())
+
+    alters = [sql for sql in executed if sql.startswith("ALTER TABLE")]
+    assert len(alters) == 2
+    assert alters[0].startswith("ALTER TABLE audit_logs ALTER COLUMN previous_hash TYPE bytea")
+    assert "decode(event_hash, 'hex')" in alters[1]
+
+
+def test_brin_indexes_on_insert_ordered_timestamps():
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.schema import CreateIndex
+
+    from app.models_enhanced import AgentOutput, WebhookDelivery
+
+    brin = next(index for index in AgentOutput.indexes if index.name == "idx_outputs_created_brin")
+    ddl = str(CreateIndex(brin).compile(dialect=postgresql.dialect()))
+    assert "USING brin (created_at)" in ddl
+    assert "pages_per_range = 32" in ddl
+    assert any(index.name == "idx_deliveries_delivered_brin" for index in WebhookDelivery.indexes)
+
+
+def test_create_missing_indexes_backfills_existing_tables():
+    from sqlalchemy import create_engine, inspect, text
+
+    from app.models_enhanced import metadata
+
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX idx_audit_created"))
+        database.create_missing_indexes(conn)
+
+    names = {index["name"] for index in inspect(engine).get_indexes("audit_logs")}
+    assert "idx_audit_created" in names
+    assert "idx_audit_details_gin" not in names
+
+
+def test_agent_output_run_index_covers_rollup_columns():
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.schema import CreateIndex
+
+    from app.models_enhanced import AgentOutput
+
+    cover = next(index for index in AgentOutput.indexes if index.name == "idx_outputs_run_cover")
+    ddl = str(CreateIndex(cover).compile(dialect=postgresql.dialect()))
+    assert "(run_id) INCLUDE (latency_ms, cost_usd, tokens_in, tokens_out)" in ddl
+    assert "idx_outputs_run" in database._SUPERSEDED_INDEXES
+
+
+def test_tenant_scoped_composite_indexes_lead_with_tenant():
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.schema import CreateIndex
+
+    from app.models_enhanced import AuditLog, SafetyViolation
+
+    indexes = {index.name: index for index in (*AuditLog.indexes, *SafetyViolation.indexes)}
+    ddl = str(CreateIndex(indexes["idx_audit_tenant_action_created"]).compile(dialect=postgresql.dialect()))
+    assert "(tenant_id, action, created_at DESC)" in ddl
+    assert "idx_audit_tenant_created" in indexes
+    assert "idx_safety_tenant_type_created" in indexes
+    assert "idx_audit_tenant" not in indexes
+    assert "idx_audit_tenant" in database._SUPERSEDED_INDEXES
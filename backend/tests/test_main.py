@@ -1,7 +1,6 @@
 from fastapi.testclient import TestClient
 
 import app.main as main
-import app.providers as providers_module
 
 
 def test_root_health_and_providers(monkeypatch):
@@ -19,7 +18,7 @@ def test_root_health_and_providers(monkeypatch):
         def list_providers(self):
             return self.configured
 
-    monkeypatch.setattr(providers_module, "ProviderRegistry", DummyRegistry)
+    monkeypatch.setattr(main, "ProviderRegistry", DummyRegistry)
 
     @main.app.get("/__test_error__")
     def _boom():
@@ -37,7 +36,9 @@ def test_root_health_and_providers(monkeypatch):
         providers_resp = client.get("/providers")
         assert providers_resp.status_code == 200
         assert providers_resp.json()["available"] == ["openai"]
+        assert isinstance(main.app.state.provider_registry, DummyRegistry)  # built once at startup
         assert init_calls  # lifespan called init_db
+        assert main.app.openapi_schema is not None  # lifespan warmed the schema
 
         error_response = client.get("/__test_error__")
         assert error_response.status_code == 500
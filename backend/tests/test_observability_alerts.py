@@ -23,3 +23,29 @@ def test_incident_payload_links_runbook():
     assert payload["title"].startswith("[Alert]")
     assert RUNBOOK_URL in payload["runbook"]
 
+
+
+def test_default_prometheus_rules_are_built_once_and_json_safe():
+    import json
+
+    import pytest
+
+    from app.observability.alerts import get_default_prometheus_rules
+
+    payload = get_default_prometheus_rules()
+    assert payload is get_default_prometheus_rules()
+    assert payload == serialize_prometheus_rules(default_alert_rules())
+    json.dumps(payload)
+
+    with pytest.raises(TypeError):
+        default_alert_rules()[0].labels["severity"] = "info"
+
+
+def test_default_prometheus_rules_bytes_match_the_rule_group():
+    import json
+
+    from app.observability.alerts import get_default_prometheus_rules, get_default_prometheus_rules_bytes
+
+    payload = get_default_prometheus_rules_bytes()
+    assert payload is get_default_prometheus_rules_bytes()
+    assert json.loads(payload) == get_default_prometheus_rules()
@@ -41,3 +41,59 @@ def test_structured_logging_includes_context(caplog):
     assert record["path"] == "/ping"
     assert record.get("trace_id"), "trace_id should be present for correlation"
 
+
+
+def test_request_logging_skipped_when_info_filtered(monkeypatch):
+    from app.observability import logging as obs_logging
+
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping():
+        return {"status": "ok"}
+
+    def fail_trace_id():
+        raise AssertionError("trace id computed while INFO is off")
+
+    app.add_middleware(RequestLoggingMiddleware)
+    monkeypatch.setattr(obs_logging, "_info_enabled", False)
+    monkeypatch.setattr(obs_logging, "_current_trace_ids", fail_trace_id)
+
+    response = TestClient(app).get("/ping")
+    assert response.status_code == 200
+
+
+def test_current_trace_ids_outside_a_span_are_none():
+    from opentelemetry.sdk.trace import TracerProvider
+
+    from app.observability.logging import _current_trace_ids
+
+    assert _current_trace_ids() == (None, None)
+
+    with TracerProvider().get_tracer("test").start_as_current_span("op") as span:
+        trace_id, span_id = _current_trace_ids()
+        assert trace_id == format(span.get_span_context().trace_id, "032x")
+        assert span_id == format(span.get_span_context().span_id, "016x")
+
+
+def test_configure_logging_once_configures_once_across_threads(monkeypatch):
+    import threading
+
+    import structlog
+
+    from app.observability import logging as obs_logging
+
+    calls = []
+    monkeypatch.setattr(structlog, "configure", lambda **kwargs: calls.append(kwargs))
+    monkeypatch.setattr(obs_logging, "_logging_configured", False)
+    monkeypatch.setattr(obs_logging, "_info_enabled", True)
+    monkeypatch.setenv("LOG_LEVEL", "WARNING")
+
+    threads = [threading.Thread(target=obs_logging.configure_logging_once) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert obs_logging._info_enabled is False
@@ -24,3 +24,110 @@ def test_prometheus_metrics_endpoint_reports_request_counts():
     assert "app_http_requests_total" in body
     assert 'route="/hello"' in body
 
+
+
+def test_request_metrics_reuse_label_bound_children():
+    from app.observability import metrics
+
+    metrics._request_counter.cache_clear()
+    app = FastAPI()
+
+    @app.get("/cached")
+    def cached():
+        return {}
+
+    setup_observability(app)
+    client = TestClient(app)
+    for _ in range(3):
+        client.get("/cached")
+
+    info = metrics._request_counter.cache_info()
+    assert info.misses == 1
+    assert info.hits == 2
+    assert metrics._request_counter("GET", "/cached", 200) is metrics.REQUEST_COUNTER.labels("GET", "/cached", "200")
+    assert metrics.REQUEST_COUNTER.labels("GET", "/cached", "200")._value.get() == 3
+
+
+def test_safe_route_memoizes_matched_route_on_scope():
+    from types import SimpleNamespace
+
+    from starlette.requests import Request
+
+    from app.observability.metrics import _safe_route
+
+    scope = {"type": "http", "path": "/graphs/7", "method": "GET", "headers": []}
+    request = Request(scope)
+    assert _safe_route(request) == "/graphs/7"
+    assert "_resolved_route" not in scope
+
+    scope["route"] = SimpleNamespace(path="/graphs/{graph_id}")
+    assert _safe_route(request) == "/graphs/{graph_id}"
+    scope["route"] = None
+    assert _safe_route(request) == "/graphs/{graph_id}"
+
+
+def test_prometheus_endpoint_negotiates_gzip_and_openmetrics():
+    import asyncio
+    import gzip
+
+    from starlette.requests import Request
+
+    from app.observability.metrics import prometheus_endpoint
+
+    def scrape(headers):
+        scope = {
+            "type": "http",
+            "path": "/metrics/prometheus",
+            "method": "GET",
+            "headers": [(key.encode(), value.encode()) for key, value in headers.items()],
+        }
+        return asyncio.run(prometheus_endpoint(Request(scope)))
+
+    compressed = scrape({"accept-encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert b"app_http_requests_total" in gzip.decompress(compressed.body)
+
+    plain = scrape({})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["content-type"].startswith("text/plain")
+
+    openmetrics = scrape({"accept": "application/openmetrics-text; version=1.0.0"})
+    assert openmetrics.headers["content-type"].startswith("application/openmetrics-text")
+    assert openmetrics.body.rstrip().endswith(b"# EOF")
+
+
+def test_configured_apps_are_tracked_weakly():
+    import gc
+    import weakref
+
+    from app import observability
+    from app.observability import metrics
+
+    app = FastAPI()
+    setup_observability(app)
+    assert app in observability._configured_apps
+    assert app in metrics._configured_apps
+
+    app_ref = weakref.ref(app)
+    del app
+    gc.collect()
+    assert app_ref() is None
+    assert all(tracked is not None for tracked in metrics._configured_apps)
+
+
+def test_record_run_outcome_only_adds_positive_costs():
+    from app.observability import metrics
+
+    def cost(status):
+        return metrics.RUN_COST_USD.labels(status=status)._value.get()
+
+    def outcomes(status):
+        return metrics.RUN_OUTCOME_COUNTER.labels(status=status)._value.get()
+
+    metrics.record_run_outcome(status="test-costs", cost_usd=1.5)
+    metrics.record_run_outcome(status="test-costs", cost_usd=0.0)
+    metrics.record_run_outcome(status="test-costs", cost_usd=None)
+    metrics.record_run_outcome(status="test-costs", cost_usd=-2.0)
+
+    assert outcomes("test-costs") == 4
+    assert cost("test-costs") == 1.5
@@ -24,3 +24,42 @@ def test_tracing_records_spans_for_requests():
     assert spans, "expected at least one span to be exported"
     assert any("/hello" in span.name for span in spans)
 
+
+
+def test_span_processor_batches_real_exporters():
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        ConsoleSpanExporter,
+        SimpleSpanProcessor,
+    )
+
+    from app.observability import tracing
+
+    assert isinstance(tracing._span_processor(InMemorySpanExporter()), SimpleSpanProcessor)
+    processor = tracing._span_processor(ConsoleSpanExporter())
+    try:
+        assert isinstance(processor, BatchSpanProcessor)
+    finally:
+        processor.shutdown()
+
+
+def test_reconfiguring_with_same_exporter_exports_each_span_once():
+    from app.observability.tracing import configure_tracing
+
+    exporter = InMemorySpanExporter()
+    app = FastAPI()
+
+    @app.get("/once")
+    def once():
+        return {"ok": True}
+
+    configure_tracing(app, exporter=exporter)
+    configure_tracing(app, exporter=exporter)
+
+    client = TestClient(app)
+    exporter.clear()
+    client.get("/once")
+
+    span_ids = [span.context.span_id for span in exporter.get_finished_spans()]
+    assert span_ids
+    assert len(span_ids) == len(set(span_ids))
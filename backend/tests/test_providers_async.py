@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import openai
+
+from app.providers import MockProvider, OpenAIProvider, OllamaProvider, ProviderConfig
+from app.utils.http_client import close_async_clients
+
+
+def test_mock_provider_async_calls_overlap():
+    provider = MockProvider(ProviderConfig(name="mock", extra={"latency_ms": 100}))
+
+    async def scenario():
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(provider.execute_async("planner", {}, {"idx": idx}) for idx in range(20))
+        )
+        return results, time.perf_counter() - start
+
+    results, elapsed = asyncio.run(scenario())
+    assert len(results) == 20
+    assert all(result["_mock"] for result in results)
+    assert elapsed < 1.0
+
+
+def test_openai_async_client_is_built_once_on_the_shared_pool(monkeypatch):
+    created = []
+
+    class FakeCompletions:
+        async def create(self, **request):
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=f"echo {request['model']}"))],
+                usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5),
+            )
+
+    class FakeAsyncOpenAI:
+        def __init__(self, **kwargs):
+            created.append(kwargs)
+            self.chat = SimpleNamespace(completions=FakeCompletions())
+
+    monkeypatch.setattr(openai, "AsyncOpenAI", FakeAsyncOpenAI)
+    provider = OpenAIProvider(ProviderConfig(name="openai", api_key="sk-test"))
+
+    async def scenario():
+        try:
+            return await asyncio.gather(
+                *(provider.execute_async("planner", {"model": "gpt-4o"}, {"idx": idx}) for idx in range(3))
+            )
+        finally:
+            await close_async_clients()
+
+    results = asyncio.run(scenario())
+    assert [result["response"] for result in results] == ["echo gpt-4o"] * 3
+    assert results[0]["_cost_usd"] == provider.estimate_cost(10, 5, "gpt-4o")
+    assert len(created) == 1
+    assert created[0]["http_client"].__class__.__name__ == "AsyncClient"
+
+
+def test_ollama_async_falls_back_when_unreachable():
+    provider = OllamaProvider(ProviderConfig(name="ollama", base_url="http://127.0.0.1:9", timeout=1))
+
+    async def scenario():
+        try:
+            return await provider.execute_async("planner", {}, {})
+        finally:
+            await close_async_clients()
+
+    result = asyncio.run(scenario())
+    assert result["_mock"] is True
+    assert result["_provider"] == "ollama"
+
+
+def test_concurrency_limit_caps_in_flight_calls():
+    from app.providers import GoogleGeminiProvider
+
+    in_flight = []
+    peak = []
+
+    class SlowProvider(GoogleGeminiProvider):
+        def execute(self, agent_type, agent_config, input_data):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            time.sleep(0.02)
+            in_flight.pop()
+            return {"response": "ok"}
+
+    provider = SlowProvider(ProviderConfig(name="google", api_key="key", extra={"concurrency_limit": 2}))
+
+    async def scenario():
+        return await asyncio.gather(*(provider.execute_async("planner", {}, {}) for _ in range(6)))
+
+    assert len(asyncio.run(scenario())) == 6
+    assert max(peak) <= 2
+
+
+def test_mock_token_estimate_handles_arbitrary_inputs():
+    provider = MockProvider(ProviderConfig(name="mock", extra={"latency_ms": 0}))
+
+    result = provider.execute("planner", {}, {"prompt": "x" * 400, "tags": {"a", "b"}})
+
+    assert 100 <= result["_tokens_in"] <= 110
+
+
+def test_openai_stream_yields_content_deltas(monkeypatch):
+    chunks = ["Hel", None, "lo"]
+
+    class FakeStream:
+        def __init__(self):
+            self._chunks = iter(chunks)
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            try:
+                content = next(self._chunks)
+            except StopIteration:
+                raise StopAsyncIteration
+            return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+    class FakeCompletions:
+        async def create(self, **request):
+            assert request["stream"] is True
+            return FakeStream()
+
+    class FakeAsyncOpenAI:
+        def __init__(self, **kwargs):
+            self.chat = SimpleNamespace(completions=FakeCompletions())
+
+    monkeypatch.setattr(openai, "AsyncOpenAI", FakeAsyncOpenAI)
+    provider = OpenAIProvider(ProviderConfig(name="openai", api_key="sk-test"))
+
+    async def scenario():
+        try:
+            return [text async for text in provider.execute_stream("planner", {}, {"q": 1})]
+        finally:
+            await close_async_clients()
+
+    assert asyncio.run(scenario()) == ["Hel", "lo"]
+
+
+def test_ollama_stream_reads_ndjson_lines(monkeypatch):
+    import httpx
+
+    from app import providers
+
+    body = b'{"response":"a","done":false}\n\n{"response":"b","done":false}\n{"response":"","done":true}\n'
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+    monkeypatch.setattr(providers, "_provider_http_client", lambda: httpx.AsyncClient(transport=transport))
+    provider = OllamaProvider(ProviderConfig(name="ollama"))
+
+    async def scenario():
+        return [text async for text in provider.execute_stream("planner", {}, {})]
+
+    assert asyncio.run(scenario()) == ["a", "b"]
+
+
+def test_default_stream_yields_whole_response():
+    provider = MockProvider(ProviderConfig(name="mock", extra={"latency_ms": 0, "responses": {"planner": "done"}}))
+
+    async def scenario():
+        return [text async for text in provider.execute_stream("planner", {}, {})]
+
+    assert asyncio.run(scenario()) == ["done"]
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.providers import MockProvider, ProviderConfig
+from app.providers.batching import RequestBatcher
+
+
+class RecordingProvider(MockProvider):
+    def __init__(self):
+        super().__init__(ProviderConfig(name="mock", extra={"latency_ms": 0}))
+        self.batches = []
+
+    async def execute_batch(self, requests):
+        self.batches.append([request[1].get("model") for request in requests])
+        return await super().execute_batch(requests)
+
+
+def test_concurrent_requests_are_grouped_by_model():
+    provider = RecordingProvider()
+    batcher = RequestBatcher(batch_interval=0.05, max_batch_size=32)
+
+    async def scenario():
+        try:
+            return await asyncio.gather(
+                *(
+                    batcher.submit(provider, "planner", {"model": "a" if idx % 2 else "b"}, {"idx": idx})
+                    for idx in range(6)
+                )
+            )
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(scenario())
+
+    assert len(results) == 6
+    assert all(result["_mock"] for result in results)
+    assert sorted(sorted(batch) for batch in provider.batches) == [["a", "a", "a"], ["b", "b", "b"]]
+
+
+def test_batch_size_caps_a_flush():
+    provider = RecordingProvider()
+    batcher = RequestBatcher(batch_interval=1.0, max_batch_size=2)
+
+    async def scenario():
+        try:
+            await asyncio.gather(*(batcher.submit(provider, "planner", {}, {"idx": idx}) for idx in range(4)))
+        finally:
+            await batcher.stop()
+
+    asyncio.run(asyncio.wait_for(scenario(), timeout=0.5))
+
+    assert [len(batch) for batch in provider.batches] == [2, 2]
+
+
+def test_provider_failure_is_raised_to_the_caller():
+    class FailingProvider(MockProvider):
+        async def execute_async(self, agent_type, agent_config, input_data):
+            raise RuntimeError("boom")
+
+    provider = FailingProvider(ProviderConfig(name="mock"))
+    batcher = RequestBatcher(batch_interval=0.01)
+
+    async def scenario():
+        try:
+            await batcher.submit(provider, "planner", {}, {})
+        finally:
+            await batcher.stop()
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(scenario())
@@ -0,0 +1,107 @@
+import time
+
+import pytest
+
+from app.providers import cache
+
+
+class CountingProvider:
+    name = "counting"
+
+    def __init__(self, result=None):
+        self.calls = 0
+        self.result = result or {"text": "hello", "_tokens_in": 10, "_tokens_out": 5, "_cost_usd": 0.01}
+
+    def execute(self, agent_type, agent_config, input_data):
+        self.calls += 1
+        return dict(self.result)
+
+    async def execute_async(self, agent_type, agent_config, input_data):
+        return self.execute(agent_type, agent_config, input_data)
+
+
+@pytest.fixture
+def enabled_cache(monkeypatch):
+    monkeypatch.setattr(cache, "PROVIDER_CACHE_ENABLED", True)
+    fresh = cache.ResponseCache(ttl_seconds=60, max_entries=8, shared=False)
+    monkeypatch.setattr(cache, "response_cache", fresh)
+    return fresh
+
+
+def test_repeated_request_is_served_from_cache(enabled_cache):
+    provider = CountingProvider()
+    config = {"model": "gpt-4", "temperature": 0.0}
+
+    first = cache.cached_execute(provider, "chat", config, {"prompt": "hi"})
+    second = cache.cached_execute(provider, "chat", config, {"prompt": "hi"})
+
+    assert provider.calls == 1
+    assert "_cached" not in first
+    assert second["_cached"] is True
+    assert second["_cost_usd"] == 0.0
+    assert second["text"] == "hello"
+
+
+def test_high_temperature_and_config_changes_bypass_cache(enabled_cache):
+    provider = CountingProvider()
+
+    cache.cached_execute(provider, "chat", {"temperature": 0.9}, {"prompt": "hi"})
+    cache.cached_execute(provider, "chat", {"temperature": 0.9}, {"prompt": "hi"})
+    cache.cached_execute(provider, "chat", {"temperature": 0.1, "model": "a"}, {"prompt": "hi"})
+    cache.cached_execute(provider, "chat", {"temperature": 0.1, "model": "b"}, {"prompt": "hi"})
+
+    assert provider.calls == 4
+
+
+def test_error_results_are_not_cached(enabled_cache):
+    provider = CountingProvider(result={"error": "rate limited"})
+    config = {"temperature": 0.0}
+
+    cache.cached_execute(provider, "chat", config, {"prompt": "hi"})
+    cache.cached_execute(provider, "chat", config, {"prompt": "hi"})
+
+    assert provider.calls == 2
+
+
+def test_disabled_cache_always_calls_provider(monkeypatch):
+    monkeypatch.setattr(cache, "PROVIDER_CACHE_ENABLED", False)
+    provider = CountingProvider()
+
+    cache.cached_execute(provider, "chat", {"temperature": 0.0}, {"prompt": "hi"})
+    cache.cached_execute(provider, "chat", {"temperature": 0.0}, {"prompt": "hi"})
+
+    assert provider.calls == 2
+
+
+def test_response_cache_expires_and_evicts(monkeypatch):
+    store = cache.ResponseCache(ttl_seconds=10, max_entries=2, shared=False)
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+
+    store.set(b"a", {"v": 1})
+    store.set(b"b", {"v": 2})
+    assert store.get(b"a") == {"v": 1}
+    store.set(b"c", {"v": 3})
+
+    assert store.get(b"b") is None
+    assert store.get(b"a") == {"v": 1}
+
+    now[0] += 11
+    assert store.get(b"a") is None
+
+
+def test_multi_endpoint_identity_includes_endpoint_models():
+    from app.providers import configure_providers
+
+    def pool(model):
+        return {
+            "type": "ollama",
+            "default_model": model,
+            "endpoints": [{"base_url": "http://a:11434"}, {"base_url": "http://b:11434"}],
+        }
+
+    registry = configure_providers({"providers": {"small": pool("llama3:8b"), "large": pool("llama3:70b")}})
+    small = cache._provider_identity(registry.get_provider("small"))
+    large = cache._provider_identity(registry.get_provider("large"))
+    assert small != large
+    assert "llama3:70b" in large and "http://b:11434" in large
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from app import providers
+from app.providers import AnthropicProvider, OpenAIProvider, ProviderConfig
+
+
+def test_openai_sync_client_is_reused_across_calls(monkeypatch):
+    created = []
+
+    class FakeOpenAI:
+        def __init__(self, **kwargs):
+            created.append(kwargs)
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+        def _create(self, **request):
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content="ok"))],
+                usage=SimpleNamespace(prompt_tokens=3, completion_tokens=2),
+            )
+
+    monkeypatch.setattr(providers.openai, "OpenAI", FakeOpenAI)
+    provider = OpenAIProvider(ProviderConfig(name="openai", api_key="sk-test"))
+
+    results = [provider.execute("planner", {}, {"idx": idx}) for idx in range(3)]
+
+    assert [result["response"] for result in results] == ["ok"] * 3
+    assert created == [{"api_key": "sk-test", "base_url": "https://api.openai.com/v1", "max_retries": 3}]
+
+
+def test_missing_sdk_falls_back_to_mock(monkeypatch):
+    monkeypatch.setattr(providers, "anthropic", None)
+    provider = AnthropicProvider(ProviderConfig(name="anthropic", api_key="key"))
+
+    result = provider.execute("planner", {}, {"q": "hi"})
+
+    assert result["_mock"] is True
+    assert result["_provider"] == "anthropic"
+
+
+def test_prompt_payload_is_serialized_with_sorted_keys():
+    provider = OpenAIProvider(ProviderConfig(name="openai", api_key="sk-test"))
+
+    first = provider._chat_request("planner", {}, {"b": 1, "a": {"d": 2, "c": 3}})
+    second = provider._chat_request("planner", {}, {"a": {"c": 3, "d": 2}, "b": 1})
+
+    assert first["messages"][1]["content"] == '{"a":{"c":3,"d":2},"b":1}'
+    assert first == second
+
+
+def test_estimate_cost_uses_per_token_rates():
+    openai_provider = OpenAIProvider(ProviderConfig(name="openai", api_key="sk-test"))
+    anthropic_provider = AnthropicProvider(ProviderConfig(name="anthropic", api_key="key"))
+
+    assert openai_provider.estimate_cost(1000, 1000, "gpt-4") == pytest.approx(0.09)
+    assert openai_provider.estimate_cost(1000, 1000, "unknown") == pytest.approx(0.003)
+    assert anthropic_provider.estimate_cost(2000, 1000, "claude-3-opus-20240229") == pytest.approx(0.105)
+    assert anthropic_provider.estimate_cost(1000, 1000, "unknown") == pytest.approx(0.006)
+
+
+def test_ollama_reuses_one_keepalive_session(monkeypatch):
+    import requests
+
+    from app.providers import OllamaProvider
+
+    posted = []
+
+    def fake_post(session, url, json, timeout):
+        posted.append(session)
+        return SimpleNamespace(
+            json=lambda: {"response": "hi", "prompt_eval_count": 4, "eval_count": 2},
+            raise_for_status=lambda: None,
+        )
+
+    monkeypatch.setattr(requests.Session, "post", fake_post)
+    provider = OllamaProvider(ProviderConfig(name="ollama"))
+
+    results = [provider.execute("planner", {}, {"idx": idx}) for idx in range(3)]
+
+    assert [result["response"] for result in results] == ["hi"] * 3
+    assert len(set(map(id, posted))) == 1
+    assert provider._session.get_adapter("http://localhost:11434")._pool_maxsize == 50
+
+
+def test_system_prompt_defaults_per_agent_type():
+    provider = OpenAIProvider(ProviderConfig(name="openai", api_key="sk-test"))
+
+    default = provider._chat_request("planner", {}, {})["messages"][0]["content"]
+    custom = provider._chat_request("planner", {"system_prompt": ""}, {})["messages"][0]["content"]
+
+    assert default == "You are a planner agent."
+    assert default is provider._chat_request("planner", {}, {})["messages"][0]["content"]
+    assert custom == ""
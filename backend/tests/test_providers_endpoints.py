@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.providers import MultiEndpointProvider, OllamaProvider, configure_providers
+
+
+def _registry(monkeypatch, failing=()):
+    calls = []
+
+    def fake_execute(self, agent_type, agent_config, input_data):
+        calls.append(self.base_url)
+        if self.base_url in failing:
+            return {"response": "[MOCK]", "_error": "connection refused", "_mock": True}
+        return {"response": f"from {self.base_url}"}
+
+    async def fake_execute_async(self, agent_type, agent_config, input_data):
+        return fake_execute(self, agent_type, agent_config, input_data)
+
+    monkeypatch.setattr(OllamaProvider, "execute", fake_execute)
+    monkeypatch.setattr(OllamaProvider, "execute_async", fake_execute_async)
+    registry = configure_providers(
+        {
+            "providers": {
+                "local": {
+                    "type": "ollama",
+                    "endpoints": [
+                        {"base_url": "http://a:11434"},
+                        {"base_url": "http://b:11434", "concurrency_limit": 4},
+                    ],
+                }
+            }
+        }
+    )
+    return registry.get_provider("local"), calls
+
+
+def test_configure_providers_builds_multi_endpoint_pool(monkeypatch):
+    provider, _ = _registry(monkeypatch)
+
+    assert isinstance(provider, MultiEndpointProvider)
+    assert [endpoint.base_url for endpoint in provider.endpoints] == ["http://a:11434", "http://b:11434"]
+    assert provider._limits[1] == 4
+
+
+def test_failed_endpoint_fails_over_to_next(monkeypatch):
+    provider, calls = _registry(monkeypatch, failing={"http://a:11434"})
+    provider.latency_ewma = [0.0, 1.0]
+
+    result = provider.execute("planner", {}, {})
+
+    assert result["response"] == "from http://b:11434"
+    assert calls == ["http://a:11434", "http://b:11434"]
+    assert provider.inflight == [0, 0]
+
+
+def test_least_loaded_endpoint_is_preferred(monkeypatch):
+    provider, calls = _registry(monkeypatch)
+    provider.inflight = [3, 0]
+
+    asyncio.run(provider.execute_async("planner", {}, {}))
+
+    assert calls == ["http://b:11434"]
+    assert provider.inflight == [3, 0]
+    assert provider.latency_ewma[1] > 0
+
+
+def test_multi_endpoint_cost_estimates_use_endpoint_pricing():
+    registry = configure_providers(
+        {
+            "providers": {
+                "pool": {
+                    "type": "openai",
+                    "api_key": "sk-test",
+                    "endpoints": [{"base_url": "https://a.example/v1"}, {"base_url": "https://b.example/v1"}],
+                }
+            }
+        }
+    )
+    provider = registry.get_provider("pool")
+    single = provider.estimate_cost(1000, 1000, "gpt-4")
+    assert single > 0
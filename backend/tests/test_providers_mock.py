@@ -24,3 +24,30 @@ def test_configure_providers_with_mock_strategy():
     assert provider.__class__.__name__ == "MockProvider"
     assert registry.strategy == "mock"
 
+
+
+def test_registry_provider_types_are_case_insensitive_and_read_only():
+    import pytest
+
+    registry = ProviderRegistry()
+
+    assert registry.register("main", ProviderConfig(name="Mock")).__class__.__name__ == "MockProvider"
+    with pytest.raises(ValueError, match="Unknown provider type: bogus"):
+        registry.register("other", ProviderConfig(name="bogus"))
+    with pytest.raises(TypeError):
+        ProviderRegistry.PROVIDER_CLASSES["bogus"] = object
+
+
+def test_configure_providers_forwards_rate_limit_to_bucket():
+    registry = configure_providers(
+        {
+            "providers": {
+                "limited": {"type": "gemini", "api_key": "key", "rate_limit_rpm": 600},
+                "unlimited": {"type": "gemini", "api_key": "key"},
+            }
+        }
+    )
+    limited = registry.get_provider("limited")
+    assert limited.config.rate_limit_rpm == 600
+    assert limited._bucket.refill_rate_per_s == 10
+    assert not registry.get_provider("unlimited")._bucket.enabled
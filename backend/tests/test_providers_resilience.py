@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from app.providers import GoogleGeminiProvider, ProviderConfig
+from app.providers import resilience
+from app.providers.resilience import CircuitBreaker, CircuitOpenError, is_transient_error
+
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://llm/api")
+    return httpx.HTTPStatusError("failed", request=request, response=httpx.Response(status, request=request))
+
+
+def test_transient_error_classification():
+    assert is_transient_error(httpx.ConnectError("refused"))
+    assert is_transient_error(_status_error(429))
+    assert is_transient_error(_status_error(503))
+    assert not is_transient_error(_status_error(400))
+    assert not is_transient_error(_status_error(401))
+    assert not is_transient_error(ValueError("bad input"))
+
+
+def test_circuit_opens_on_failure_rate_and_recovers_after_probe(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=0.5, window_seconds=60, cooldown_seconds=30, min_calls=4)
+
+    for success in (True, False, True, False):
+        breaker.record(success)
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    now[0] += 31
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record(True)
+
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_call_api_retries_transient_errors_only(monkeypatch):
+    monkeypatch.setattr(resilience.random, "uniform", lambda low, high: 0.0)
+    provider = GoogleGeminiProvider(ProviderConfig(name="google", api_key="key"))
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise httpx.ReadTimeout("slow")
+        return "ok"
+
+    assert provider._call_api(flaky, retries=3) == "ok"
+    assert len(attempts) == 3
+
+    def rejected():
+        attempts.append(1)
+        raise _status_error(400)
+
+    attempts.clear()
+    with pytest.raises(httpx.HTTPStatusError):
+        provider._call_api(rejected, retries=3)
+    assert len(attempts) == 1
+
+
+def test_open_circuit_fails_fast_without_calling_out():
+    provider = GoogleGeminiProvider(
+        ProviderConfig(name="google", api_key="key", extra={"circuit_breaker": {"min_calls": 2}})
+    )
+    calls = []
+
+    def outage():
+        calls.append(1)
+        raise httpx.ConnectError("down")
+
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            provider._call_api(outage)
+
+    with pytest.raises(CircuitOpenError):
+        provider._call_api(outage)
+    assert len(calls) == 2
+
+
+def test_cancelled_probe_releases_half_open_circuit(monkeypatch):
+    import asyncio
+
+    now = [0.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    provider = GoogleGeminiProvider(
+        ProviderConfig(name="google", api_key="key", extra={"circuit_breaker": {"min_calls": 1}})
+    )
+    provider._breaker.record(False)
+    assert provider._breaker.state == "open"
+    now[0] += 31
+
+    async def hanging():
+        await asyncio.sleep(3600)
+
+    async def scenario():
+        probe = asyncio.create_task(provider._acall_api(hanging))
+        await asyncio.sleep(0)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+    asyncio.run(scenario())
+    # The abandoned probe counts as a failure: the circuit re-opens, then probes again.
+    assert provider._breaker.state == "open"
+    now[0] += 31
+    assert provider._breaker.allow()
+
+
+def test_abandoned_call_is_ignored_while_closed():
+    breaker = CircuitBreaker(min_calls=1)
+    breaker.abandon()
+    assert breaker.state == "closed"
+    assert breaker.allow()
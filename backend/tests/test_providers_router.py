@@ -93,3 +93,16 @@ def test_graph_runner_integration_with_router(monkeypatch):
     assert dummy.called
     assert output["response"] == "ok"
 
+
+
+def test_provider_router_picks_up_dynamic_registrations():
+    registry = build_registry()
+    router = ProviderRouter(registry, {"per_region": {"EU": ["", "backup"]}})
+
+    assert router.resolve(node_config={"region": "eu"}) == "backup"
+
+    router.register_region("ap", ["azure"])
+    router.register_fallback("backup")
+
+    assert router.resolve(node_config={"region": "AP"}) == "azure"
+    assert router.resolve(node_config={"region": "unknown"}) == "backup"
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 import pytest
@@ -35,7 +36,7 @@ def test_release_gate_passes_within_thresholds(tmp_path: Path, monkeypatch):
 
     decision = evaluate_release(metrics, slos=load_default_slos())
     assert decision.approved
-    assert decision.reasons == []
+    assert decision.reasons == ()
     gate_release(metrics, slos=load_default_slos())
 
 
@@ -92,3 +93,62 @@ def test_load_default_slos_from_repo(tmp_path: Path, monkeypatch):
     assert len(slos) == 1
     assert slos[0].name == "custom"
 
+
+
+def test_load_default_slos_caches_until_file_changes(tmp_path: Path, monkeypatch):
+    slo_path = tmp_path / "slos.yaml"
+    slo_path.write_text(yaml.dump({"slos": [{"name": "first"}]}))
+    calls = []
+    original_load = yaml.load
+    monkeypatch.setattr(yaml, "load", lambda text, Loader: calls.append(text) or original_load(text, Loader=Loader))
+
+    assert [slo.name for slo in load_default_slos(slo_path)] == ["first"]
+    assert [slo.name for slo in load_default_slos(slo_path)] == ["first"]
+    assert len(calls) == 1
+
+    slo_path.write_text(yaml.dump({"slos": [{"name": "second"}]}))
+    os.utime(slo_path, ns=(0, slo_path.stat().st_mtime_ns + 1_000_000))
+
+    assert [slo.name for slo in load_default_slos(slo_path)] == ["second"]
+    assert len(calls) == 2
+
+
+def test_default_slo_path_is_resolved_once():
+    from app.reliability import slo
+
+    slo._default_slo_path.cache_clear()
+    first = slo._default_slo_path()
+
+    assert slo._default_slo_path() is first
+    assert slo._default_slo_path.cache_info().hits == 1
+
+
+def test_error_budget_batch_and_rolling_evaluation():
+    from app.reliability.slo import ErrorBudget
+
+    budget = ErrorBudget(target=0.9, window_days=1)
+
+    assert budget.exhausted_batch([0.95, 0.89, 0.9]).tolist() == [False, True, False]
+    flags = budget.rolling_exhausted([10, 7, 10, 0, 10], [10, 10, 10, 0, 10], window=2)
+    assert flags.tolist() == [True, True, False, False]
+    assert budget.rolling_exhausted([1], [1], window=5).size == 0
+
+
+def test_evaluate_release_short_circuits_and_caches_decisions():
+    from app.reliability.slo import ErrorBudget, SLOConfig
+
+    slos = [SLOConfig("default", 800, 1200, ErrorBudget(target=0.99, window_days=30))]
+    metrics = ReleaseMetrics(
+        latency_p95_ms=2000,
+        latency_p99_ms=3000,
+        success_rate=0.5,
+        active_incidents=2,
+        regression_tests_passed=False,
+    )
+
+    fast = evaluate_release(metrics, slos=slos, include_all_reasons=False)
+    full = evaluate_release(metrics, slos=slos)
+
+    assert fast.reasons == ("Active incidents present",)
+    assert len(full.reasons) == 5
+    assert evaluate_release(metrics, slos=list(slos)) is full
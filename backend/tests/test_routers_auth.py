@@ -0,0 +1,157 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.auth import UNUSABLE_PASSWORD_HASH, Role, hash_password
+from app.models_enhanced import User as UserTable
+from app.routers import auth as auth_router
+
+
+@pytest.fixture
+def users_db(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    UserTable.create(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(auth_router, "SessionLocal", factory)
+    with engine.begin() as conn:
+        conn.execute(
+            UserTable.insert(),
+            [
+                {"email": "active@example.com", "password_hash": hash_password("s3cret"), "name": "Active",
+                 "role": "admin", "is_active": True},
+                {"email": "disabled@example.com", "password_hash": hash_password("s3cret"), "name": "Disabled",
+                 "role": "viewer", "is_active": False},
+            ],
+        )
+    return engine
+
+
+def _last_login(engine, email):
+    with engine.connect() as conn:
+        return conn.execute(UserTable.select().where(UserTable.c.email == email)).fetchone().last_login
+
+
+def test_login_stamps_last_login_and_returns_user(users_db):
+    request = auth_router.LoginRequest(email="active@example.com", password="s3cret")
+    response = asyncio.run(auth_router.login(request, None))
+    assert response.user["email"] == "active@example.com"
+    assert response.user["tenant_id"] == "default"
+    assert _last_login(users_db, "active@example.com") is not None
+
+
+@pytest.mark.parametrize(
+    "email,password,status",
+    [
+        ("missing@example.com", "s3cret", 401),
+        ("active@example.com", "wrong", 401),
+        ("disabled@example.com", "s3cret", 403),
+    ],
+)
+def test_failed_login_leaves_last_login_untouched(users_db, email, password, status):
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(auth_router.login(auth_router.LoginRequest(email=email, password=password), None))
+    assert exc.value.status_code == status
+    if email != "missing@example.com":
+        assert _last_login(users_db, email) is None
+
+
+def test_change_password_runs_off_loop_and_propagates_errors(users_db):
+    with users_db.connect() as conn:
+        user_id = conn.execute(UserTable.select().where(UserTable.c.email == "active@example.com")).fetchone().id
+    user = type("U", (), {"id": user_id})()
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(auth_router.change_password(auth_router.ChangePasswordRequest(
+            current_password="wrong", new_password="n3w"), user))
+    assert exc.value.status_code == 400
+
+    asyncio.run(auth_router.change_password(auth_router.ChangePasswordRequest(
+        current_password="s3cret", new_password="n3w"), user))
+    response = asyncio.run(auth_router.login(auth_router.LoginRequest(email="active@example.com", password="n3w"), None))
+    assert response.user["id"] == user_id
+
+
+def test_api_key_statements_set_and_clear_key(users_db):
+    factory = auth_router.SessionLocal
+    with users_db.connect() as conn:
+        user_id = conn.execute(UserTable.select().where(UserTable.c.email == "active@example.com")).fetchone().id
+
+    with factory() as db:
+        auth_router._set_api_key(db, user_id, "hash-1")
+        assert auth_router._fetch_user_by_id(db, user_id).api_key == "hash-1"
+        auth_router._set_api_key(db, user_id, None)
+        assert auth_router._fetch_user_by_id(db, user_id).api_key is None
+        assert [row.email for row in auth_router._list_tenant_users(db, "default")] == [
+            "active@example.com",
+            "disabled@example.com",
+        ]
+
+
+def test_new_oidc_user_gets_unusable_password_without_hashing(users_db, monkeypatch):
+    def _fail(*args, **kwargs):
+        raise AssertionError("OIDC users should not get a hashed placeholder password")
+
+    monkeypatch.setattr(auth_router, "hash_password", _fail)
+    with auth_router.SessionLocal() as db:
+        user_id = auth_router._upsert_oidc_user(db, "sso@example.com", "SSO", Role.VIEWER, "default")
+        row = db.execute(UserTable.select().where(UserTable.c.email == "sso@example.com")).fetchone()
+        assert auth_router._upsert_oidc_user(db, "sso@example.com", "SSO", Role.ADMIN, "default") == user_id
+    assert row.id == user_id
+    assert row.password_hash == UNUSABLE_PASSWORD_HASH
+    assert row.last_login is not None
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(auth_router.login(auth_router.LoginRequest(email="sso@example.com", password="!"), None))
+    assert exc.value.status_code == 401
+
+
+def test_create_user_rejects_taken_email_in_one_insert(users_db, monkeypatch):
+    monkeypatch.setattr(auth_router, "hash_password", lambda password: "hashed")
+    request = auth_router.RegisterRequest(email="new@example.com", password="pw", name="New")
+    with auth_router.SessionLocal() as db:
+        user_id = auth_router._create_user(db, request, "default")
+        assert auth_router._fetch_user_by_id(db, user_id).email == "new@example.com"
+
+        with pytest.raises(HTTPException) as exc:
+            auth_router._create_user(db, request, "default")
+        assert exc.value.detail == "Email already registered"
+
+        bad_role = auth_router.RegisterRequest(email="other@example.com", password="pw", name="O", role="root")
+        with pytest.raises(HTTPException) as exc:
+            auth_router._create_user(db, bad_role, "default")
+        assert exc.value.detail == "Invalid role: root"
+
+
+def test_login_verifies_password_outside_a_transaction(users_db, monkeypatch):
+    seen = []
+    real_verify = auth_router.verify_password
+    real_factory = auth_router.SessionLocal
+
+    def factory():
+        db = real_factory()
+        seen.append(db)
+        return db
+
+    def verify(password, password_hash):
+        assert not seen[-1].in_transaction()
+        return real_verify(password, password_hash)
+
+    monkeypatch.setattr(auth_router, "SessionLocal", factory)
+    monkeypatch.setattr(auth_router, "verify_password", verify)
+    asyncio.run(auth_router.login(auth_router.LoginRequest(email="active@example.com", password="s3cret"), None))
+    assert _last_login(users_db, "active@example.com") is not None
+
+
+def test_duplicate_registration_skips_password_hashing(users_db, monkeypatch):
+    hashed = []
+    monkeypatch.setattr(auth_router, "hash_password", lambda password: hashed.append(password) or "hashed")
+    request = auth_router.RegisterRequest(email="active@example.com", password="pw", name="Dup")
+    with auth_router.SessionLocal() as db:
+        with pytest.raises(HTTPException) as exc:
+            auth_router._create_user(db, request, "default")
+    assert exc.value.detail == "Email already registered"
+    assert hashed == []
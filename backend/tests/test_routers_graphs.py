@@ -0,0 +1,11 @@
+from app.models_enhanced import content_hash
+from app.routers.graphs import _hash_content
+
+
+def test_graph_content_hash_is_canonical_blake3():
+    first = _hash_content({"nodes": [{"id": "a"}], "edges": []})
+    second = _hash_content({"edges": [], "nodes": [{"id": "a"}]})
+    assert first == second
+    assert len(first) == 32
+    assert first == content_hash(b'{"edges":[],"nodes":[{"id":"a"}]}')
+    assert _hash_content({"nodes": []}) != first
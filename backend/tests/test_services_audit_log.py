@@ -0,0 +1,294 @@
+import asyncio
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models import AuditLog, metadata
+from app.services.audit_log import AuditLogWriter, compute_event_hash
+
+
+def build_session_factory():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+        future=True,
+    )
+    metadata.create_all(engine)
+    return sessionmaker(bind=engine, expire_on_commit=False, future=True)
+
+
+def make_event(idx: int) -> dict:
+    return {
+        "user_id": 1,
+        "action": "create",
+        "resource_type": "graph",
+        "resource_id": idx,
+        "details": {"idx": idx},
+        "ip_address": None,
+        "user_agent": None,
+        "timestamp": f"2026-01-01T00:00:{idx:02d}+00:00",
+        "correlation_id": None,
+        "tenant_id": "default",
+        "retention_days": 30,
+    }
+
+
+def fetch_rows(session_factory):
+    with session_factory() as db:
+        return db.execute(select(AuditLog).order_by(AuditLog.c.id)).fetchall()
+
+
+def assert_chained(rows, events):
+    previous_hash = None
+    for row, event in zip(rows, events):
+        assert row.previous_hash == previous_hash
+        hashed = {k: v for k, v in event.items() if k != "retention_days"}
+        assert len(row.event_hash) == 32
+        assert row.event_hash == compute_event_hash({**hashed, "previous_hash": previous_hash})
+        assert row.retention_days == 30
+        previous_hash = row.event_hash
+
+
+def test_event_hash_chains_on_hex_so_legacy_text_chains_verify():
+    import hashlib
+
+    import orjson
+
+    previous = hashlib.sha256(b"head").digest()
+    payload = {"action": "create", "previous_hash": previous}
+    legacy = hashlib.sha256(
+        orjson.dumps({**payload, "previous_hash": previous.hex()}, option=orjson.OPT_SORT_KEYS)
+    ).digest()
+    assert compute_event_hash(payload) == legacy
+
+
+def test_inline_writes_chain_from_database_head():
+    session_factory = build_session_factory()
+    writer = AuditLogWriter(session_factory)
+    events = [make_event(idx) for idx in range(3)]
+
+    async def scenario():
+        for event in events:
+            await writer.submit(event)
+
+    asyncio.run(scenario())
+    rows = fetch_rows(session_factory)
+    assert len(rows) == 3
+    assert_chained(rows, events)
+
+
+def test_background_flusher_batches_and_drains_on_stop():
+    session_factory = build_session_factory()
+    writer = AuditLogWriter(session_factory, batch_size=2)
+    events = [make_event(idx) for idx in range(5)]
+
+    async def scenario():
+        await writer.start()
+        assert writer.running
+        for event in events:
+            await writer.submit(event)
+        await writer.stop()
+        assert not writer.running
+
+    asyncio.run(scenario())
+    rows = fetch_rows(session_factory)
+    assert [row.resource_id for row in rows] == list(range(5))
+    assert_chained(rows, events)
+
+
+def test_copy_path_is_skipped_for_non_psycopg_dialects(monkeypatch):
+    from app.services import audit_log
+
+    session_factory = build_session_factory()
+    monkeypatch.setattr(audit_log, "AUDIT_COPY_MIN_ROWS", 1)
+    with session_factory() as db:
+        assert audit_log._copy_rows(db, AuditLog, [make_event(0)]) is False
+
+    writer = AuditLogWriter(session_factory)
+    writer.write_batch([make_event(0), make_event(1)])
+    assert len(fetch_rows(session_factory)) == 2
+
+
+def test_copy_path_streams_rows_for_psycopg(monkeypatch):
+    from contextlib import contextmanager
+    from types import SimpleNamespace
+
+    from app.services import audit_log
+
+    captured = {"rows": []}
+
+    class FakeCopy:
+        def write_row(self, row):
+            captured["rows"].append(row)
+
+    class FakeCursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        @contextmanager
+        def copy(self, statement):
+            captured["statement"] = statement
+            yield FakeCopy()
+
+    fake_conn = SimpleNamespace(
+        dialect=SimpleNamespace(name="postgresql", driver="psycopg"),
+        connection=SimpleNamespace(driver_connection=SimpleNamespace(cursor=FakeCursor)),
+    )
+    db = SimpleNamespace(connection=lambda: fake_conn)
+    row = {**make_event(3), "previous_hash": None, "event_hash": "abc"}
+
+    assert audit_log._copy_rows(db, AuditLog, [row]) is True
+    assert captured["statement"].startswith("COPY audit_logs (user_id, action")
+    written = dict(zip(audit_log._COPY_COLUMNS, captured["rows"][0]))
+    assert written["details"] == '{"idx":3}'
+    assert written["event_hash"] == "abc"
+    assert written["created_at"] is not None
+
+
+def test_verify_audit_chain_reports_broken_links_in_range():
+    from datetime import datetime, timedelta
+
+    from sqlalchemy import update
+
+    from app.services.audit_log import verify_audit_chain
+
+    session_factory = build_session_factory()
+    writer = AuditLogWriter(session_factory)
+    writer.write_batch([{**make_event(idx), "tenant_id": "a" if idx % 2 else "b"} for idx in range(6)])
+
+    start = datetime.now() - timedelta(days=1)
+    end = datetime.now() + timedelta(days=1)
+    with session_factory() as db:
+        assert verify_audit_chain(db, start, end) == []
+        db.execute(update(AuditLog).where(AuditLog.c.id == 4).values(previous_hash=b"\x00" * 32))
+        db.commit()
+        assert verify_audit_chain(db, start, end) == [4]
+        assert verify_audit_chain(db, start, end, tenant_id="a") == [4]
+        assert verify_audit_chain(db, start, end, tenant_id="b") == []
+        # A range starting mid-chain still checks its first row against the one before it.
+        first_in_range = db.execute(select(AuditLog.c.created_at).where(AuditLog.c.id == 4)).scalar()
+        assert verify_audit_chain(db, first_in_range, end) == [4]
+
+
+def test_writers_in_separate_processes_extend_one_chain():
+    session_factory = build_session_factory()
+    first = AuditLogWriter(session_factory, batch_size=2)
+    second = AuditLogWriter(session_factory, batch_size=2)
+    events = [make_event(idx) for idx in range(4)]
+
+    async def scenario():
+        await first.start()
+        await first.submit(events[0])
+        await first._queue.join()
+        second.write_batch([events[1]])
+        await first.submit(events[2])
+        await first._queue.join()
+        second.write_batch([events[3]])
+        await first.stop()
+
+    asyncio.run(scenario())
+    rows = fetch_rows(session_factory)
+    assert len(rows) == 4
+    assert_chained(rows, events)
+
+
+def test_flusher_retries_transient_failures_instead_of_dropping(monkeypatch):
+    from app.services import audit_log
+
+    monkeypatch.setattr(audit_log, "AUDIT_RETRY_BASE_DELAY", 0.001)
+    session_factory = build_session_factory()
+    writer = AuditLogWriter(session_factory, batch_size=4)
+    real_write = writer.write_batch
+    failures = []
+
+    def flaky_write(batch):
+        if len(failures) < 2:
+            failures.append(len(batch))
+            raise OperationalError("INSERT", {}, Exception("database unavailable"))
+        real_write(batch)
+
+    monkeypatch.setattr(writer, "write_batch", flaky_write)
+    events = [make_event(idx) for idx in range(3)]
+
+    async def scenario():
+        await writer.start()
+        for event in events:
+            await writer.submit(event)
+        await writer.stop()
+
+    asyncio.run(scenario())
+    assert len(failures) == 2
+    rows = fetch_rows(session_factory)
+    assert [row.resource_id for row in rows] == list(range(3))
+    assert_chained(rows, events)
+
+
+def test_poison_event_is_dead_lettered_without_blocking_later_events(monkeypatch):
+    from app.services import audit_log
+
+    monkeypatch.setattr(audit_log, "AUDIT_RETRY_BASE_DELAY", 0.001)
+    session_factory = build_session_factory()
+    writer = AuditLogWriter(session_factory, batch_size=4)
+    poison = {**make_event(1), "details": {"handle": object()}}
+    events = [make_event(0), poison, make_event(2), make_event(3)]
+
+    async def scenario():
+        await writer.start()
+        for event in events:
+            await writer.submit(event)
+        await asyncio.wait_for(writer.stop(), timeout=5)
+
+    asyncio.run(scenario())
+    assert list(writer.dead_letters) == [poison]
+    rows = fetch_rows(session_factory)
+    written = [events[0], events[2], events[3]]
+    assert [row.resource_id for row in rows] == [0, 2, 3]
+    assert_chained(rows, written)
+
+
+def test_stop_gives_up_after_shutdown_timeout(monkeypatch):
+    from app.services import audit_log
+
+    monkeypatch.setattr(audit_log, "AUDIT_SHUTDOWN_TIMEOUT", 0.05)
+    writer = AuditLogWriter(build_session_factory())
+
+    async def stuck(batch):
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(writer, "_write_with_retry", stuck)
+
+    async def scenario():
+        await writer.start()
+        await writer.submit(make_event(0))
+        await asyncio.wait_for(writer.stop(), timeout=5)
+        assert not writer.running
+
+    asyncio.run(scenario())
+
+
+def test_verify_audit_log_chain_task_logs_broken_ids(monkeypatch):
+    from sqlalchemy import update
+
+    import app.database as database
+    from app.workers import tasks
+
+    session_factory = build_session_factory()
+    AuditLogWriter(session_factory).write_batch([make_event(idx) for idx in range(3)])
+    monkeypatch.setattr(database, "SessionLocal", session_factory)
+    errors = []
+    monkeypatch.setattr(tasks.logger, "error", lambda message, **kw: errors.append(kw))
+
+    assert tasks.verify_audit_log_chain() == {"checked_hours": 25, "broken": []}
+    assert errors == []
+
+    with session_factory() as db:
+        db.execute(update(AuditLog).where(AuditLog.c.id == 2).values(previous_hash=b"\x00" * 32))
+        db.commit()
+    assert tasks.verify_audit_log_chain()["broken"] == [2]
+    assert errors == [{"audit_log_ids": [2], "count": 1}]
@@ -0,0 +1,55 @@
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+from app.services import audit_partitions
+
+
+class FakeConnection:
+    def __init__(self, partitions=(), expiries=None):
+        self.partitions = list(partitions)
+        self.expiries = expiries or {}
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        if "FROM pg_inherits" in sql:
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: self.partitions))
+        if sql.startswith("SELECT max(created_at"):
+            name = sql.rsplit(" ", 1)[-1]
+            return SimpleNamespace(scalar=lambda: self.expiries.get(name))
+        return SimpleNamespace(first=lambda: None, scalar=lambda: None)
+
+
+def test_ensure_audit_partitions_creates_months_ahead_and_default():
+    conn = FakeConnection()
+    created = audit_partitions.ensure_audit_partitions(
+        conn, now=datetime(2025, 11, 15, tzinfo=UTC), months_ahead=2
+    )
+    assert created == ["audit_logs_202511", "audit_logs_202512", "audit_logs_202601"]
+    assert "FOR VALUES FROM ('2025-12-01') TO ('2026-01-01')" in conn.statements[1]
+    assert conn.statements[-1] == "CREATE TABLE IF NOT EXISTS audit_logs_default PARTITION OF audit_logs DEFAULT"
+
+
+def test_ensure_audit_partitions_backfills_from_oldest_row():
+    conn = FakeConnection()
+    created = audit_partitions.ensure_audit_partitions(
+        conn, now=datetime(2025, 2, 1, tzinfo=UTC), months_ahead=0, since=datetime(2024, 12, 20)
+    )
+    assert created == ["audit_logs_202412", "audit_logs_202501", "audit_logs_202502"]
+
+
+def test_drop_expired_audit_partitions_keeps_rows_still_in_retention():
+    now = datetime(2025, 6, 10, tzinfo=UTC)
+    conn = FakeConnection(
+        partitions=["audit_logs_202401", "audit_logs_202402", "audit_logs_202403", "audit_logs_202506"],
+        expiries={
+            "audit_logs_202401": datetime(2025, 1, 31),
+            "audit_logs_202402": datetime(2025, 7, 1),  # one row kept for longer
+            "audit_logs_202403": None,  # empty partition
+        },
+    )
+    dropped = audit_partitions.drop_expired_audit_partitions(conn, now=now)
+    assert dropped == ["audit_logs_202401", "audit_logs_202403"]
+    assert "DROP TABLE audit_logs_202402" not in conn.statements
+    assert not any("audit_logs_202506" in sql for sql in conn.statements if sql.startswith("DROP"))
@@ -29,3 +29,47 @@ def test_persist_trace_inserts_related_rows(monkeypatch):
     assert calls[3][1][0]["run_id"] == 42
 
     assert saved == [(42, "trace", trace)]
+
+
+def test_bulk_rows_are_streamed_with_copy_on_psycopg(monkeypatch):
+    from contextlib import contextmanager
+
+    from app.models import AgentOutput
+
+    captured = {"rows": []}
+
+    class FakeCopy:
+        def write_row(self, row):
+            captured["rows"].append(row)
+
+    class FakeCursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        @contextmanager
+        def copy(self, statement):
+            captured["statement"] = statement
+            yield FakeCopy()
+
+    class FakeConn:
+        dialect = SimpleNamespace(name="postgresql", driver="psycopg")
+        connection = SimpleNamespace(driver_connection=SimpleNamespace(cursor=FakeCursor))
+
+        def execute(self, statement, params=None):
+            raise AssertionError("rows should not go through INSERT")
+
+    monkeypatch.setattr(persistence, "PERSIST_COPY_MIN_ROWS", 2)
+    rows = [
+        {"run_id": 7, "node_id": f"n{idx}", "output_data": {"idx": idx}, "timestamp": "ignored"}
+        for idx in range(3)
+    ]
+    persistence._bulk_insert(FakeConn(), AgentOutput, rows)
+
+    assert captured["statement"] == "COPY agent_outputs (run_id, node_id, output_data, created_at) FROM STDIN"
+    assert len(captured["rows"]) == 3
+    run_id, node_id, output_data, created_at = captured["rows"][2]
+    assert (run_id, node_id, output_data) == (7, "n2", '{"idx":2}')
+    assert created_at is not None
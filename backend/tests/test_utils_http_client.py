@@ -0,0 +1,54 @@
+import asyncio
+
+import httpx
+
+from app.utils import http_client
+
+
+def test_get_async_client_reuses_client_within_loop():
+    async def scenario():
+        first = http_client.get_async_client("test", timeout=1.0)
+        second = http_client.get_async_client("test", timeout=1.0)
+        assert first is second
+        await http_client.close_async_clients()
+        assert first.is_closed
+        return first
+
+    closed = asyncio.run(scenario())
+
+    async def next_loop():
+        client = http_client.get_async_client("test")
+        await http_client.close_async_clients()
+        return client
+
+    assert asyncio.run(next_loop()) is not closed
+
+
+def test_replaced_client_is_closed_when_loop_changes():
+    async def first_loop():
+        return http_client.get_async_client("replaced")
+
+    stale = asyncio.run(first_loop())
+    assert not stale.is_closed
+
+    async def second_loop():
+        fresh = http_client.get_async_client("replaced")
+        await asyncio.sleep(0)
+        assert stale.is_closed
+        await http_client.close_async_clients()
+        return fresh
+
+    assert asyncio.run(second_loop()) is not stale
+
+
+def test_close_async_clients_leaves_other_loops_clients_registered():
+    other_loop = asyncio.new_event_loop()
+    foreign = httpx.AsyncClient()
+    http_client._clients["foreign"] = (other_loop, foreign)
+    try:
+        asyncio.run(http_client.close_async_clients())
+        assert http_client._clients["foreign"] == (other_loop, foreign)
+    finally:
+        http_client._clients.pop("foreign", None)
+        other_loop.run_until_complete(foreign.aclose())
+        other_loop.close()
@@ -0,0 +1,43 @@
+import asyncio
+
+from app.utils import rate_limit
+from app.utils.rate_limit import TokenBucket
+
+
+def test_token_bucket_allows_burst_then_spaces_calls(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(rate_per_minute=60, capacity=2)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 1.0
+    assert bucket.reserve() == 2.0
+
+    now[0] += 10
+    assert bucket.reserve() == 0.0
+
+
+def test_token_bucket_disabled_for_non_positive_rate():
+    bucket = TokenBucket(rate_per_minute=0)
+
+    assert not bucket.enabled
+    assert all(bucket.reserve() == 0.0 for _ in range(100))
+
+
+def test_token_bucket_async_acquire_waits(monkeypatch):
+    bucket = TokenBucket(rate_per_minute=600, capacity=1)
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(rate_limit.asyncio, "sleep", fake_sleep)
+
+    async def scenario():
+        await bucket.acquire()
+        await bucket.acquire()
+
+    asyncio.run(scenario())
+    assert len(sleeps) == 1
+    assert 0 < sleeps[0] <= 0.1
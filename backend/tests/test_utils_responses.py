@@ -0,0 +1,14 @@
+import numpy as np
+
+import app.main as main
+from app.utils.responses import ORJSONResponse
+
+
+def test_orjson_response_renders_numpy_and_non_string_keys():
+    response = ORJSONResponse({"values": np.arange(3), 1: "one"})
+    assert response.body == b'{"values":[0,1,2],"1":"one"}'
+    assert response.media_type == "application/json"
+
+
+def test_app_uses_orjson_by_default():
+    assert main.app.router.default_response_class is ORJSONResponse
@@ -0,0 +1,29 @@
+import time
+
+from app.utils.ttl_cache import TTLCache
+
+
+def test_ttl_cache_expires_and_evicts_lru():
+    cache = TTLCache(max_entries=2)
+    now = time.time()
+    cache.set("a", 1, now + 60)
+    cache.set("b", 2, now + 60)
+    assert cache.get("a") == 1  # "b" becomes least recently used
+    cache.set("c", 3, now + 60)
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+    cache.set("stale", 4, now - 1)
+    assert cache.get("stale") is None
+
+
+def test_ttl_cache_discard_where():
+    cache = TTLCache(max_entries=10)
+    expires_at = time.time() + 60
+    for key, value in (("a", 1), ("b", 2), ("c", 1)):
+        cache.set(key, value, expires_at)
+    cache.discard_where(lambda value: value == 1)
+    assert cache.get("a") is None and cache.get("c") is None
+    assert cache.get("b") == 2
+    cache.clear()
+    assert len(cache) == 0